@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Brace depth of Rust source, for finding where a { ... } block ends.
+
+depth_array() computes the nesting depth after every byte in one
+vectorised NumPy pass (compare against '{' and '}', then cumsum), so
+matching_brace() and friends become array lookups instead of a Python
+loop over the file. NumPy is optional: without it depth_array() returns
+None and matching_brace() walks only the brace characters with a regex.
+"""
+
+import re
+from typing import Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+_BRACE_RE_BYTES = re.compile(rb'[{}]')
+_BRACE_RE_STR = re.compile(r'[{}]')
+
+# matching_brace() searches the depth array in growing windows, so a short
+# block does not cost a compare over the whole rest of the file
+_FIRST_WINDOW = 4096
+
+
+def depth_array(data: Union[bytes, str]):
+    """
+    Brace depth after each byte of data, as a NumPy array.
+
+    Returns None when NumPy is not installed, or when data is a str whose
+    character offsets would not line up with byte offsets (non-ASCII).
+    """
+    if np is None:
+        return None
+    if isinstance(data, str):
+        if not data.isascii():
+            return None
+        data = data.encode('ascii')
+    arr = np.frombuffer(data, dtype=np.uint8)
+    deltas = (arr == 0x7B).astype(np.int8) - (arr == 0x7D).astype(np.int8)
+    # cumsum widens int8 to the platform integer, so deep files cannot wrap
+    return np.cumsum(deltas)
+
+
+def matching_brace(data: Union[bytes, str], open_pos: int, depth=None) -> int:
+    """
+    Offset of the `}` closing the `{` at open_pos (len(data) if unclosed).
+
+    depth is depth_array(data), or None to scan the braces directly.
+    """
+    if depth is None:
+        return _walk_to_matching_brace(data, open_pos)
+
+    # The block closes where the depth first falls back below the `{`
+    level = depth[open_pos] - 1
+    start = open_pos + 1
+    window = _FIRST_WINDOW
+    end = len(depth)
+    while start < end:
+        stop = min(end, start + window)
+        hits = np.flatnonzero(depth[start:stop] == level)
+        if hits.size:
+            return start + int(hits[0])
+        start = stop
+        window *= 4
+    return len(data)
+
+
+def brace_pairs(data: Union[bytes, str]) -> dict:
+    """
+    {offset of `{`: offset of its matching `}`} for every closed block in data.
+
+    One pass over the braces, for callers that look up many blocks of the
+    same file; an unclosed `{` has no entry. Stray `}` are ignored, which
+    pairs blocks exactly as matching_brace() does.
+    """
+    brace_re = _BRACE_RE_BYTES if isinstance(data, bytes) else _BRACE_RE_STR
+    open_brace = b'{' if isinstance(data, bytes) else '{'
+    pairs = {}
+    stack = []
+    for m in brace_re.finditer(data):
+        if m.group() == open_brace:
+            stack.append(m.start())
+        elif stack:
+            pairs[stack.pop()] = m.start()
+    return pairs
+
+
+def line_depths(data: Union[bytes, str]):
+    """
+    Brace depth at the end of each line of data (split on newlines), as a
+    NumPy array, or None when NumPy is not installed.
+
+    Entry j equals the running total of line.count('{') - line.count('}')
+    over lines[:j + 1], so per-line brace counting loops become lookups.
+    """
+    if np is None:
+        return None
+    if isinstance(data, str):
+        # Braces and newlines are single bytes in UTF-8, so lines line up
+        data = data.encode('utf-8', 'surrogatepass')
+    depth = depth_array(data)
+    ends = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == 0x0A)
+    # The last line runs to the end of data
+    return np.append(depth[ends], depth[-1] if len(depth) else 0)
+
+
+def depth_at(depth, pos: int) -> int:
+    """Brace depth just before offset pos, given depth_array() output."""
+    return int(depth[pos - 1]) if pos > 0 else 0
+
+
+def _walk_to_matching_brace(data: Union[bytes, str], open_pos: int) -> int:
+    brace_re = _BRACE_RE_BYTES if isinstance(data, bytes) else _BRACE_RE_STR
+    open_brace = data[open_pos]
+    level = 0
+    for m in brace_re.finditer(data, open_pos):
+        if data[m.start()] == open_brace:
+            level += 1
+        else:
+            level -= 1
+            if level == 0:
+                return m.start()
+    return len(data)
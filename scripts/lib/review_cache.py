@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+On-disk cache of per-file review results.
+
+Entries live under target/review_cache/<namespace>-v<version>/ and are
+keyed by the file's path plus either its (st_mtime_ns, st_size) or, when
+mtimes are unreliable (fresh CI checkouts), a hash of its contents.
+With two_tier=True the stat is checked first and the contents are only
+hashed when it changed, so a touched but unchanged file is still a hit.
+Bump the version passed to ReviewCache whenever the cached computation
+changes; old entries are then simply never looked up again.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+
+def _content_hasher():
+    """Return a fresh content hasher: xxh3 or BLAKE3 when available, else blake2b."""
+    if xxhash is not None:
+        return xxhash.xxh3_128()
+    if blake3 is not None:
+        return blake3.blake3()
+    return hashlib.blake2b(digest_size=16)
+
+
+def _path_digest(path: str) -> str:
+    return hashlib.blake2b(path.encode('utf-8', 'surrogateescape'), digest_size=16).hexdigest()
+
+
+class ReviewCache:
+    """Pickle-backed cache of values computed from a single source file."""
+
+    def __init__(
+        self,
+        namespace: str,
+        version: int,
+        cache_root: Optional[Path] = None,
+        hash_contents: bool = False,
+        two_tier: bool = False
+    ):
+        if cache_root is None:
+            from review_utils import get_repo_root
+            cache_root = get_repo_root() / 'target' / 'review_cache'
+        self.directory = Path(cache_root) / f"{namespace}-v{version}"
+        self.hash_contents = hash_contents
+        self.two_tier = two_tier
+
+    def key(self, path) -> str:
+        """Cache key for path in its current on-disk state."""
+        path = os.fspath(path)
+        if self.two_tier:
+            return self._stamped_content_key(path)
+        if self.hash_contents:
+            return self._content_key(path)
+        st = os.stat(path)
+        stamp = f"{path}|{st.st_mtime_ns}|{st.st_size}"
+        return _path_digest(stamp)
+
+    def _content_key(self, path: str) -> str:
+        hasher = _content_hasher()
+        hasher.update(path.encode('utf-8', 'surrogateescape'))
+        with open(path, 'rb') as f:
+            hasher.update(f.read())
+        return hasher.hexdigest()
+
+    def _stamped_content_key(self, path: str) -> str:
+        """Content key for path, re-hashing only if its mtime or size changed."""
+        st = os.stat(path)
+        stamp_name = f"stamps/{_path_digest(path)}"
+        stamp = self.get(stamp_name)
+        if stamp is not None and stamp[:2] == (st.st_mtime_ns, st.st_size):
+            return stamp[2]
+        key = self._content_key(path)
+        self.put(stamp_name, (st.st_mtime_ns, st.st_size, key))
+        return key
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss."""
+        pickle_path = self.directory / f"{key}.pickle"
+        try:
+            with open(pickle_path, 'rb') as f:
+                value = pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError, AttributeError, ImportError):
+            return None
+        try:
+            # Touch the entry so prune() evicts by last use, not by age
+            os.utime(pickle_path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store value under key (atomically, so concurrent writers are safe)."""
+        target = self.directory / f"{key}.pickle"
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=target.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, target)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError:
+            # A read-only or full disk only costs us the cache
+            pass
+
+    def lookup(self, path, compute: Callable[[Any], Any]) -> Any:
+        """Return compute(path), reusing the cached value if path is unchanged."""
+        key = self.key(path)
+        value = self.get(key)
+        if value is None:
+            value = compute(path)
+            self.put(key, value)
+        return value
+
+    def prune(self, max_entries: int = 2000, max_age: float = 24 * 3600) -> None:
+        """Drop entries unused for max_age seconds, then the least recently used beyond max_entries."""
+        entries = []
+        for pickle_path in self.directory.rglob('*.pickle'):
+            try:
+                entries.append((pickle_path.stat().st_mtime, pickle_path))
+            except OSError:
+                continue
+        entries.sort(reverse=True)
+        cutoff = time.time() - max_age
+        for i, (mtime, pickle_path) in enumerate(entries):
+            if i >= max_entries or mtime < cutoff:
+                try:
+                    pickle_path.unlink()
+                except OSError:
+                    # Already removed by a concurrent prune
+                    pass
@@ -9,9 +9,40 @@ Provides standardized argument parsing, file discovery, and reporting.
 
 
 import argparse
+import itertools
+import json
+import os
+import re
+import shutil
+import subprocess
 import sys
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import List, Optional, Callable
+from typing import Iterator, List, Optional, Callable, Tuple
+
+from review_cache import ReviewCache
+
+
+# Directories never worth descending into when looking for source files
+PRUNED_DIRS = frozenset({'target', '.git', 'node_modules', 'vendor'})
+
+# .rs files larger than this are generated code, not something to review
+MAX_RS_FILE_SIZE = 2 * 1024 * 1024
+
+# Environment variable naming a manifest written by write_file_manifest();
+# set by the aggregators so their sub-scripts skip walking the tree again
+FILE_LIST_ENV = 'RUSTICATE_FILE_LIST'
+
+# Environment variable giving the default --jobs; set by aggregators that
+# already run several scripts side by side, so their pools stay small
+JOBS_ENV = 'RUSTICATE_JOBS'
+
+# Contents read through read_file_bytes(), once enable_read_cache() is called
+_read_cache = None
+
+_NEWLINE_RE = re.compile('\n')
 
 
 def get_repo_root() -> Path:
@@ -51,6 +82,302 @@ def create_review_parser(description: str) -> argparse.ArgumentParser:
     return parser
 
 
+def default_jobs() -> int:
+    """The --jobs default: JOBS_ENV if set to a number, else 0 (one worker per CPU)."""
+    try:
+        return max(0, int(os.environ.get(JOBS_ENV, 0)))
+    except ValueError:
+        return 0
+
+
+def add_jobs_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the --jobs/-j option that map_files() takes."""
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=default_jobs(),
+        help='Worker processes (default: one per CPU; 1 checks files serially)'
+    )
+
+
+def add_since_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the --since option that ReviewContext.find_files() honours."""
+    parser.add_argument(
+        '--since',
+        metavar='REF',
+        help='Only check .rs files changed since git REF (e.g. origin/main), '
+             'including uncommitted and untracked ones'
+    )
+
+
+def changed_rs_files(repo_root: Path, since: str) -> set:
+    """
+    The .rs files under repo_root that differ from git ref since in the
+    working tree, or are untracked, as absolute paths. Exits on git errors.
+    """
+    commands = [
+        ['git', 'diff', '--name-only', '--relative', since, '--', '*.rs'],
+        ['git', 'ls-files', '--others', '--exclude-standard', '--', '*.rs'],
+    ]
+    changed = set()
+    for cmd in commands:
+        try:
+            result = subprocess.run(cmd, cwd=repo_root, capture_output=True, text=True, check=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            detail = (getattr(e, 'stderr', None) or str(e)).strip()
+            print(f"Error: {' '.join(cmd)} failed: {detail}", file=sys.stderr)
+            sys.exit(1)
+        changed.update(repo_root / name for name in result.stdout.splitlines() if name)
+    return changed
+
+
+def add_cache_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the --no-cache option that open_cache() reads."""
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Recheck every file instead of reusing target/review_cache'
+    )
+
+
+def open_cache(args: argparse.Namespace, namespace: str, version: int, repo_root: Path) -> Optional[ReviewCache]:
+    """The ReviewCache for a script's per-file results, or None under --no-cache."""
+    if getattr(args, 'no_cache', False):
+        return None
+    return ReviewCache(namespace, version, cache_root=repo_root / 'target' / 'review_cache', two_tier=True)
+
+
+def _cached_call(file: Path, function: Callable, extra: tuple, cache: ReviewCache):
+    """function(file, *extra), reused from cache while file is unchanged."""
+    # Boxed so a None result is cached too rather than read back as a miss
+    return cache.lookup(file, lambda path: (function(path, *extra),))[0]
+
+
+def map_files(
+    function: Callable,
+    files: List[Path],
+    *extra,
+    jobs: int = 0,
+    chunksize: int = 16,
+    cache: Optional[ReviewCache] = None
+) -> List:
+    """
+    [function(file, *extra) for file in files], spread over a process pool.
+    
+    function must be module-level so it pickles. jobs is the --jobs value:
+    0 means one worker per CPU, and 1 (or a single file) runs serially.
+    Results come back in the order of files.
+    
+    With a cache (see open_cache()), results of unchanged files are reused
+    from earlier runs, so function(file, *extra) must depend on nothing but
+    the file's contents and extra; the cache is pruned afterwards.
+    """
+    files = list(files)
+    if cache is not None:
+        function = partial(_cached_call, function=function, extra=extra, cache=cache)
+        extra = ()
+    iterables = [files] + [itertools.repeat(value, len(files)) for value in extra]
+    if jobs == 1 or len(files) < 2:
+        results = list(map(function, *iterables))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs or None) as executor:
+            results = list(executor.map(function, *iterables, chunksize=chunksize))
+    if cache is not None:
+        cache.prune(max_entries=max(2000, 2 * len(files)))
+    return results
+
+
+def iter_rs_files(root: Path, max_size: int = MAX_RS_FILE_SIZE) -> Iterator[Path]:
+    """
+    Yield the .rs files under root using os.scandir.
+    
+    Skips PRUNED_DIRS (target/, .git/, ...) without descending into them,
+    does not follow directory symlinks, and skips files over max_size bytes.
+    Order is unspecified; sort the result if it matters.
+    
+    If $RUSTICATE_FILE_LIST names a manifest covering root, its file list
+    is used instead of walking the directory again.
+    """
+    if max_size == MAX_RS_FILE_SIZE:
+        listed = _manifest_files(root)
+        if listed is not None:
+            yield from listed
+            return
+    stack = [os.fspath(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in PRUNED_DIRS:
+                        stack.append(entry.path)
+                elif entry.name.endswith('.rs'):
+                    try:
+                        if entry.stat().st_size > max_size:
+                            continue
+                    except OSError:
+                        continue
+                    yield Path(entry.path)
+
+
+def write_file_manifest(roots: List[Path], manifest_path: Path) -> None:
+    """
+    Write the .rs files under roots (as iter_rs_files finds them) to
+    manifest_path, for sub-scripts run with $RUSTICATE_FILE_LIST set to it.
+    """
+    roots = [os.path.abspath(root) for root in roots]
+    files = []
+    for root in roots:
+        if os.path.isdir(root):
+            files.extend(os.fspath(path) for path in iter_rs_files(Path(root)))
+    with open(manifest_path, 'w') as f:
+        json.dump({'roots': roots, 'files': files}, f)
+
+
+@lru_cache(maxsize=None)
+def _load_manifest(manifest_path: str):
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        return manifest['roots'], manifest['files']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _manifest_files(root: Path) -> Optional[List[Path]]:
+    """The manifest's files under root, in root's form, or None if not covered."""
+    manifest_path = os.environ.get(FILE_LIST_ENV)
+    if not manifest_path:
+        return None
+    manifest = _load_manifest(manifest_path)
+    if manifest is None:
+        return None
+    roots, files = manifest
+    abs_root = os.path.abspath(root)
+    if not any(abs_root == r or abs_root.startswith(r + os.sep) for r in roots):
+        return None
+    prefix = abs_root + os.sep
+    return [Path(root, path[len(prefix):]) for path in files if path.startswith(prefix)]
+
+
+def rg_scan(pattern: str, paths: List[Path]) -> Iterator[Tuple[Path, int, str]]:
+    """
+    Yield (path, line number, line) for each line of the .rs files under
+    paths that matches pattern, using one ripgrep run (rg --json).
+    
+    Sees the same files as iter_rs_files: .gitignore is not honoured,
+    PRUNED_DIRS and files over MAX_RS_FILE_SIZE are skipped. Lines or paths
+    that are not UTF-8 are skipped. Raises OSError if rg is not installed
+    and CalledProcessError (after the last match) if it fails, so callers
+    should collect the results before trusting them.
+    """
+    rg = shutil.which('rg')
+    if rg is None:
+        raise FileNotFoundError("rg not found on PATH")
+    cmd = [rg, '--json', '--no-messages', '--no-ignore', '--hidden',
+           '--max-filesize', str(MAX_RS_FILE_SIZE), '-g', '*.rs']
+    for name in sorted(PRUNED_DIRS):
+        cmd += ['-g', f'!{name}/']
+    cmd += ['-e', pattern, '--']
+    cmd += [os.fspath(p) for p in paths]
+    
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE) as proc:
+        for raw in proc.stdout:
+            event = json.loads(raw)
+            if event['type'] != 'match':
+                continue
+            data = event['data']
+            # Non-UTF-8 paths or lines come back base64-encoded
+            path = data['path'].get('text')
+            line = data['lines'].get('text')
+            if path is None or line is None:
+                continue
+            yield Path(path), data['line_number'], line
+    # rg exits 1 when nothing matched
+    if proc.returncode not in (0, 1):
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+
+def enable_read_cache() -> None:
+    """
+    Keep every file read through read_file_bytes() for the rest of the
+    process, for aggregate runs that call several checks in-process over
+    the same files.
+    """
+    global _read_cache
+    if _read_cache is None:
+        _read_cache = {}
+
+
+def read_file_bytes(file_path: Path) -> bytes:
+    """file_path's contents, shared between callers once enable_read_cache() is on."""
+    if _read_cache is None:
+        return Path(file_path).read_bytes()
+    key = os.path.abspath(file_path)
+    data = _read_cache.get(key)
+    if data is None:
+        data = _read_cache[key] = Path(file_path).read_bytes()
+    return data
+
+
+def read_source_lines(file_path: Path) -> List[str]:
+    """
+    Lines of file_path without their newlines, numbered as readlines() would.
+    
+    Reads the file in one go and decodes it leniently (see source_lines).
+    Raises OSError if the file cannot be read.
+    """
+    return source_lines(read_file_bytes(file_path))
+
+
+def source_lines(data: bytes) -> List[str]:
+    """
+    Lines of the raw file contents data, without their newlines.
+    
+    Undecodable bytes become U+FFFD. Only \r\n, \r and \n end lines;
+    unlike str.splitlines(), form feeds and other separators do not. Lets a
+    caller test the raw bytes (say, for a keyword) before paying to decode.
+    """
+    lines = source_text(data).split('\n')
+    if lines[-1] == '':
+        # The file ends with a newline; readlines() has no empty last line
+        lines.pop()
+    return lines
+
+
+def source_text(data: bytes) -> str:
+    """data decoded as source_lines() does, with every line ending turned into \n."""
+    text = data.decode('utf-8', 'replace')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def decode_source(data: bytes) -> str:
+    """
+    data decoded as open(path, encoding='utf-8') would read it: strictly
+    (raising UnicodeDecodeError) and with every line ending turned into \n.
+    """
+    text = data.decode('utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def newline_offsets(text: str) -> List[int]:
+    """Offsets of the newlines in text, for line_at()."""
+    return [m.start() for m in _NEWLINE_RE.finditer(text)]
+
+
+def line_at(newlines: List[int], pos: int) -> int:
+    """Number (from 1) of the line holding offset pos, given newline_offsets() of the text."""
+    return bisect_left(newlines, pos) + 1
+
+
 def find_rust_files(
     directories: List[Path],
     single_file: Optional[str] = None,
@@ -86,7 +413,7 @@ def find_rust_files(
     for directory in directories:
         if not directory.exists():
             continue
-        rust_files.extend(directory.rglob("*.rs"))
+        rust_files.extend(iter_rs_files(directory))
     
     return sorted(rust_files)
 
@@ -164,14 +491,26 @@ class ReviewContext:
         self.repo_root = get_repo_root()
         self.dry_run = args.dry_run
         self.single_file = args.file
+        # Files changed since --since (see add_since_argument), or None
+        self.changed_files = None
+        if getattr(args, 'since', None):
+            self.changed_files = changed_rs_files(self.repo_root, args.since)
     
-    def find_files(self, directories: List[Path]) -> List[Path]:
-        """Find files to check based on context."""
-        return find_rust_files(
+    def find_files(self, directories: List[Path], changed_only: bool = True) -> List[Path]:
+        """
+        Find files to check based on context.
+        
+        Under --since only the changed files are returned, unless
+        changed_only is False (for checks that must see the rest too).
+        """
+        files = find_rust_files(
             directories,
             single_file=self.single_file,
             repo_root=self.repo_root
         )
+        if changed_only and self.changed_files is not None and not self.single_file:
+            files = [f for f in files if f in self.changed_files]
+        return files
     
     def relative_path(self, file_path: Path) -> Path:
         """Get relative path from repo root."""
@@ -187,7 +526,12 @@ def run_review(
     rule_reference: str,
     directories: List[Path],
     check_function: Callable[[Path, 'ReviewContext'], List],
-    fix_suggestion: Optional[str] = None
+    fix_suggestion: Optional[str] = None,
+    add_arguments: Optional[Callable[[argparse.ArgumentParser], None]] = None,
+    parallel: bool = False,
+    cache_namespace: Optional[str] = None,
+    cache_version: int = 1,
+    incremental: bool = False
 ) -> int:
     """
     Standard review script runner.
@@ -199,11 +543,29 @@ def run_review(
         directories: Directories to search
         check_function: Function that takes (file_path, context) and returns violations
         fix_suggestion: Optional fix suggestion
+        add_arguments: Optional function adding script-specific options to
+            the parser; their values are on context.args
+        parallel: Check files over a process pool (adds --jobs); needs a
+            module-level check_function
+        cache_namespace: Reuse each unchanged file's violations from
+            target/review_cache under this namespace (adds --no-cache);
+            needs parallel and a check_function reading only the file
+        cache_version: Version of the cached check_function results
+        incremental: Add --since, checking only files changed since a git
+            ref; for checks whose result for a file depends on it alone
         
     Returns:
         Exit code
     """
     parser = create_review_parser(description)
+    if add_arguments is not None:
+        add_arguments(parser)
+    if parallel:
+        add_jobs_argument(parser)
+    if cache_namespace is not None:
+        add_cache_argument(parser)
+    if incremental:
+        add_since_argument(parser)
     args = parser.parse_args()
     
     context = ReviewContext(args)
@@ -216,20 +578,41 @@ def run_review(
     all_violations = []
     files = context.find_files(directories)
     
-    for file_path in files:
-        violations = check_function(file_path, context)
+    if parallel:
+        cache = None
+        if cache_namespace is not None:
+            cache = open_cache(args, cache_namespace, cache_version, context.repo_root)
+        per_file = map_files(check_function, files, context, jobs=args.jobs, cache=cache)
+    else:
+        per_file = (check_function(file_path, context) for file_path in files)
+    for violations in per_file:
         if violations:
             all_violations.extend(violations)
     
+    return print_review(all_violations, rule_name, rule_reference, fix_suggestion)
+
+
+def print_review(
+    all_violations: List,
+    rule_name: str,
+    rule_reference: str,
+    fix_suggestion: Optional[str] = None
+) -> int:
+    """
+    Print the run_review() report for violations gathered by the caller.
+    
+    Returns:
+        Exit code (0 for pass, 1 for violations found)
+    """
     if not all_violations:
         print(f"✓ {rule_name}: PASS")
         return 0
     
     print(f"✗ {rule_name}: {len(all_violations)} violation(s) ({rule_reference})\n")
     
-    # Print violations (format depends on what check_function returns)
-    for violation in all_violations:
-        print(violation)
+    # Print violations (format depends on what check_function returns),
+    # in one write rather than a print per violation
+    print('\n'.join(map(str, all_violations)))
     
     if fix_suggestion:
         print(f"\n{fix_suggestion}")
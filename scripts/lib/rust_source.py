@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Comment and literal stripping for Rust source.
+
+strip_comments_and_strings() replaces comments and string/char literals
+with spaces but keeps every newline, so offsets and line numbers in the
+result match the original while a `{`, `impl` or `mod` inside a comment
+or literal is never seen by the structural regexes run over it.
+"""
+
+import re
+from typing import Union
+
+
+# Comments and literals: // line comments, non-nested /* */ comments, raw
+# strings (r"..", r#".."#, br".."), ordinary/byte strings, and char/byte
+# literals (which must be told apart from lifetimes such as 'a).
+_COMMENT_OR_LITERAL = re.compile(
+    rb'//[^\n]*'
+    rb'|/\*.*?\*/'
+    rb'|(?<![\w])b?r(#*)".*?"\1'
+    rb'|"(?:\\.|[^"\\])*"'
+    rb"|'(?:\\(?:u\{[0-9a-fA-F]{1,6}\}|x[0-9a-fA-F]{2}|.)|[^\\'\n\x80-\xff]|[\xc0-\xf7][\x80-\xbf]{1,3})'",
+    re.S
+)
+# The same for decoded text, where a non-ASCII char literal is one character
+_COMMENT_OR_LITERAL_STR = re.compile(
+    r'//[^\n]*'
+    r'|/\*.*?\*/'
+    r'|(?<![\w])b?r(#*)".*?"\1'
+    r'|"(?:\\.|[^"\\])*"'
+    r"|'(?:\\(?:u\{[0-9a-fA-F]{1,6}\}|x[0-9a-fA-F]{2}|.)|[^\\'\n])'",
+    re.S
+)
+# Every byte except newline becomes a space
+_BLANK = bytes(b if b == 0x0A else 0x20 for b in range(256))
+
+
+def _blank_text(m) -> str:
+    text = m.group(0)
+    if '\n' not in text:
+        return ' ' * len(text)
+    return '\n'.join(' ' * len(part) for part in text.split('\n'))
+
+
+def strip_comments_and_strings(src: Union[bytes, str]) -> Union[bytes, str]:
+    """Blank comments and literals in src (bytes or str), keeping every offset and newline."""
+    if isinstance(src, bytes):
+        return _COMMENT_OR_LITERAL.sub(lambda m: m.group(0).translate(_BLANK), src)
+    return _COMMENT_OR_LITERAL_STR.sub(_blank_text, src)
@@ -18,6 +18,10 @@ import sys
 from pathlib import Path
 from collections import defaultdict
 
+# Add lib directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
+from review_utils import iter_rs_files
+
 def extract_method_signature(line):
     """Extract method name and visibility from a method signature."""
     line = re.sub(r'//.*$', '', line).strip()
@@ -160,19 +164,19 @@ def count_braces_in_line(line):
     
     return (open_count, close_count)
 
+# Standard traits to ignore
+STANDARD_TRAITS = frozenset({
+    'Eq', 'PartialEq', 'Ord', 'PartialOrd',
+    'Debug', 'Display', 
+    'Clone', 'Copy',
+    'Hash', 
+    'Default',
+})
+
 def extract_impl_info(line):
     """Extract information from an impl line."""
     line = re.sub(r'//.*$', '', line).strip()
     
-    # Standard traits to ignore
-    STANDARD_TRAITS = {
-        'Eq', 'PartialEq', 'Ord', 'PartialOrd',
-        'Debug', 'Display', 
-        'Clone', 'Copy',
-        'Hash', 
-        'Default',
-    }
-    
     # Check for trait impl
     trait_match = re.search(r'impl(?:<[^>]+>)?\s+(?:[\w:]+::)?(\w+)(?:<[^>]+>)?\s+for\s+(\w+)', line)
     if trait_match:
@@ -343,7 +347,7 @@ def main():
         src_dir = Path('src')
         all_results = []
         
-        for rs_file in sorted(src_dir.rglob('*.rs')):
+        for rs_file in sorted(iter_rs_files(src_dir)):
             results = analyze_file(rs_file)
             if results:
                 all_results.extend(results)
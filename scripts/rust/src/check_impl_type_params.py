@@ -13,6 +13,10 @@ import sys
 from pathlib import Path
 from collections import defaultdict
 
+# Add lib directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
+from review_utils import iter_rs_files
+
 def extract_type_params(impl_line):
     """
     Extract generic type parameters from an impl line.
@@ -86,20 +90,20 @@ def count_braces_in_line(line):
     
     return (open_count, close_count)
 
+STANDARD_TRAITS = frozenset({
+    'Eq', 'PartialEq', 'Ord', 'PartialOrd',
+    'Debug', 'Display', 
+    'Clone', 'Copy',
+    'Hash', 
+    'Default',
+    'Drop',
+    'IntoIterator', 'Iterator',
+})
+
 def extract_impl_info(line):
     """Extract information from an impl line including type parameters."""
     line = re.sub(r'//.*$', '', line).strip()
     
-    STANDARD_TRAITS = {
-        'Eq', 'PartialEq', 'Ord', 'PartialOrd',
-        'Debug', 'Display', 
-        'Clone', 'Copy',
-        'Hash', 
-        'Default',
-        'Drop',
-        'IntoIterator', 'Iterator',
-    }
-    
     # Check for trait impl
     trait_match = re.search(r'impl(?:<[^>]+>)?\s+(?:[\w:]+::)?(\w+)(?:<[^>]+>)?\s+for\s+(\w+)', line)
     if trait_match:
@@ -239,7 +243,7 @@ def main():
         src_dir = Path('src')
         all_results = []
         
-        for rs_file in sorted(src_dir.rglob('*.rs')):
+        for rs_file in sorted(iter_rs_files(src_dir)):
             results = analyze_file(rs_file)
             if results:
                 all_results.extend(results)
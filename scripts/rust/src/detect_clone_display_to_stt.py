@@ -11,6 +11,10 @@ import re
 import sys
 from pathlib import Path
 
+# Add lib directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
+from review_utils import iter_rs_files
+
 
 class TeeOutput:
     """Write to both stdout and a log file."""
@@ -79,7 +83,7 @@ def main():
     all_issues = {}
     total = 0
     
-    for rs_file in sorted(src_dir.rglob("*.rs")):
+    for rs_file in sorted(iter_rs_files(src_dir)):
         if rs_file.name == "Types.rs":
             continue
             
@@ -19,6 +19,10 @@ import sys
 from pathlib import Path
 from collections import defaultdict
 
+# Add lib directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
+from review_utils import iter_rs_files, line_at, newline_offsets
+
 
 class TeeOutput:
     """Write to both stdout and a log file."""
@@ -132,7 +136,7 @@ def find_default_impls(src_dir="src"):
     
     results = []
     
-    for filepath in Path(src_dir).rglob('*.rs'):
+    for filepath in sorted(iter_rs_files(Path(src_dir))):
         if filepath.name == 'Types.rs':
             continue
         
@@ -145,6 +149,7 @@ def find_default_impls(src_dir="src"):
         # Find all impl Default blocks
         # Pattern: impl<...> Default for TypeName<...> {
         impl_pattern = r'impl(?:<[^>]*>)?\s+Default\s+for\s+(\w+)(?:<[^>]*>)?\s*\{'
+        newlines = None
         
         for match in re.finditer(impl_pattern, content):
             struct_name = match.group(1)
@@ -166,7 +171,9 @@ def find_default_impls(src_dir="src"):
             impl_end = i + 1
             
             # Calculate line number
-            line_num = content[:impl_start].count('\n') + 1
+            if newlines is None:
+                newlines = newline_offsets(content)
+            line_num = line_at(newlines, impl_start)
             
             # Check if struct already has #[derive(Default)]
             struct_status = find_struct_definition(content, struct_name)
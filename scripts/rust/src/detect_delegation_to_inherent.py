@@ -52,25 +52,20 @@ def find_inherent_methods(content, struct_name):
     return inherent_methods
 
 
-def main():
-    import argparse
-    
-    parser = argparse.ArgumentParser(description="Detect delegation to inherent impls")
-    parser.add_argument('--file', required=True, help='File to analyze')
-    args = parser.parse_args()
-    
-    file_path = Path(args.file)
-    if not file_path.exists():
-        print(f"Error: {file_path} not found", file=sys.stderr)
-        return 1
+def check_file(file_path):
+    """
+    Analyze one file for trait impls that delegate to inherent impls.
     
+    Returns the report text for the file, or an empty string if no
+    delegations were found.
+    """
     with open(file_path, 'r') as f:
         content = f.read()
     
     # Find trait impl blocks
     trait_impl_pattern = r'impl<[^>]*>\s+(\w+)<[^>]*>\s+for\s+(\w+)<[^>]*>'
     
-    found_delegations = False
+    output = []
     for match in re.finditer(trait_impl_pattern, content):
         trait_name = match.group(1)
         struct_name = match.group(2)
@@ -115,14 +110,49 @@ def main():
                     delegations.add(method_name)
         
         if delegations:
-            found_delegations = True
-            print(f"\n{file_path}:")
-            print(f"  Trait impl: {trait_name} for {struct_name}")
-            print(f"  Methods delegating to inherent impl: {', '.join(sorted(delegations))}")
-            print(f"  Count: {len(delegations)}")
+            output.append(f"\n{file_path}:")
+            output.append(f"  Trait impl: {trait_name} for {struct_name}")
+            output.append(f"  Methods delegating to inherent impl: {', '.join(sorted(delegations))}")
+            output.append(f"  Count: {len(delegations)}")
     
-    return 0 if found_delegations else 1
+    return '\n'.join(output)
+
+
+def check_file_returning_output(file_path):
+    """
+    Pool-friendly wrapper: returns (path, stripped report text).
+    
+    A file that cannot be read is noted on stderr and reported as empty,
+    so one bad file does not abort the whole scan.
+    """
+    try:
+        return str(file_path), check_file(file_path).strip()
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Error reading {file_path}: {e}", file=sys.stderr)
+        return str(file_path), ''
+
 
+def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Detect delegation to inherent impls")
+    parser.add_argument('--file', required=True, help='File to analyze')
+    args = parser.parse_args()
+    
+    file_path = Path(args.file)
+    if not file_path.exists():
+        print(f"Error: {file_path} not found", file=sys.stderr)
+        return 1
+    
+    try:
+        output = check_file(file_path)
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Error reading {file_path}: {e}", file=sys.stderr)
+        return 1
+    if output:
+        print(output)
+    
+    return 0 if output else 1
 
 if __name__ == '__main__':
     sys.exit(main())
@@ -15,6 +15,10 @@ import sys
 from pathlib import Path
 import argparse
 
+# Add lib directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
+from review_utils import iter_rs_files
+
 class TeeOutput:
     """Print to both stdout and file."""
     def __init__(self, filepath):
@@ -69,7 +73,7 @@ def main():
     
     results = []
     
-    for rs_file in sorted(src_dir.rglob("*.rs")):
+    for rs_file in sorted(iter_rs_files(src_dir)):
         if 'Types.rs' in str(rs_file):
             continue
         
@@ -13,6 +13,10 @@ import sys
 from pathlib import Path
 from collections import defaultdict
 
+# Add lib directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
+from review_utils import iter_rs_files
+
 
 class TeeOutput:
     """Write to both stdout and a log file."""
@@ -106,7 +110,7 @@ def main():
     pattern_counts = defaultdict(int)
     
     # Find all .rs files
-    for rs_file in sorted(src_dir.rglob("*.rs")):
+    for rs_file in sorted(iter_rs_files(src_dir)):
         if rs_file.name == "Types.rs":
             continue
             
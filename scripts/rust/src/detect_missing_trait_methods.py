@@ -18,6 +18,10 @@ import sys
 from pathlib import Path
 from collections import defaultdict
 
+# Add lib directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
+from review_utils import iter_rs_files
+
 def extract_method_signature(line):
     """Extract method name, visibility, and full signature from a method line."""
     line = re.sub(r'//.*$', '', line).strip()
@@ -79,43 +83,43 @@ def count_braces_in_line(line):
     
     return (open_count, close_count)
 
+# Standard library traits that we should NOT modify
+STANDARD_TRAITS = frozenset({
+    # Comparison
+    'Eq', 'PartialEq', 'Ord', 'PartialOrd',
+    # Formatting
+    'Debug', 'Display', 'Binary', 'Octal', 'LowerHex', 'UpperHex', 'LowerExp', 'UpperExp', 'Pointer',
+    # Memory
+    'Clone', 'Copy', 'Drop',
+    # Conversion
+    'From', 'Into', 'TryFrom', 'TryInto', 'AsRef', 'AsMut', 'Borrow', 'BorrowMut', 'ToOwned',
+    # Iteration
+    'Iterator', 'IntoIterator', 'DoubleEndedIterator', 'ExactSizeIterator', 'Extend', 'FromIterator',
+    # Indexing
+    'Index', 'IndexMut',
+    # Operators
+    'Add', 'Sub', 'Mul', 'Div', 'Rem', 'Neg', 'Not', 
+    'BitAnd', 'BitOr', 'BitXor', 'Shl', 'Shr',
+    'AddAssign', 'SubAssign', 'MulAssign', 'DivAssign', 'RemAssign',
+    'BitAndAssign', 'BitOrAssign', 'BitXorAssign', 'ShlAssign', 'ShrAssign',
+    # Smart pointers
+    'Deref', 'DerefMut',
+    # Hash
+    'Hash', 'Hasher', 'BuildHasher',
+    # Default
+    'Default',
+    # Concurrency
+    'Send', 'Sync', 'Unpin',
+    # Error handling
+    'Error',
+    # Fn traits
+    'Fn', 'FnMut', 'FnOnce',
+})
+
 def extract_impl_info(line):
     """Extract information from an impl line."""
     line = re.sub(r'//.*$', '', line).strip()
     
-    # Standard library traits that we should NOT modify
-    STANDARD_TRAITS = {
-        # Comparison
-        'Eq', 'PartialEq', 'Ord', 'PartialOrd',
-        # Formatting
-        'Debug', 'Display', 'Binary', 'Octal', 'LowerHex', 'UpperHex', 'LowerExp', 'UpperExp', 'Pointer',
-        # Memory
-        'Clone', 'Copy', 'Drop',
-        # Conversion
-        'From', 'Into', 'TryFrom', 'TryInto', 'AsRef', 'AsMut', 'Borrow', 'BorrowMut', 'ToOwned',
-        # Iteration
-        'Iterator', 'IntoIterator', 'DoubleEndedIterator', 'ExactSizeIterator', 'Extend', 'FromIterator',
-        # Indexing
-        'Index', 'IndexMut',
-        # Operators
-        'Add', 'Sub', 'Mul', 'Div', 'Rem', 'Neg', 'Not', 
-        'BitAnd', 'BitOr', 'BitXor', 'Shl', 'Shr',
-        'AddAssign', 'SubAssign', 'MulAssign', 'DivAssign', 'RemAssign',
-        'BitAndAssign', 'BitOrAssign', 'BitXorAssign', 'ShlAssign', 'ShrAssign',
-        # Smart pointers
-        'Deref', 'DerefMut',
-        # Hash
-        'Hash', 'Hasher', 'BuildHasher',
-        # Default
-        'Default',
-        # Concurrency
-        'Send', 'Sync', 'Unpin',
-        # Error handling
-        'Error',
-        # Fn traits
-        'Fn', 'FnMut', 'FnOnce',
-    }
-    
     # Check for trait impl
     trait_match = re.search(r'impl(?:<[^>]+>)?\s+(?:[\w:]+::)?(\w+)(?:<[^>]+>)?\s+for\s+(\w+)', line)
     if trait_match:
@@ -352,7 +356,7 @@ def main():
         src_dir = Path('src')
         all_results = []
         
-        for rs_file in sorted(src_dir.rglob('*.rs')):
+        for rs_file in sorted(iter_rs_files(src_dir)):
             results = analyze_file(rs_file)
             if results:
                 all_results.extend(results)
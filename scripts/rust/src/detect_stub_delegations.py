@@ -19,6 +19,10 @@ import sys
 from pathlib import Path
 from collections import defaultdict
 
+# Add lib directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
+from review_utils import iter_rs_files, line_at, newline_offsets
+
 
 class TeeOutput:
     """Write to both stdout and a log file."""
@@ -127,6 +131,7 @@ def find_inherent_methods(filepath):
         
         # Find method definitions
         method_pattern = r'pub\s+fn\s+(\w+)\s*(?:<[^>]*>)?\s*\([^)]*\)(?:\s*->\s*[^{]+)?\s*\{'
+        impl_newlines = None
         
         for method_match in re.finditer(method_pattern, impl_content):
             method_name = method_match.group(1)
@@ -150,8 +155,9 @@ def find_inherent_methods(filepath):
             # Check if it's a simple delegation
             if is_simple_delegation(method_body):
                 # Calculate line number
-                lines_before = impl_content[:method_match.start()].count('\n')
-                method_line = impl_start + lines_before + 1
+                if impl_newlines is None:
+                    impl_newlines = newline_offsets(impl_content)
+                method_line = impl_start + line_at(impl_newlines, method_match.start())
                 
                 results.append({
                     'file': filepath,
@@ -176,7 +182,7 @@ def count_method_usages(method_name, struct_name, src_dir):
     ]
     
     # Search in src/
-    for src_file in (src_dir / 'src').rglob('*.rs'):
+    for src_file in sorted(iter_rs_files(src_dir / 'src')):
         try:
             content = src_file.read_text(encoding='utf-8')
             for pattern in patterns:
@@ -185,7 +191,7 @@ def count_method_usages(method_name, struct_name, src_dir):
             pass
     
     # Search in tests/
-    for test_file in (src_dir / 'tests').rglob('*.rs'):
+    for test_file in sorted(iter_rs_files(src_dir / 'tests')):
         try:
             content = test_file.read_text(encoding='utf-8')
             for pattern in patterns:
@@ -213,7 +219,7 @@ def main():
     all_delegations = []
     
     # Scan all source files
-    for rs_file in src_dir.rglob('*.rs'):
+    for rs_file in sorted(iter_rs_files(src_dir)):
         if rs_file.name == 'Types.rs':
             continue
         
@@ -4,8 +4,13 @@ Find inherent impl blocks that contain ONLY private helper methods/functions.
 These can be eliminated by moving their contents to module-level functions.
 """
 import re
+import sys
 from pathlib import Path
 
+# Add lib directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
+from review_utils import iter_rs_files
+
 project_root = Path("/home/milnes/APASVERUS/APAS-AI/apas-ai")
 src_dir = project_root / "src"
 
@@ -123,7 +128,7 @@ def main():
     only_private_files = []
     mixed_files = []
     
-    for rs_file in sorted(src_dir.rglob("*.rs")):
+    for rs_file in sorted(iter_rs_files(src_dir)):
         if "Types.rs" in str(rs_file):
             continue
         
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Shared single-pass scanner for the impl review scripts.
+
+review_impl_trait_bounds, review_inherent_and_trait_impl,
+review_inherent_method_lengths and review_inherent_plus_trait_impl all
+look at the same things: impl header lines, `pub trait` declarations and
+the methods of inherent impls. scan_file() reads a .rs file once and
+extracts all of them into a FileRecord, which each script's report_*()
+function consumes. review_impls.py runs every report over one scan.
+"""
+
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
+from rust_source import strip_comments_and_strings
+
+# Bump whenever scan_file() or the patterns below change, so cached
+# FileRecords from older scanners are not reused.
+CACHE_VERSION = 6
+
+
+# Files are scanned as raw bytes; only the few lines that end up in a
+# FileRecord are decoded. All structural patterns run over a copy of the
+# file with comments and string/char literals blanked out (see
+# strip_comments_and_strings), so offsets and line numbers are unchanged
+# but an `impl`, `{` or `}` inside a comment or literal is never seen.
+
+# Lines whose first token is `impl`, newline included as readlines() would
+# (horizontal whitespace only, so `^` cannot span blank lines)
+_IMPL_LINE = re.compile(rb'^[^\S\n]*impl\b[^\n]*\n?', re.M)
+# Whole line containing the first `pub trait Name` on that line
+_TRAIT_DEF_LINE = re.compile(rb'^[^\n]*?pub[^\S\n]+trait[^\S\n]+(\w+)[^\n]*', re.M)
+_FN_NAME = re.compile(rb'\bfn\s+([a-zA-Z_][a-zA-Z0-9_]*)')
+# `pub trait Name ... {` up to and including the opening brace
+_TRAIT_HDR = re.compile(rb'^[^\S\n]*pub\s+trait\s+\w+[^{;]*\{', re.M)
+# impl header from `impl` up to (not including) its `{` or `;`
+_IMPL_HDR = re.compile(rb'^[^\S\n]*impl\s*(?:<[^>]*>)?\s+\w+[^{;]*', re.M)
+_FOR = re.compile(rb'\sfor\s')
+_PUB_FN = re.compile(rb'^[^\S\n]*pub\s+fn\s+([a-zA-Z_][a-zA-Z0-9_]*)', re.M)
+_BRACE = re.compile(rb'[{}]')
+
+
+def _decode(raw):
+    """Decode a slice of source for display."""
+    return raw.decode('utf-8', 'replace')
+
+
+def _matching_brace(data, open_pos):
+    """Return the offset of the `}` closing the `{` at open_pos (len(data) if unclosed)."""
+    depth = 0
+    for m in _BRACE.finditer(data, open_pos):
+        c = data[m.start()]
+        if c == 0x7B:    # {
+            depth += 1
+        elif c == 0x7D:  # }
+            depth -= 1
+            if depth == 0:
+                return m.start()
+    return len(data)
+
+
+def extract_trait_methods(data):
+    """Extract method names from the trait definitions in data (stripped bytes)."""
+    trait_methods = set()
+    if b'trait' not in data:
+        return trait_methods
+    pos = 0
+    while True:
+        m = _TRAIT_HDR.search(data, pos)
+        if not m:
+            break
+        close = _matching_brace(data, m.end() - 1)
+        for fn in _FN_NAME.finditer(data, m.end(), close):
+            trait_methods.add(fn.group(1).decode('ascii'))
+        pos = close + 1
+    
+    return trait_methods
+
+
+def impl_ranges(clean):
+    """
+    Index the impl blocks of clean (stripped bytes).
+    
+    Returns [(open_pos, close_pos, is_trait_impl)] with the offsets of each
+    impl's `{` and matching `}`. Nested impls (inside fn bodies) are not
+    listed, since the scan resumes after each block's closing brace.
+    """
+    ranges = []
+    pos = 0
+    while True:
+        impl = _IMPL_HDR.search(clean, pos)
+        if not impl:
+            break
+        open_pos = impl.end()
+        if open_pos >= len(clean) or clean[open_pos] != 0x7B:
+            # `impl ...;` or truncated source: no body to walk
+            pos = open_pos + 1
+            continue
+        close = _matching_brace(clean, open_pos)
+        ranges.append((open_pos, close, bool(_FOR.search(impl.group(0)))))
+        pos = close + 1
+    return ranges
+
+
+def analyze_inherent_impl(clean, data):
+    """
+    Analyze inherent impl blocks to find methods to refactor.
+    
+    clean is data (bytes) after strip_comments_and_strings(); structure is
+    found in clean, method texts are taken from data.
+    """
+    inherent_methods = []
+    if b'impl' not in clean:
+        return inherent_methods
+    trait_methods = extract_trait_methods(clean)
+    
+    line_num = 1
+    line_pos = 0
+    # Method lengths are byte counts unless the file has non-ASCII text
+    ascii_only = data.isascii()
+    
+    # Pass 1 finds every impl block; pass 2 only looks inside inherent ones
+    for open_pos, close, is_trait_impl in impl_ranges(clean):
+        # Trait impls, and impls without a single `fn`, are skipped whole
+        if is_trait_impl or clean.find(b'fn', open_pos, close) == -1:
+            continue
+        
+        # Walk the inherent impl body method by method
+        fn_pos = open_pos + 1
+        while True:
+            fn = _PUB_FN.search(clean, fn_pos, close)
+            if not fn:
+                break
+            body = clean.find(b'{', fn.end(), close)
+            if body == -1:
+                break
+            end = _matching_brace(clean, body)
+            fn_pos = end + 1
+            
+            # fn starts at its line; the method text runs from its first
+            # non-blank character through the closing brace
+            start = fn.start()
+            text_start = start + len(fn.group(0)) - len(fn.group(0).lstrip())
+            line_num += data.count(b'\n', line_pos, start)
+            line_pos = start
+            num_lines = data.count(b'\n', start, end) + 1
+            if ascii_only:
+                char_length = end + 1 - text_start
+            else:
+                char_length = len(_decode(data[text_start:end + 1]))
+            method_name = fn.group(1).decode('ascii')
+            
+            inherent_methods.append({
+                'name': method_name,
+                'start_line': line_num,
+                'end_line': line_num + num_lines - 1,
+                'num_lines': num_lines,
+                'char_length': char_length,
+                'in_trait': method_name in trait_methods
+            })
+    
+    return inherent_methods
+
+
+def for_trait_token(line):
+    """
+    Cheaply guess the trait of an `impl ... Trait<..> for Type` line.
+    
+    Returns the last token before the first ` for ` with any generic
+    arguments cut off (path prefix kept), or None when there is no ` for `.
+    Only a fast-path hint: callers still classify undecided lines by regex.
+    """
+    head, sep, _ = line.partition(' for ')
+    if not sep:
+        return None
+    return head.rsplit(None, 1)[-1].split('<', 1)[0]
+
+
+class StructImpls:
+    """The inherent and trait impls of one struct within a file."""
+    __slots__ = ('inherent', 'traits', 'lines')
+    
+    def __init__(self):
+        self.inherent = []   # line numbers of inherent impls
+        self.traits = {}     # trait name -> line numbers of its impls
+        self.lines = []      # (line number, trait name or None) in source order
+    
+    def add_inherent(self, line_num):
+        self.inherent.append(line_num)
+        self.lines.append((line_num, None))
+    
+    def add_trait(self, trait_name, line_num):
+        self.traits.setdefault(trait_name, []).append(line_num)
+        self.lines.append((line_num, trait_name))
+
+
+def struct_impls_for(struct_impls, struct_name):
+    """Return the StructImpls for struct_name in struct_impls, creating it if needed."""
+    impls = struct_impls.get(struct_name)
+    if impls is None:
+        impls = struct_impls[sys.intern(struct_name)] = StructImpls()
+    return impls
+
+
+class FileRecord(NamedTuple):
+    """Everything the impl reviews need from one .rs file."""
+    path: Path
+    impls: List[Tuple[int, str]]            # (line number, impl line with newline)
+    traits: Dict[str, Tuple[int, str]]      # trait name -> (line number, declaration line)
+    methods: List[dict]                     # analyze_inherent_impl() output
+    decode_error: Optional[str] = None      # first invalid UTF-8 in the file, if any
+
+
+def scan_file(path):
+    """Read path once and extract its impl lines, trait declarations and inherent methods."""
+    # Unbuffered: read() on the raw file sizes its one read() from fstat
+    with open(path, 'rb', buffering=0) as f:
+        data = f.read()
+    if b'\r' in data:
+        # Universal newlines, as text-mode reading would give
+        data = data.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    clean = strip_comments_and_strings(data)
+    
+    # Candidate impl lines are located with bytes.find (memchr speed) and
+    # only those are handed to the regex; most lines never reach it.
+    impls = []
+    i = 1
+    last = 0
+    pos = clean.find(b'impl')
+    while pos != -1:
+        m = _IMPL_LINE.match(clean, clean.rfind(b'\n', 0, pos) + 1)
+        if m:
+            i += clean.count(b'\n', last, m.start())
+            last = m.start()
+            impls.append((i, _decode(m.group(0))))
+            pos = clean.find(b'impl', m.end())
+        else:
+            pos = clean.find(b'impl', pos + 4)
+    
+    traits = {}
+    if b'trait' in clean:
+        i = 1
+        last = 0
+        for m in _TRAIT_DEF_LINE.finditer(clean):
+            i += clean.count(b'\n', last, m.start())
+            last = m.start()
+            traits.setdefault(m.group(1).decode('ascii'), (i, _decode(m.group(0)).rstrip()))
+    
+    methods = analyze_inherent_impl(clean, data)
+    
+    # Displayed slices are decoded leniently; note bad UTF-8 once per file
+    decode_error = None
+    if not data.isascii():
+        try:
+            data.decode('utf-8')
+        except UnicodeDecodeError as e:
+            decode_error = f"invalid UTF-8 at byte {e.start}"
+    
+    return FileRecord(Path(path), impls, traits, methods, decode_error)
+
+
+def _scan_one(path, cache=None):
+    """Worker for scan_files(): returns (path, record or None, error or None)."""
+    try:
+        if cache is not None:
+            return path, cache.lookup(path, scan_file), None
+        return path, scan_file(path), None
+    except Exception as e:
+        return path, None, e
+
+
+def scan_files(paths, cache=None, jobs=1):
+    """
+    Scan every path, returning {Path: FileRecord} in the order of paths.
+    
+    With a review_cache.ReviewCache, unchanged files reuse their cached
+    record. jobs > 1 (or None for one per CPU) scans in a process pool.
+    Unreadable files are reported to stderr and left out; files that are
+    not valid UTF-8 are reported once and kept.
+    """
+    paths = list(paths)
+    worker = partial(_scan_one, cache=cache)
+    if jobs == 1 or len(paths) < 2:
+        results = list(map(worker, paths))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(worker, paths, chunksize=32))
+    
+    records = {}
+    for path, record, error in results:
+        if error is not None:
+            print(f"Error reading {path}: {error}", file=sys.stderr)
+        else:
+            if record.decode_error:
+                print(f"Warning: {path}: {record.decode_error}", file=sys.stderr)
+            records[Path(path)] = record
+    return records
@@ -8,9 +8,15 @@ Stand-alone means: trait impl has its own logic, doesn't call inherent impl.
 # Git commit: TBD
 # Date: 2025-10-18
 
+import multiprocessing
 import sys
 from pathlib import Path
-import subprocess
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
+from review_utils import default_jobs, iter_rs_files
+
+sys.path.insert(0, str(Path(__file__).parent))
+from detect_delegation_to_inherent import check_file_returning_output
 
 
 def main():
@@ -18,32 +24,28 @@ def main():
     
     print("Scanning all files for trait impl forwarding to inherent impl...\n")
     
+    paths = sorted(iter_rs_files(src_dir))
     results = []
     
-    for rs_file in sorted(src_dir.rglob('*.rs')):
-        # Run the existing detect script on each file
-        result = subprocess.run(
-            ['python3', 'scripts/rust/src/detect_delegation_to_inherent.py', '--file', str(rs_file)],
-            capture_output=True,
-            text=True
-        )
-        
-        if result.returncode == 0:  # Found forwarding
-            results.append((str(rs_file), result.stdout.strip()))
+    # Scan in-process across a worker pool; print each file's report as soon
+    # as it arrives instead of collecting everything first.
+    with multiprocessing.Pool(default_jobs() or None) as pool:
+        for path, output in pool.imap_unordered(check_file_returning_output, paths, chunksize=16):
+            if not output:
+                continue
+            if not results:
+                print("=" * 100)
+                print("TRAIT IMPLS THAT FORWARD TO INHERENT IMPLS (NOT STAND-ALONE):")
+                print("=" * 100)
+                print()
+            results.append(path)
+            print(output)
+            print()
     
     if not results:
         print("✓ All trait impls are stand-alone (no forwarding detected)")
         return 0
     
-    print("=" * 100)
-    print("TRAIT IMPLS THAT FORWARD TO INHERENT IMPLS (NOT STAND-ALONE):")
-    print("=" * 100)
-    print()
-    
-    for file, output in results:
-        print(output)
-        print()
-    
     print("=" * 100)
     print(f"\nSummary: Found {len(results)} file(s) with trait impl forwarding")
     print("\nThese need to be fixed BEFORE removing inherent impls:")
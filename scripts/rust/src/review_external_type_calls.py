@@ -11,6 +11,10 @@ import re
 import sys
 from pathlib import Path
 
+# Add lib directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
+from review_utils import iter_rs_files
+
 
 def extract_imports(content):
     """Extract type imports from use statements."""
@@ -63,7 +67,7 @@ def main():
     if args.file:
         files_to_check = [Path(args.file)]
     else:
-        files_to_check = list(Path(args.dir).rglob('*.rs'))
+        files_to_check = list(iter_rs_files(Path(args.dir)))
     
     issues = []
     
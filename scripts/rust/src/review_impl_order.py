@@ -27,6 +27,10 @@ import re
 import sys
 from pathlib import Path
 
+# Add lib directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
+from review_utils import iter_rs_files
+
 # Standard library traits that should come after custom impls
 STANDARD_TRAITS = {
     'Eq', 'PartialEq', 'Ord', 'PartialOrd',
@@ -190,7 +194,7 @@ def main():
         if not search_dir.exists():
             continue
         
-        for rs_file in search_dir.rglob("*.rs"):
+        for rs_file in sorted(iter_rs_files(search_dir)):
             violations = check_impl_order(rs_file)
             all_violations.extend(violations)
     
@@ -12,9 +12,26 @@ For each inherent impl with generics, show:
 import argparse
 import re
 import os
+import subprocess
 import sys
+from functools import lru_cache
 from pathlib import Path
-from collections import defaultdict
+from typing import Dict, List
+
+# Add lib directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
+from review_utils import iter_rs_files, rg_scan
+
+sys.path.insert(0, str(Path(__file__).parent))
+from impls_common import scan_files
+
+
+# `impl<generics> Name`: the impl's bounds and the name after them
+_IMPL_GENERICS = re.compile(r'impl<([^>]+)>\s+(\w+)')
+_BOUNDS = re.compile(r'<([^>]+)>')
+# First `pub trait Name` on a line (as impls_common records them)
+_TRAIT_DEF = re.compile(r'pub[^\S\n]+trait[^\S\n]+(\w+)')
+_RG_TRAIT_PATTERN = r'pub[ \t]+trait[ \t]+\w+'
 
 
 class TeeOutput:
@@ -22,93 +39,132 @@ class TeeOutput:
     def __init__(self, log_path):
         self.log_path = Path(log_path)
         self.log_path.parent.mkdir(parents=True, exist_ok=True)
-        self.log_file = open(self.log_path, 'w', encoding='utf-8')
+        self.log_file = open(self.log_path, 'w', encoding='utf-8', buffering=1 << 16)
     
     def write(self, text):
-        print(text, end='', flush=True)
+        # Buffered on both sides; flush() at section boundaries
+        sys.stdout.write(text)
         self.log_file.write(text)
-        self.log_file.flush()
     
     def print(self, text=''):
         self.write(text + '\n')
     
+    def flush(self):
+        sys.stdout.flush()
+        self.log_file.flush()
+    
     def close(self):
+        self.flush()
         self.log_file.close()
 
 
-def extract_trait_name(impl_line):
-    """Extract trait name from impl line."""
-    # Pattern: impl<...> TraitName<...> or impl<...> TypeName {
-    # We want the name after the generics
-    match = re.search(r'impl<[^>]+>\s+(\w+)', impl_line)
-    if match:
-        return match.group(1)
-    return None
+@lru_cache(maxsize=None)
+def extract_bounds(line):
+    """Extract just the generic bounds (the first <...>) from a line."""
+    return m.group(1) if (m := _BOUNDS.search(line)) else None
+
+
+def build_trait_index(records):
+    """
+    Index the `pub trait` declarations of pre-scanned {Path: FileRecord} records.
+    
+    Returns {filepath: {trait_name: (line_number, line)}}.
+    """
+    return {str(path): record.traits for path, record in records.items()}
+
+
+def build_trait_index_rg(src_dir):
+    """
+    Index the `pub trait` declarations under src_dir with one ripgrep run.
+    
+    Returns the same shape as build_trait_index(), or None if rg is not
+    installed or fails. Unlike the scanned records, rg also sees
+    declarations inside comments.
+    """
+    trait_index = {}
+    try:
+        for path, line_number, line in rg_scan(_RG_TRAIT_PATTERN, [src_dir]):
+            m = _TRAIT_DEF.search(line)
+            if m:
+                traits = trait_index.setdefault(str(path), {})
+                traits.setdefault(m.group(1), (line_number, line.rstrip()))
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    
+    return trait_index
+
+
+# Directory -> paths of its .rs files, listed once per run
+_DIR_RS_CACHE: Dict[str, List[str]] = {}
+
 
+def list_rs(directory):
+    """Return the paths of the .rs files in directory (cached)."""
+    files = _DIR_RS_CACHE.get(directory)
+    if files is None:
+        files = _DIR_RS_CACHE[directory] = [
+            os.path.join(directory, f) for f in os.listdir(directory) if f.endswith('.rs')
+        ]
+    return files
 
-def find_trait_definition(src_dir, trait_name, start_file):
+
+def find_trait_definition(trait_index, trait_name, start_file):
     """Find the trait definition with its bounds."""
     # First try the same file
-    try:
-        with open(start_file, 'r', encoding='utf-8') as f:
-            for i, line in enumerate(f, 1):
-                if re.search(rf'pub\s+trait\s+{trait_name}\b', line):
-                    return f"{start_file}:{i}:{line.rstrip()}"
-    except:
-        pass
+    found = trait_index.get(start_file, {}).get(trait_name)
+    if found:
+        return f"{start_file}:{found[0]}:{found[1]}"
     
     # Then try other files in the same directory
-    start_dir = os.path.dirname(start_file)
-    for file in os.listdir(start_dir):
-        if file.endswith('.rs'):
-            filepath = os.path.join(start_dir, file)
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    for i, line in enumerate(f, 1):
-                        if re.search(rf'pub\s+trait\s+{trait_name}\b', line):
-                            return f"{filepath}:{i}:{line.rstrip()}"
-            except:
-                pass
+    for filepath in list_rs(os.path.dirname(start_file)):
+        found = trait_index.get(filepath, {}).get(trait_name)
+        if found:
+            return f"{filepath}:{found[0]}:{found[1]}"
     
     return None
 
 
-def find_inherent_impls_with_traits(src_dir="src"):
-    """Find all inherent impl blocks with generics and their trait definitions."""
+def find_inherent_impls_with_traits(records, paths=None, trait_index=None):
+    """
+    Yield the inherent impl blocks with generics and their trait definitions.
     
-    results = []
+    Results are produced file by file in the order of paths (default: the
+    order of records), so callers can report them as they arrive. Traits
+    are looked up in trait_index (default: built from records).
+    """
+    if trait_index is None:
+        trait_index = build_trait_index(records)
     
-    for root, dirs, files in os.walk(src_dir):
-        for file in files:
-            if not file.endswith(".rs") or file == "Types.rs":
+    for path in records if paths is None else paths:
+        if path.name == "Types.rs":
+            continue
+        
+        filepath = str(path)
+        for i, line in records[path].impls:
+            # Match: impl<...> TypeName { or impl<...> TraitName
+            # But NOT: impl ... for ...
+            # Only indented impls (inside a `pub mod`) are considered.
+            if not line[0].isspace() or ' for ' in line:
                 continue
-            
-            filepath = os.path.join(root, file)
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    for i, line in enumerate(f, 1):
-                        # Match: impl<...> TypeName { or impl<...> TraitName
-                        # But NOT: impl ... for ...
-                        if re.match(r'^\s+impl', line) and ' for ' not in line:
-                            stripped = line.strip()
-                            # Only care about ones with generics
-                            if '<' in stripped and '>' in stripped:
-                                trait_name = extract_trait_name(stripped)
-                                trait_def = None
-                                if trait_name:
-                                    trait_def = find_trait_definition(src_dir, trait_name, filepath)
-                                
-                                results.append({
-                                    'file': filepath,
-                                    'line': i,
-                                    'impl_line': line.rstrip(),
-                                    'trait_name': trait_name,
-                                    'trait_def': trait_def
-                                })
-            except Exception as e:
-                print(f"Error reading {filepath}: {e}", file=sys.stderr)
-    
-    return results
+            stripped = line.strip()
+            # Only care about ones with generics
+            if '<' in stripped and '>' in stripped:
+                # One search gives the name and, for `impl<...>` lines, the bounds
+                m = _IMPL_GENERICS.search(stripped)
+                trait_name = m.group(2) if m else None
+                impl_bounds = m.group(1) if m and m.start() == 0 else extract_bounds(stripped)
+                trait_def = None
+                if trait_name:
+                    trait_def = find_trait_definition(trait_index, trait_name, filepath)
+                
+                yield {
+                    'file': filepath,
+                    'line': i,
+                    'impl_line': line.rstrip(),
+                    'impl_bounds': impl_bounds,
+                    'trait_name': trait_name,
+                    'trait_def': trait_def
+                }
 
 
 def main():
@@ -118,73 +174,93 @@ def main():
     parser.add_argument('--log_file', 
                        default='analyses/code_review/review_impl_trait_bounds.txt',
                        help='Path to log file (default: analyses/code_review/review_impl_trait_bounds.txt)')
+    add_rg_arguments(parser)
     args = parser.parse_args()
     
     project_root = Path(__file__).parent.parent.parent.parent
     log_path = project_root / args.log_file
     
+    src_dir = project_root / "src"
+    records = scan_files(sorted(iter_rs_files(src_dir)))
+    
+    report_impl_trait_bounds(records, project_root, log_path,
+                             trait_index=rg_trait_index(args, src_dir))
+
+
+def add_rg_arguments(parser):
+    """Add the --use-rg/--no-rg switch for the trait index to parser."""
+    parser.add_argument('--use-rg', dest='use_rg', action='store_true',
+                        help='Index trait declarations with ripgrep when it is installed')
+    parser.add_argument('--no-rg', dest='use_rg', action='store_false',
+                        help='Index trait declarations from the Python scan (default)')
+    parser.set_defaults(use_rg=False)
+
+
+def rg_trait_index(args, src_dir):
+    """The ripgrep trait index if --use-rg was given and rg works, else None."""
+    if not args.use_rg:
+        return None
+    trait_index = build_trait_index_rg(src_dir)
+    if trait_index is None:
+        print("Warning: rg not available, indexing traits in Python", file=sys.stderr)
+    return trait_index
+
+
+def report_impl_trait_bounds(records, project_root, log_path, trait_index=None):
+    """Write the bounds comparison for pre-scanned {Path: FileRecord} records."""
     tee = TeeOutput(log_path)
     
     tee.print("INHERENT IMPL BLOCKS WITH TRAIT BOUNDS COMPARISON")
     tee.print("=" * 80)
     tee.print()
+    tee.flush()
     
-    src_dir = project_root / "src"
-    results = find_inherent_impls_with_traits(str(src_dir))
-    
-    # Group by file for better readability
-    by_file = defaultdict(list)
-    for result in results:
-        rel_file = result['file'].replace(str(project_root) + '/', '')
-        by_file[rel_file].append(result)
+    # Report file by file (sorted by relative path) as results are found;
+    # each file's relative path is computed once
+    root_prefix = str(project_root) + '/'
+    rel_files = {str(path): str(path).replace(root_prefix, '') for path in records}
+    paths = sorted(records, key=lambda path: rel_files[str(path)])
     
     total_impls = 0
     total_with_traits = 0
     total_missing_traits = 0
     
-    def extract_bounds(line):
-        """Extract just the generic bounds from a line."""
-        # Find the part between < and >
-        match = re.search(r'<([^>]+)>', line)
-        if match:
-            return match.group(1)
-        return None
-    
-    for filepath in sorted(by_file.keys()):
-        for result in by_file[filepath]:
-            total_impls += 1
-            rel_file = result['file'].replace(str(project_root) + '/', '')
-            
-            impl_line = result['impl_line'].strip()
-            impl_bounds = extract_bounds(impl_line)
+    for result in find_inherent_impls_with_traits(records, paths, trait_index):
+        total_impls += 1
+        rel_file = rel_files[result['file']]
+        
+        impl_line = result['impl_line'].strip()
+        impl_bounds = result['impl_bounds']
+        
+        if result['trait_def']:
+            total_with_traits += 1
+            # Parse trait def
+            trait_file, trait_line, trait_decl = result['trait_def'].split(':', 2)
+            trait_bounds = extract_bounds(trait_decl.strip())
             
-            tee.print(f"{rel_file}:{result['line']}")
-            
-            if result['trait_def']:
-                total_with_traits += 1
-                # Parse trait def
-                trait_file, trait_line, trait_decl = result['trait_def'].split(':', 2)
-                trait_bounds = extract_bounds(trait_decl.strip())
-                
-                # Determine if this is a trait impl or inherent impl
-                # Trait impl: impl<...> TraitName<...> (no 'for', matches trait name)
-                # Inherent impl: impl<...> TypeName { (has '{')
-                if ' for ' in impl_line or impl_line.endswith('{'):
-                    # Inherent impl with trait found (private inherent method)
-                    tee.print(f"  trait:         <{trait_bounds}>")
-                    tee.print(f"  trait impl:    NONE")
-                    tee.print(f"  inherent impl: <{impl_bounds}>")
-                else:
-                    # Trait impl
-                    tee.print(f"  trait:         <{trait_bounds}>")
-                    tee.print(f"  trait impl:    <{impl_bounds}>")
-                    tee.print(f"  inherent impl: NONE")
+            # Determine if this is a trait impl or inherent impl
+            # Trait impl: impl<...> TraitName<...> (no 'for', matches trait name)
+            # Inherent impl: impl<...> TypeName { (has '{')
+            if ' for ' in impl_line or impl_line.endswith('{'):
+                # Inherent impl with trait found (private inherent method)
+                trait_impl, inherent_impl = "NONE", f"<{impl_bounds}>"
             else:
-                total_missing_traits += 1
-                tee.print(f"  trait:         NONE")
-                tee.print(f"  trait impl:    NONE")
-                tee.print(f"  inherent impl: <{impl_bounds}>")
+                # Trait impl
+                trait_impl, inherent_impl = f"<{impl_bounds}>", "NONE"
+            trait = f"<{trait_bounds}>"
+        else:
+            total_missing_traits += 1
+            trait, trait_impl, inherent_impl = "NONE", "NONE", f"<{impl_bounds}>"
+        
+        # One write per record
+        tee.write(
+            f"{rel_file}:{result['line']}\n"
+            f"  trait:         {trait}\n"
+            f"  trait impl:    {trait_impl}\n"
+            f"  inherent impl: {inherent_impl}\n"
+        )
     
+    tee.flush()
     tee.print(f"\n{'='*80}")
     tee.print("SUMMARY")
     tee.print('='*80)
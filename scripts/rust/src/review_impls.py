@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Run the impl review checks over a single scan of src/.
+
+Each .rs file is read and parsed once (impls_common.scan_file, spread
+over a process pool), or its record is reused from target/review_cache if
+the file is unchanged, and the resulting records are handed to every
+enabled reporter:
+
+  bounds   review_impl_trait_bounds        inherent impls vs trait bounds
+  dup      review_inherent_and_trait_impl  structs with inherent + custom trait impls
+  lengths  review_inherent_method_lengths  inherent methods to move into traits
+  plus     review_inherent_plus_trait_impl structs with inherent + trait impls
+"""
+
+import sys
+from pathlib import Path
+
+# Add lib directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
+from review_utils import (
+    ReviewContext, add_cache_argument, add_jobs_argument, create_review_parser, open_cache
+)
+
+sys.path.insert(0, str(Path(__file__).parent))
+from impls_common import CACHE_VERSION, scan_files
+from review_impl_trait_bounds import add_rg_arguments, report_impl_trait_bounds, rg_trait_index
+from review_inherent_and_trait_impl import report_inherent_and_trait
+from review_inherent_method_lengths import report_inherent_method_lengths
+from review_inherent_plus_trait_impl import report_inherent_plus_trait
+
+
+CHECKS = ['bounds', 'dup', 'lengths', 'plus']
+
+
+def main():
+    parser = create_review_parser(
+        description="Run the impl review checks over one scan of src/"
+    )
+    parser.add_argument(
+        '--checks',
+        default=','.join(CHECKS),
+        help=f"Comma-separated checks to run (default: {','.join(CHECKS)})"
+    )
+    parser.add_argument(
+        '--log_file',
+        default='analyses/code_review/review_impl_trait_bounds.txt',
+        help='Log file for the bounds check (default: analyses/code_review/review_impl_trait_bounds.txt)'
+    )
+    add_cache_argument(parser)
+    add_jobs_argument(parser)
+    add_rg_arguments(parser)
+    args = parser.parse_args()
+    context = ReviewContext(args)
+
+    checks = [c.strip() for c in args.checks.split(',') if c.strip()]
+    unknown = [c for c in checks if c not in CHECKS]
+    if unknown:
+        print(f"Error: unknown check(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    src_dir = context.repo_root / 'src'
+    if not src_dir.exists():
+        print("✗ No src/ directory found")
+        return 1
+
+    files = context.find_files([src_dir])
+    if context.dry_run:
+        print(f"Would check {len(files)} file(s) for: {', '.join(checks)}")
+        return 0
+
+    cache = open_cache(args, 'impls', CACHE_VERSION, context.repo_root)
+    records = scan_files(files, cache, jobs=args.jobs or None)
+    if cache is not None:
+        cache.prune(max_entries=max(2000, 2 * len(files)))
+
+    exit_code = 0
+    for check in checks:
+        print(f"[{check}]")
+        if check == 'bounds':
+            report_impl_trait_bounds(records, context.repo_root, context.repo_root / args.log_file,
+                                     trait_index=rg_trait_index(args, src_dir))
+        elif check == 'dup':
+            exit_code |= report_inherent_and_trait(records, context.repo_root)
+        elif check == 'lengths':
+            exit_code |= report_inherent_method_lengths(records, context)
+        elif check == 'plus':
+            exit_code |= report_inherent_plus_trait(records, context)
+        print()
+
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
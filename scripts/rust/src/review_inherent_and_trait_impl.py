@@ -17,8 +17,15 @@ import re
 import sys
 from pathlib import Path
 
+# Add lib directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
+from review_utils import iter_rs_files
 
-STANDARD_TRAITS = {
+sys.path.insert(0, str(Path(__file__).parent))
+from impls_common import for_trait_token, scan_file, scan_files, struct_impls_for
+
+
+STANDARD_TRAITS = frozenset({
     'Eq', 'PartialEq', 'Ord', 'PartialOrd',
     'Debug', 'Display', 
     'Clone', 'Copy',
@@ -36,7 +43,15 @@ STANDARD_TRAITS = {
     'Send', 'Sync',
     'Fn', 'FnMut', 'FnOnce',
     'Error',
-}
+})
+
+# One pass classifies an impl line: trait impl `impl ... Trait<..> for Struct`
+# (trait path prefix ignored) or inherent impl `impl ... Struct<..> {`
+_IMPL_CLASSIFY = re.compile(
+    r'impl(?:<[^>]+>)?\s+'
+    r'(?:(?:[\w:]+::)?(?P<trait>\w+)(?:<[^>]+>)?\s+for\s+(?P<for_struct>\w+)'
+    r'|(?P<struct>\w+)(?:<[^>]+>)?\s*\{)'
+)
 
 
 def extract_impl_info(line):
@@ -47,40 +62,31 @@ def extract_impl_info(line):
     - struct_name: name of the struct
     - trait_name: name of the trait (if trait impl), or None
     """
-    line = re.sub(r'//.*$', '', line).strip()
+    line = line.strip()
     
-    # Check for trait impl: impl ... TraitName ... for StructName
-    trait_match = re.search(r'impl(?:<[^>]+>)?\s+(?:[\w:]+::)?(\w+)(?:<[^>]+>)?\s+for\s+(\w+)', line)
-    if trait_match:
-        trait_name = trait_match.group(1)
-        struct_name = trait_match.group(2)
-        return ('trait', struct_name, trait_name)
+    match = _IMPL_CLASSIFY.search(line)
+    if not match:
+        return None
     
-    # Check for inherent impl: impl ... StructName
-    inherent_match = re.search(r'impl(?:<[^>]+>)?\s+(\w+)(?:<[^>]+>)?\s*\{', line)
-    if inherent_match:
-        struct_name = inherent_match.group(1)
-        return ('inherent', struct_name, None)
+    # Trait impl: impl ... TraitName ... for StructName
+    if match.group('trait'):
+        return ('trait', match.group('for_struct'), match.group('trait'))
     
-    return None
+    # Inherent impl: impl ... StructName
+    return ('inherent', match.group('struct'), None)
 
 
-def review_file(file_path):
-    """Review a single file for structs with both inherent and trait impls."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-    except Exception as e:
-        print(f"Error reading {file_path}: {e}", file=sys.stderr)
-        return []
-    
+def review_record(record):
+    """Find structs with both inherent and trait impls in one scanned file."""
     # Track impls per struct
-    struct_impls = {}  # struct_name -> {'inherent': bool, 'traits': [trait_names]}
+    struct_impls = {}  # struct_name -> StructImpls
     
-    for i, line in enumerate(lines, start=1):
+    for i, line in record.impls:
         stripped = line.strip()
         
-        if not stripped.startswith('impl'):
+        # Fast reject of standard trait impls (`impl Clone for ..`) before the regex
+        trait_token = for_trait_token(stripped)
+        if trait_token and trait_token.rpartition('::')[2] in STANDARD_TRAITS:
             continue
         
         impl_info = extract_impl_info(stripped)
@@ -88,53 +94,45 @@ def review_file(file_path):
             continue
         
         impl_type, struct_name, trait_name = impl_info
-        
-        if struct_name not in struct_impls:
-            struct_impls[struct_name] = {'inherent': False, 'traits': [], 'lines': []}
+        impls = struct_impls_for(struct_impls, struct_name)
         
         if impl_type == 'inherent':
-            struct_impls[struct_name]['inherent'] = True
-            struct_impls[struct_name]['lines'].append((i, 'inherent', None))
+            impls.add_inherent(i)
         elif impl_type == 'trait':
             # Only track custom traits, not standard library traits
             if trait_name not in STANDARD_TRAITS:
-                struct_impls[struct_name]['traits'].append(trait_name)
-                struct_impls[struct_name]['lines'].append((i, 'trait', trait_name))
+                impls.add_trait(trait_name, i)
     
     # Collect violations
     violations = []
-    for struct_name, info in sorted(struct_impls.items()):
-        if info['inherent'] and info['traits']:
+    for struct_name, impls in sorted(struct_impls.items()):
+        if impls.inherent and impls.traits:
             violations.append({
                 'struct': struct_name,
-                'traits': info['traits'],
-                'lines': info['lines']
+                'traits': [t for _, t in impls.lines if t is not None],
+                'lines': impls.lines
             })
     
     return violations
 
 
-def main():
-    # Find workspace root (contains Cargo.toml)
-    script_path = Path(__file__).resolve()
-    workspace_root = script_path
-    while workspace_root.parent != workspace_root:
-        if (workspace_root / 'Cargo.toml').exists():
-            break
-        workspace_root = workspace_root.parent
-    
-    # Find all Rust files in src/
-    src_dir = workspace_root / 'src'
-    if not src_dir.exists():
-        print(f"Error: {src_dir} not found", file=sys.stderr)
-        return 1
-    
-    rust_files = sorted(src_dir.rglob('*.rs'))
+def review_file(file_path):
+    """Review a single file for structs with both inherent and trait impls."""
+    try:
+        record = scan_file(file_path)
+    except Exception as e:
+        print(f"Error reading {file_path}: {e}", file=sys.stderr)
+        return []
     
+    return review_record(record)
+
+
+def report_inherent_and_trait(records, workspace_root):
+    """Report violations across pre-scanned {Path: FileRecord} records."""
     total_violations = 0
     
-    for file_path in rust_files:
-        violations = review_file(file_path)
+    for file_path in sorted(records):
+        violations = review_record(records[file_path])
         
         if violations:
             rel_path = file_path.relative_to(workspace_root)
@@ -145,8 +143,8 @@ def main():
                 print(f"    Struct: {v['struct']}")
                 print(f"    Has both inherent impl AND custom trait impl(s): {', '.join(v['traits'])}")
                 
-                for line_num, impl_type, trait_name in v['lines']:
-                    if impl_type == 'inherent':
+                for line_num, trait_name in v['lines']:
+                    if trait_name is None:
                         print(f"      Line {line_num}: inherent impl")
                     else:
                         print(f"      Line {line_num}: {trait_name} trait impl")
@@ -158,6 +156,26 @@ def main():
     return 1 if total_violations > 0 else 0
 
 
+def main():
+    # Find workspace root (contains Cargo.toml)
+    script_path = Path(__file__).resolve()
+    workspace_root = script_path
+    while workspace_root.parent != workspace_root:
+        if (workspace_root / 'Cargo.toml').exists():
+            break
+        workspace_root = workspace_root.parent
+    
+    # Find all Rust files in src/
+    src_dir = workspace_root / 'src'
+    if not src_dir.exists():
+        print(f"Error: {src_dir} not found", file=sys.stderr)
+        return 1
+    
+    rust_files = sorted(iter_rs_files(src_dir))
+    
+    return report_inherent_and_trait(scan_files(rust_files), workspace_root)
+
+
 if __name__ == '__main__':
     sys.exit(main())
 
@@ -15,80 +15,74 @@ Most structs should have ONLY trait impl, not both.
 import re
 import sys
 from pathlib import Path
-from collections import defaultdict
 
 # Add lib directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
-from review_utils import ReviewContext, create_review_parser
+from review_utils import ReviewContext, create_review_parser, iter_rs_files
 
+sys.path.insert(0, str(Path(__file__).parent))
+from impls_common import for_trait_token, scan_files, struct_impls_for
 
-def analyze_file(filepath, context):
-    """Find structs with both inherent and trait impls."""
-    try:
-        with open(filepath, 'r') as f:
-            lines = f.readlines()
-    except Exception:
-        return []
-    
-    # Track struct_name -> {'inherent': [line_nums], 'traits': {trait_name: [line_nums]}}
-    struct_impls = defaultdict(lambda: {'inherent': [], 'traits': defaultdict(list)})
+
+# One match classifies an impl line: trait impl `impl<...> Trait<...> for Struct`
+# or inherent impl `impl<...> Struct<...> {` / `... where`
+_IMPL_CLASSIFY = re.compile(
+    r'\s*impl(?:<[^>]+>)?\s+'
+    r'(?:(?P<trait>\w+)(?:<[^>]*>)?\s+for\s+(?P<for_struct>\w+)'
+    r'|(?P<struct>\w+)(?:<[^>]*>)?\s*(?:where\s+|\{))'
+)
+
+STANDARD_TRAITS = frozenset({
+    'Debug', 'Clone', 'Copy', 'PartialEq', 'Eq', 'PartialOrd', 'Ord',
+    'Hash', 'Display', 'Default', 'From', 'Into', 'AsRef', 'AsMut',
+    'Deref', 'DerefMut', 'Drop', 'Iterator', 'IntoIterator',
+    'Send', 'Sync', 'Sized', 'Unpin'
+})
+
+
+def analyze_record(record):
+    """Find structs with both inherent and trait impls in one scanned file."""
+    # Track struct_name -> StructImpls
+    struct_impls = {}
     
-    for i, line in enumerate(lines, 1):
-        # Match inherent impl: impl<...> StructName<...> {
-        inherent_match = re.match(r'\s*impl(?:<[^>]+>)?\s+(\w+)(?:<[^>]*>)?\s*(?:where\s+|\{)', line)
-        if inherent_match and ' for ' not in line:
-            struct_name = inherent_match.group(1)
-            struct_impls[struct_name]['inherent'].append(i)
+    for i, line in record.impls:
+        # Fast reject of standard trait impls (`impl Clone for ..`) before the regex
+        if for_trait_token(line) in STANDARD_TRAITS:
+            continue
         
-        # Match trait impl: impl<...> TraitName<...> for StructName<...>
-        trait_match = re.match(r'\s*impl(?:<[^>]+>)?\s+(\w+)(?:<[^>]*>)?\s+for\s+(\w+)', line)
-        if trait_match:
-            trait_name = trait_match.group(1)
-            struct_name = trait_match.group(2)
-            
+        match = _IMPL_CLASSIFY.match(line)
+        if not match:
+            continue
+        
+        # Trait impl: impl<...> TraitName<...> for StructName<...>
+        trait_name = match.group('trait')
+        if trait_name:
             # Skip standard traits
-            standard_traits = {
-                'Debug', 'Clone', 'Copy', 'PartialEq', 'Eq', 'PartialOrd', 'Ord',
-                'Hash', 'Display', 'Default', 'From', 'Into', 'AsRef', 'AsMut',
-                'Deref', 'DerefMut', 'Drop', 'Iterator', 'IntoIterator',
-                'Send', 'Sync', 'Sized', 'Unpin'
-            }
-            
-            if trait_name not in standard_traits:
-                struct_impls[struct_name]['traits'][trait_name].append(i)
+            if trait_name not in STANDARD_TRAITS:
+                struct_impls_for(struct_impls, match.group('for_struct')).add_trait(trait_name, i)
+        # Inherent impl: impl<...> StructName<...> {
+        elif ' for ' not in line:
+            struct_impls_for(struct_impls, match.group('struct')).add_inherent(i)
     
     # Find structs with BOTH inherent AND trait impls
     violations = []
     for struct_name, impls in struct_impls.items():
-        if impls['inherent'] and impls['traits']:
+        if impls.inherent and impls.traits:
             violations.append({
                 'struct': struct_name,
-                'inherent_lines': impls['inherent'],
-                'traits': dict(impls['traits'])
+                'inherent_lines': impls.inherent,
+                'traits': impls.traits
             })
     
     return violations
 
 
-def main():
-    parser = create_review_parser(
-        description="Detect structs with both inherent impl and trait impl (should have trait impl only)"
-    )
-    args = parser.parse_args()
-    context = ReviewContext(args)
-
-    # Only check src/ files
-    src_dir = context.repo_root / 'src'
-    if not src_dir.exists():
-        print("✗ No src/ directory found")
-        return 1
-    
-    files = list(src_dir.rglob('*.rs'))
-    
+def report_inherent_plus_trait(records, context):
+    """Report violations across pre-scanned {Path: FileRecord} records."""
     all_violations = {}
     
-    for filepath in sorted(files):
-        violations = analyze_file(filepath, context)
+    for filepath in sorted(records):
+        violations = analyze_record(records[filepath])
         if violations:
             all_violations[filepath] = violations
     
@@ -124,6 +118,24 @@ def main():
     return 1 if all_violations else 0
 
 
+def main():
+    parser = create_review_parser(
+        description="Detect structs with both inherent impl and trait impl (should have trait impl only)"
+    )
+    args = parser.parse_args()
+    context = ReviewContext(args)
+
+    # Only check src/ files
+    src_dir = context.repo_root / 'src'
+    if not src_dir.exists():
+        print("✗ No src/ directory found")
+        return 1
+    
+    files = list(iter_rs_files(src_dir))
+    
+    return report_inherent_plus_trait(scan_files(sorted(files)), context)
+
+
 if __name__ == '__main__':
     sys.exit(main())
 
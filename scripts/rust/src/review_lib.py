@@ -14,29 +14,54 @@ import sys
 from pathlib import Path
 import re
 
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
+from brace_depth import brace_pairs
+from rust_source import strip_comments_and_strings
+
+# Match the head of: pub mod ChapXX { ... }
+_CHAPTER_HEAD_RE = re.compile(r'pub\s+mod\s+(\w+)\s*\{')
+# Module names declared within a chapter
+_MOD_RE = re.compile(r'pub\s+mod\s+(\w+)\s*;')
+# Top-level module declarations like "pub mod Types;"
+_TOPLEVEL_RE = re.compile(r'^pub\s+mod\s+(\w+)\s*;', re.MULTILINE)
+
+def _iter_chapters(content):
+    """
+    Yield (chapter_name, body) for each top-level `pub mod X { ... }` block.
+    
+    The body runs to the matching brace, so nested blocks (#[cfg] modules
+    and the like) stay inside their chapter; scanning resumes after it.
+    """
+    # Every chapter's end comes from one pass over the file's braces
+    pairs = brace_pairs(content)
+    pos = 0
+    while True:
+        match = _CHAPTER_HEAD_RE.search(content, pos)
+        if not match:
+            return
+        start = match.end()
+        
+        # Find matching closing brace
+        end = pairs.get(start - 1, len(content))
+        
+        yield match.group(1), content[start:end]
+        pos = end + 1
+
 def parse_nested_modules(content):
     """Parse nested module declarations from lib.rs"""
     declared = {}  # chapter -> set of modules
+    # Commented-out declarations (and braces in comments) do not count
+    content = strip_comments_and_strings(content)
     
-    # Match: pub mod ChapXX { ... }
-    chapter_pattern = re.compile(
-        r'pub\s+mod\s+(\w+)\s*\{([^}]*)\}',
-        re.MULTILINE | re.DOTALL
-    )
-    
-    for match in chapter_pattern.finditer(content):
-        chapter = match.group(1)
-        chapter_content = match.group(2)
+    for chapter, chapter_content in _iter_chapters(content):
         
         # Extract module names within this chapter
-        mod_pattern = re.compile(r'pub\s+mod\s+(\w+)\s*;')
-        modules = {m.group(1) for m in mod_pattern.finditer(chapter_content)}
+        modules = {m.group(1) for m in _MOD_RE.finditer(chapter_content)}
         declared[chapter] = modules
     
     # Also handle top-level module declarations like "pub mod Types;"
-    top_level_pattern = re.compile(r'^pub\s+mod\s+(\w+)\s*;', re.MULTILINE)
     top_level = set()
-    for match in top_level_pattern.finditer(content):
+    for match in _TOPLEVEL_RE.finditer(content):
         mod_name = match.group(1)
         # Only include if not a chapter module
         if mod_name not in declared:
@@ -62,30 +87,27 @@ def find_actual_modules(src_dir):
     
     return actual, top_level_files
 
-def main():
-    repo_root = Path(__file__).parent.parent.parent.parent
-    lib_rs = repo_root / "src" / "lib.rs"
-    src_dir = repo_root / "src"
-    
-    # Read lib.rs
-    with open(lib_rs) as f:
-        lib_content = f.read()
-    
+def report_lib_declarations(lib_content, src_dir):
+    """Compare lib.rs (as lib_content) against src_dir and print the result."""
     declared_chapters, declared_top = parse_nested_modules(lib_content)
     actual_chapters, actual_top = find_actual_modules(src_dir)
     
     errors = []
+    # Count violations for pareto analysis
+    violation_count = 0
     
     # Check top-level modules
     missing_top = actual_top - declared_top
     extra_top = declared_top - actual_top
     
     if missing_top:
+        violation_count += len(missing_top)
         errors.append("❌ Top-level modules not declared in lib.rs:")
         for mod in sorted(missing_top):
             errors.append(f"   pub mod {mod};")
     
     if extra_top:
+        violation_count += len(extra_top)
         errors.append("❌ Top-level declarations without corresponding files:")
         for mod in sorted(extra_top):
             errors.append(f"   {mod} (expected src/{mod}.rs)")
@@ -101,11 +123,13 @@ def main():
         extra = declared_mods - actual_mods
         
         if missing:
+            violation_count += len(missing)
             errors.append(f"❌ Modules in src/{chapter}/ not declared in lib.rs:")
             for mod in sorted(missing):
                 errors.append(f"   pub mod {mod}; // in pub mod {chapter} block")
         
         if extra:
+            violation_count += len(extra)
             errors.append(f"❌ Modules declared in {chapter} without corresponding files:")
             for mod in sorted(extra):
                 errors.append(f"   {mod} (expected src/{chapter}/{mod}.rs)")
@@ -114,14 +138,6 @@ def main():
         for line in errors:
             print(line)
         
-        # Count violations for pareto analysis
-        violation_count = 0
-        for line in errors:
-            if line.startswith("   pub mod "):
-                violation_count += 1
-            elif line.startswith("   ") and "(expected " in line:
-                violation_count += 1
-        
         print(f"\nTotal violations: {violation_count}")
         return 1
     
@@ -129,6 +145,17 @@ def main():
     print(f"✓ All {total_declared} source modules properly declared in lib.rs")
     return 0
 
+def main():
+    repo_root = Path(__file__).parent.parent.parent.parent
+    lib_rs = repo_root / "src" / "lib.rs"
+    src_dir = repo_root / "src"
+    
+    # Read lib.rs
+    with open(lib_rs) as f:
+        lib_content = f.read()
+    
+    return report_lib_declarations(lib_content, src_dir)
+
 if __name__ == "__main__":
     sys.exit(main())
 
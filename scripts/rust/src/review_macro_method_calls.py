@@ -20,6 +20,14 @@ import sys
 from pathlib import Path
 from collections import defaultdict
 
+# Add lib directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
+from review_utils import (
+    add_cache_argument, add_jobs_argument, get_repo_root, iter_rs_files, map_files, open_cache
+)
+from brace_depth import depth_array, matching_brace
+from rust_source import strip_comments_and_strings
+
 
 STANDARD_TRAITS = {
     'Eq', 'PartialEq', 'Ord', 'PartialOrd',
@@ -33,9 +41,16 @@ STANDARD_TRAITS = {
 }
 
 
-def find_macros(content):
-    """Find all macro_rules! definitions and their bodies."""
+def find_macros(content, depth=None):
+    """
+    Find all macro_rules! definitions and their bodies.
+    
+    depth is depth_array(content), if the caller already has it.
+    """
     macros = []
+    # Most files export no macros; skip the regex and brace walk for them
+    if '#[macro_export]' not in content:
+        return macros
     
     # Pattern: macro_rules! name { ... }
     pattern = r'#\[macro_export\]\s*macro_rules!\s+(\w+)\s*\{'
@@ -45,23 +60,14 @@ def find_macros(content):
         start = match.end() - 1  # Start at opening brace
         
         # Find matching closing brace
-        brace_count = 0
-        i = start
-        while i < len(content):
-            if content[i] == '{':
-                brace_count += 1
-            elif content[i] == '}':
-                brace_count -= 1
-                if brace_count == 0:
-                    break
-            i += 1
+        end = matching_brace(content, start, depth)
         
-        if i < len(content):
-            macro_body = content[start:i+1]
+        if end < len(content):
+            macro_body = content[start:end+1]
             macros.append({
                 'name': macro_name,
                 'start': start,
-                'end': i+1,
+                'end': end+1,
                 'body': macro_body,
             })
     
@@ -103,15 +109,55 @@ def find_type_method_calls(macro_body):
     return calls
 
 
-def find_impl_info(file_path):
-    """Find all impl blocks and their methods for a file."""
+def read_source(file_path):
+    """Read a source file once for both passes; None if it cannot be read."""
     try:
         with open(file_path, 'r') as f:
-            content = f.read()
+            return f.read()
     except Exception:
-        return {}
+        return None
+
+
+def find_macro_calls(content, depth=None):
+    """[(macro_name, Type::method() calls)] for the exported macros in content."""
+    return [(macro['name'], find_type_method_calls(macro['body']))
+            for macro in find_macros(content, depth)]
+
+
+def scan_path(file_path):
+    """
+    Everything both passes need from one file: (impl_info, macro_calls).
+    
+    None if the file cannot be read.
+    """
+    content = read_source(file_path)
+    if content is None:
+        return None
+    return scan_content(content)
+
+
+def scan_content(content):
+    """scan_path() for a file's contents."""
+    # Impls, macros and calls inside comments or literals are not code
+    content = strip_comments_and_strings(content)
+    # One brace-depth pass serves both the impl and the macro scan, when
+    # either has anything to look at
+    depth = None
+    if 'impl' in content or '#[macro_export]' in content:
+        depth = depth_array(content)
+    # Plain dict: the defaultdict's factory lambda cannot be pickled
+    return dict(find_impl_info(content, depth)), find_macro_calls(content, depth)
+
+
+def find_impl_info(content, depth=None):
+    """
+    Find all impl blocks and their methods in a file's content.
     
+    depth is depth_array(content), if the caller already has it.
+    """
     impl_info = defaultdict(lambda: {'inherent': set(), 'trait': set()})
+    if 'impl' not in content:
+        return impl_info
     
     # Find inherent impls: impl TypeName { ... }
     inherent_pattern = r'impl(?:<[^>]+>)?\s+(\w+)(?:<[^>]*>)?\s*\{'
@@ -119,16 +165,9 @@ def find_impl_info(file_path):
         type_name = match.group(1)
         # Find methods in this impl
         start = match.end()
-        brace_count = 1
-        i = start
-        while i < len(content) and brace_count > 0:
-            if content[i] == '{':
-                brace_count += 1
-            elif content[i] == '}':
-                brace_count -= 1
-            i += 1
+        end = matching_brace(content, start - 1, depth)
         
-        impl_body = content[start:i]
+        impl_body = content[start:end]
         methods = re.findall(r'\bfn\s+(\w+)', impl_body)
         impl_info[type_name]['inherent'].update(methods)
     
@@ -148,38 +187,30 @@ def find_impl_info(file_path):
         if brace_start == -1:
             continue
         
-        brace_count = 1
-        i = brace_start + 1
-        while i < len(content) and brace_count > 0:
-            if content[i] == '{':
-                brace_count += 1
-            elif content[i] == '}':
-                brace_count -= 1
-            i += 1
+        end = matching_brace(content, brace_start, depth)
         
-        impl_body = content[brace_start:i]
+        impl_body = content[brace_start:end]
         methods = re.findall(r'\bfn\s+(\w+)', impl_body)
         impl_info[type_name]['trait'].update(methods)
     
     return impl_info
 
 
-def analyze_file(file_path, all_impl_info):
-    """Analyze a file for broken macro calls."""
-    try:
-        with open(file_path, 'r') as f:
-            content = f.read()
-    except Exception:
-        return []
-    
-    macros = find_macros(content)
-    if not macros:
-        return []
-    
+def build_global_impls(all_impl_info):
+    """Merge the per-file impl info into one {type: {'inherent', 'trait'}} index."""
+    global_impls = defaultdict(lambda: {'inherent': set(), 'trait': set()})
+    for impl_info in all_impl_info.values():
+        for type_name, methods in impl_info.items():
+            global_impls[type_name]['inherent'] |= methods['inherent']
+            global_impls[type_name]['trait'] |= methods['trait']
+    return global_impls
+
+
+def check_macro_calls(file_path, macro_calls, global_impls):
+    """Check a file's find_macro_calls() result against build_global_impls()."""
     results = []
     
-    for macro in macros:
-        calls = find_type_method_calls(macro['body'])
+    for macro_name, calls in macro_calls:
         if not calls:
             continue
         
@@ -188,17 +219,10 @@ def analyze_file(file_path, all_impl_info):
             type_name = call['type']
             method_name = call['method']
             
-            # Check if method exists in inherent impl
-            has_inherent = False
-            has_trait = False
-            
-            # Check all files for this type
-            for impl_info in all_impl_info.values():
-                if type_name in impl_info:
-                    if method_name in impl_info[type_name]['inherent']:
-                        has_inherent = True
-                    if method_name in impl_info[type_name]['trait']:
-                        has_trait = True
+            # Check if method exists in an inherent or trait impl anywhere
+            entry = global_impls.get(type_name)
+            has_inherent = entry is not None and method_name in entry['inherent']
+            has_trait = entry is not None and method_name in entry['trait']
             
             # If only in trait (not inherent), it will break
             if has_trait and not has_inherent:
@@ -220,13 +244,51 @@ def analyze_file(file_path, all_impl_info):
         if broken_calls:
             results.append({
                 'file': str(file_path),
-                'macro': macro['name'],
+                'macro': macro_name,
                 'broken_calls': broken_calls,
             })
     
     return results
 
 
+def report_macro_calls(macro_calls, global_impls):
+    """
+    Check every file's macro calls and print the --all report.
+    
+    macro_calls maps each file to its find_macro_calls() result; returns
+    the exit code.
+    """
+    print("\nAnalyzing macros...")
+    all_results = []
+    
+    for rs_file, calls in macro_calls.items():
+        results = check_macro_calls(rs_file, calls, global_impls)
+        if results:
+            all_results.extend(results)
+    
+    if not all_results:
+        print("\n✓ No broken macro calls found")
+        return 0
+    
+    print("\n" + "=" * 100)
+    print("BROKEN MACRO CALLS (method only in trait, needs qualified syntax):")
+    print("=" * 100)
+    
+    for r in all_results:
+        print(f"\n{r['file']}")
+        print(f"  Macro: {r['macro']}")
+        for call in r['broken_calls']:
+            print(f"    ❌ {call['full_match']}")
+            print(f"       {call['status']}")
+    
+    print(f"\n\nSummary: Found {len(all_results)} macro(s) with broken calls")
+    print(f"\nThese macros need to use qualified syntax:")
+    print(f"  FROM: TypeName::method(...)")
+    print(f"  TO:   <TypeName as TraitName>::method(...)")
+    
+    return 1
+
+
 def main():
     import argparse
     
@@ -235,20 +297,40 @@ def main():
     )
     parser.add_argument('--file', type=str, help='Single file to analyze')
     parser.add_argument('--all', action='store_true', help='Analyze all src files')
+    add_jobs_argument(parser)
+    add_cache_argument(parser)
     args = parser.parse_args()
     
     src_dir = Path('src')
+    # One directory walk serves both passes
+    rs_files = sorted(iter_rs_files(src_dir))
+    
+    # Unchanged files reuse their scan from target/review_cache
+    cache = open_cache(args, 'macro_method_calls', 3, get_repo_root())
     
-    # First pass: collect all impl info from all files
+    # First pass: read every file once, collecting its impl info and its
+    # macros' Type::method() calls, spread over a process pool. The macro
+    # pass then only needs the (small) per-file call lists.
     print("Scanning codebase for impl blocks...")
+    scanned = map_files(scan_path, rs_files, jobs=args.jobs, chunksize=32, cache=cache)
+    
+    macro_calls = {}
     all_impl_info = {}
-    for rs_file in src_dir.rglob('*.rs'):
-        impl_info = find_impl_info(rs_file)
+    for rs_file, scan in zip(rs_files, scanned):
+        if scan is None:
+            continue
+        impl_info, macro_calls[rs_file] = scan
         if impl_info:
             all_impl_info[str(rs_file)] = impl_info
+    # Every call site then looks its type up once instead of in every file
+    global_impls = build_global_impls(all_impl_info)
     
     if args.file:
-        results = analyze_file(Path(args.file), all_impl_info)
+        file_path = Path(args.file)
+        calls = macro_calls.get(file_path)
+        if calls is None:
+            calls = find_macro_calls(strip_comments_and_strings(read_source(file_path) or ''))
+        results = check_macro_calls(file_path, calls, global_impls)
         if results:
             for r in results:
                 print(f"\n{r['file']}")
@@ -260,35 +342,7 @@ def main():
             print("No broken macro calls found")
     
     elif args.all:
-        print("\nAnalyzing macros...")
-        all_results = []
-        
-        for rs_file in sorted(src_dir.rglob('*.rs')):
-            results = analyze_file(rs_file, all_impl_info)
-            if results:
-                all_results.extend(results)
-        
-        if not all_results:
-            print("\n✓ No broken macro calls found")
-            return 0
-        
-        print("\n" + "=" * 100)
-        print("BROKEN MACRO CALLS (method only in trait, needs qualified syntax):")
-        print("=" * 100)
-        
-        for r in all_results:
-            print(f"\n{r['file']}")
-            print(f"  Macro: {r['macro']}")
-            for call in r['broken_calls']:
-                print(f"    ❌ {call['full_match']}")
-                print(f"       {call['status']}")
-        
-        print(f"\n\nSummary: Found {len(all_results)} macro(s) with broken calls")
-        print(f"\nThese macros need to use qualified syntax:")
-        print(f"  FROM: TypeName::method(...)")
-        print(f"  TO:   <TypeName as TraitName>::method(...)")
-        
-        return 1
+        return report_macro_calls(macro_calls, global_impls)
     
     else:
         print("Error: Use --file or --all", file=sys.stderr)
@@ -12,66 +12,283 @@ Checks src/ for code outside module blocks.
 # Date: 2025-10-17 05:17:36 -0700
 
 
+import re
+import subprocess
 import sys
+from functools import partial
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "lib"))
-from review_utils import ReviewContext, create_review_parser
+from review_utils import ReviewContext, create_review_parser, rg_scan
+from review_cache import ReviewCache
+from brace_depth import depth_array, matching_brace
+from rust_source import strip_comments_and_strings
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
-def check_file(file_path: Path, context: ReviewContext) -> list:
-    """Check if all code is inside pub mod blocks."""
+
+# Crate roots hold module declarations, not module bodies
+EXEMPT_FILES = ('lib.rs', 'main.rs')
+ITEM_KEYWORDS = ('fn ', 'struct ', 'enum ', 'type ', 'trait ', 'impl ', 'const ', 'static ')
+_COMMENT_PREFIXES = ('//', '/*', '*')
+_MODULE_PREFIXES = ('pub mod ', 'mod ')
+_EXEMPT_PREFIXES = ('use ', '#[')
+# Lines containing any of ITEM_KEYWORDS, for the ripgrep prefilter
+_RG_ITEM_PATTERN = '(?:' + '|'.join(k.strip() for k in ITEM_KEYWORDS) + ') '
+
+# `pub mod M {` / `mod M {` up to and including the brace
+_MOD_HEAD_RE = re.compile(r'^[ \t]*(?:pub(?:\([^)\n]*\))?[ \t]+)?mod[ \t]+\w+[ \t]*\{', re.MULTILINE)
+
+
+def _keyword_automaton():
+    """Aho-Corasick automaton over ITEM_KEYWORDS, or None without pyahocorasick."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword in ITEM_KEYWORDS:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AUTOMATON = _keyword_automaton()
+
+
+def _outside_module_spans(masked: str) -> list:
+    """
+    Return [(start, end)] offsets of the parts of masked outside every mod block.
     
-    # Skip lib.rs and main.rs
-    if file_path.name in ['lib.rs', 'main.rs']:
-        return []
+    masked is the file after strip_comments_and_strings(). Each module runs
+    from its head to the matching brace, and heads inside a module already
+    found are skipped, so nested modules (mod tests { } inside pub mod M { })
+    neither end the outer module early nor restart it.
+    """
+    depth = depth_array(masked)
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
+    spans = []
+    start = 0
+    for m in _MOD_HEAD_RE.finditer(masked):
+        open_pos = m.end() - 1
+        if open_pos < start:
+            continue
+        spans.append((start, open_pos))
+        start = matching_brace(masked, open_pos, depth) + 1
+    if start < len(masked):
+        spans.append((start, len(masked)))
+    return spans
+
+
+def _item_keyword(stripped: str):
+    """
+    The item keyword a line outside any module is reported for, or None.
+    
+    stripped is the line of the masked file, so keywords in comments and
+    literals are not seen.
+    """
+    if not stripped or stripped.startswith(_COMMENT_PREFIXES):
+        return None
+    
+    # Module declarations, imports and attributes are allowed at file level
+    if stripped.startswith(_MODULE_PREFIXES) or stripped.startswith(_EXEMPT_PREFIXES):
+        return None
+    # Allow macro_rules! at file level
+    if 'macro_rules!' in stripped:
+        return None
+    
+    for keyword in ITEM_KEYWORDS:
+        if keyword in stripped:
+            return keyword.strip()
+    return None
+
+
+def _first_line_at_or_after(content: str, pos: int) -> int:
+    """Number of the first line starting at or after offset pos."""
+    line = content.count('\n', 0, pos) + 1
+    if pos > 0 and content[pos - 1] != '\n':
+        line += 1
+    return line
+
+
+def find_unencapsulated_items(file_path: Path, candidates: dict = None) -> list:
+    """
+    Return (line number, keyword, line text) for each item outside pub mod blocks.
     
+    candidates, if given, maps the only line numbers worth looking at to
+    their text (the ripgrep prefilter hits for this file).
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    return unencapsulated_items(content, candidates)
+
+
+def unencapsulated_items(content: str, candidates: dict = None) -> list:
+    """find_unencapsulated_items() for a file's contents (newlines normalised)."""
     violations = []
-    in_module = False
-    module_depth = 0
+    # Comments and literals are blanked, so offsets still line up with
+    # content but their braces, `mod` heads and keywords are not seen
+    masked = strip_comments_and_strings(content)
+    spans = _outside_module_spans(masked)
+    
+    if candidates is not None:
+        # Only the prefiltered lines whose start lies outside every module
+        masked_lines = masked.split('\n')
+        for span_start, span_end in spans:
+            first = _first_line_at_or_after(masked, span_start)
+            end = _first_line_at_or_after(masked, span_end)
+            for idx in sorted(n for n in candidates if first <= n < end):
+                keyword = _item_keyword(masked_lines[idx - 1].strip())
+                if keyword is not None:
+                    violations.append((idx, keyword, candidates[idx].strip()[:80]))
+        return violations
     
-    item_keywords = ['fn ', 'struct ', 'enum ', 'type ', 'trait ', 'impl ', 'const ', 'static ']
+    if _KEYWORD_AUTOMATON is not None:
+        return _find_with_automaton(content, masked, spans)
     
-    for idx, line in enumerate(lines, start=1):
-        stripped = line.strip()
+    idx = 1
+    last = 0
+    
+    # Only lines starting outside every module are looked at
+    for span_start, span_end in spans:
+        line_start = content.rfind('\n', 0, span_start) + 1
+        if line_start < span_start:
+            # The span starts mid-line, after a module's closing brace
+            line_start = content.find('\n', span_start) + 1
+            if line_start == 0:
+                continue
         
-        if not stripped or stripped.startswith('//') or stripped.startswith('/*') or stripped.startswith('*'):
+        while line_start < span_end:
+            line_end = content.find('\n', line_start)
+            if line_end == -1:
+                line_end = len(content)
+            idx += content.count('\n', last, line_start)
+            last = line_start
+            keyword = _item_keyword(masked[line_start:line_end].strip())
+            if keyword is not None:
+                violations.append((idx, keyword, content[line_start:line_end].strip()[:80]))
+            line_start = line_end + 1
+    
+    return violations
+
+
+def _find_with_automaton(content: str, masked: str, spans: list) -> list:
+    """
+    unencapsulated_items() for content, visiting only the lines outside
+    modules that the keyword automaton finds a keyword on in masked.
+    """
+    violations = []
+    idx = 1
+    last = 0
+    
+    for span_start, span_end in spans:
+        # Whole lines: from the first one starting in the span to the end
+        # of the last one starting before span_end
+        search_start = content.rfind('\n', 0, span_start) + 1
+        if search_start < span_start:
+            search_start = content.find('\n', span_start) + 1
+            if search_start == 0:
+                continue
+        if search_start >= span_end:
             continue
+        search_end = content.find('\n', span_end - 1)
+        if search_end == -1:
+            search_end = len(content)
         
-        # Track module blocks
-        if stripped.startswith('pub mod ') or stripped.startswith('mod '):
-            in_module = True
-            module_depth = 0
-        
-        # Track braces
-        module_depth += line.count('{') - line.count('}')
-        
-        # If we close all braces, we're outside the module
-        if in_module and module_depth <= 0 and '}' in line:
-            in_module = False
-        
-        # Check for item definitions outside modules
-        if not in_module:
-            for keyword in item_keywords:
-                if keyword in stripped and not stripped.startswith('use ') and not stripped.startswith('#['):
-                    # Allow macro_rules! at file level
-                    if 'macro_rules!' in stripped or stripped.startswith('macro_rules!'):
-                        continue
-                    
-                    rel_path = context.relative_path(file_path)
-                    violations.append(
-                        f"  {rel_path}:{idx}\n    {keyword.strip()} outside pub mod\n      {stripped[:80]}"
-                    )
-                    break
+        line_end = -1
+        for end_pos, _ in _KEYWORD_AUTOMATON.iter(masked, search_start, search_end):
+            if end_pos < line_end:
+                # Another keyword on a line already looked at
+                continue
+            line_start = content.rfind('\n', 0, end_pos) + 1
+            line_end = content.find('\n', end_pos)
+            if line_end == -1:
+                line_end = len(content)
+            idx += content.count('\n', last, line_start)
+            last = line_start
+            keyword = _item_keyword(masked[line_start:line_end].strip())
+            if keyword is not None:
+                violations.append((idx, keyword, content[line_start:line_end].strip()[:80]))
     
     return violations
 
 
+def rg_candidate_lines(src_dir: Path):
+    """
+    {path: {line number: text}} for every line under src_dir that could hold
+    an item keyword, from one ripgrep run; None if rg is not available.
+    """
+    candidates = {}
+    try:
+        for path, line_number, line in rg_scan(_RG_ITEM_PATTERN, [src_dir]):
+            candidates.setdefault(path, {})[line_number] = line
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return candidates
+
+
+def check_file(file_path: Path, context: ReviewContext, cache: ReviewCache = None,
+               candidates: dict = None) -> list:
+    """
+    Check if all code is inside pub mod blocks.
+    
+    candidates is the file's entry from rg_candidate_lines() ({} if it had
+    no hits), or None to look at every line.
+    """
+    
+    # Skip lib.rs and main.rs
+    if file_path.name in EXEMPT_FILES:
+        return []
+    # No line of the file mentions an item keyword
+    if candidates is not None and not candidates:
+        return []
+    
+    compute = find_unencapsulated_items
+    if candidates is not None:
+        compute = partial(find_unencapsulated_items, candidates=candidates)
+    if cache is not None:
+        items = cache.lookup(file_path, compute)
+    else:
+        items = compute(file_path)
+    
+    return format_items(context.relative_path(file_path), items)
+
+
+def format_items(rel_path, items: list) -> list:
+    """Report entries for one file's find_unencapsulated_items() result."""
+    return [
+        f"  {rel_path}:{idx}\n    {keyword} outside pub mod\n      {text}"
+        for idx, keyword, text in items
+    ]
+
+
+def report_module_encapsulation(all_violations: list) -> int:
+    """Print the check_file() entries of every file; returns the exit code."""
+    if not all_violations:
+        print("✓ All code properly encapsulated in modules")
+        return 0
+    
+    print(f"✗ Found code outside module blocks (RustRules.md Lines 117-123):\n")
+    for violation in all_violations:
+        print(violation)
+    print(f"\nTotal violations: {len(all_violations)}")
+    print("\nFix: Move all definitions inside 'pub mod ModuleName { ... }' block.")
+    return 1
+
+
 def main():
     parser = create_review_parser(__doc__)
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Rescan every file instead of reusing target/review_cache'
+    )
+    parser.add_argument(
+        '--use-rg',
+        action='store_true',
+        help='Prefilter candidate lines with ripgrep when it is installed'
+    )
     args = parser.parse_args()
     context = ReviewContext(args)
     
@@ -85,23 +302,29 @@ def main():
         print(f"Would check {len(files)} file(s) for module encapsulation")
         return 0
     
+    cache = None
+    if not args.no_cache:
+        cache = ReviewCache('module_encapsulation', 3,
+                            cache_root=context.repo_root / 'target' / 'review_cache', two_tier=True)
+    
     all_violations = []
     files = context.find_files([src_dir])
     
+    candidates = None
+    if args.use_rg and not context.single_file:
+        candidates = rg_candidate_lines(src_dir)
+        if candidates is None:
+            print("Warning: rg not available, scanning every line in Python", file=sys.stderr)
+    
     for file_path in files:
-        violations = check_file(file_path, context)
+        file_candidates = None if candidates is None else candidates.get(file_path, {})
+        violations = check_file(file_path, context, cache, file_candidates)
         all_violations.extend(violations)
     
-    if not all_violations:
-        print("✓ All code properly encapsulated in modules")
-        return 0
+    if cache is not None:
+        cache.prune(max_entries=max(2000, 2 * len(files)))
     
-    print(f"✗ Found code outside module blocks (RustRules.md Lines 117-123):\n")
-    for violation in all_violations:
-        print(violation)
-    print(f"\nTotal violations: {len(all_violations)}")
-    print("\nFix: Move all definitions inside 'pub mod ModuleName { ... }' block.")
-    return 1
+    return report_module_encapsulation(all_violations)
 
 
 if __name__ == "__main__":
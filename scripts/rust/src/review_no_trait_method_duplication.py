@@ -13,17 +13,55 @@ RustRules.md: "No Trait Method Duplication (MANDATORY)"
 
 
 import re
+import subprocess
 import sys
 from pathlib import Path
 
 # Add lib directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "lib"))
-from review_utils import run_review, get_repo_root
+from review_utils import run_review, get_repo_root, rg_scan, add_cache_argument, open_cache
+from brace_depth import depth_array, depth_at, matching_brace
+from rust_source import strip_comments_and_strings
 
+RULE_NAME = "No Trait Method Duplication"
+RULE_REFERENCE = "RustRules.md: No Trait Method Duplication (MANDATORY)"
+FIX_SUGGESTION = "Delete the inherent method and keep only the trait method implementation."
+# Checked directories, relative to the repo root
+SOURCE_DIRS = ("src", "tests", "benches")
 
-def extract_impl_blocks(content: str) -> list[dict]:
+# Bump whenever file_violations() changes
+CACHE_VERSION = 3
+
+# Per-file violations of unchanged files are reused across runs (opened on
+# the first check, None under --no-cache)
+_cache = None
+
+# How many files check_file() has seen, which bounds the cache prune
+_files_checked = 0
+
+# With --use-rg: the files ripgrep found an impl header in (set on first use)
+_rg_impl_files = None
+
+# Superset of the lines _IMPL_RE can start on
+_RG_IMPL_PATTERN = r'^\s*impl[<\s]'
+
+
+# Match: impl<...> TypeName<...> { ... }  (inherent)
+# Match: impl<...> TraitName<...> for TypeName<...> { ... }  (trait)
+# The header must sit on one line, up to and including its `{`.
+_IMPL_RE = re.compile(
+    rb'^[^\S\n]*impl(?:<[^>\n]+>)?[^\S\n]+(?:([A-Z]\w+)(?:<[^>\n]+>)?[^\S\n]+for[^\S\n]+)?'
+    rb'([A-Z]\w+)(?:<[^>\n]+>)?[^\S\n]*(?:where[^{\n]*)?[^\S\n]*\{',
+    re.MULTILINE | re.ASCII
+)
+
+# Match function definitions at the start of a line
+_FN_RE = re.compile(rb'^[^\S\n]*(?:pub\s+)?fn\s+(\w+)\s*[(<]', re.MULTILINE | re.ASCII)
+
+
+def extract_impl_blocks(content: bytes) -> list[dict]:
     """
-    Extract all impl blocks from Rust source.
+    Extract all impl blocks from Rust source (bytes).
     Returns list of dicts with:
     - type: 'inherent' or 'trait'
     - type_name: the type being implemented
@@ -32,55 +70,59 @@ def extract_impl_blocks(content: str) -> list[dict]:
     - line: starting line number
     """
     impl_blocks = []
-    lines = content.split('\n')
+    if b'impl' not in content:
+        return impl_blocks
     
-    # Match: impl<...> TypeName<...> { ... }  (inherent)
-    # Match: impl<...> TraitName<...> for TypeName<...> { ... }  (trait)
-    impl_pattern = re.compile(
-        r'^\s*impl(?:<[^>]+>)?\s+(?:([A-Z]\w+)(?:<[^>]+>)?\s+for\s+)?([A-Z]\w+)(?:<[^>]+>)?\s*(?:where[^{]*)?\s*\{'
-    )
+    # Brace depth after every byte (None without NumPy)
+    depth = depth_array(content)
     
-    # Match function definitions
-    fn_pattern = re.compile(r'^\s*(?:pub\s+)?fn\s+(\w+)\s*[(<]')
-    
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        impl_match = impl_pattern.match(line)
+    pos = 0
+    line_num = 1
+    line_pos = 0
+    while True:
+        impl_match = _IMPL_RE.search(content, pos)
+        if not impl_match:
+            break
+        trait_name = impl_match.group(1)  # None for inherent impls
+        type_name = impl_match.group(2).decode('ascii')
         
-        if impl_match:
-            trait_name = impl_match.group(1)  # None for inherent impls
-            type_name = impl_match.group(2)
-            
-            # Find methods in this impl block
-            methods = []
-            brace_depth = 0
-            start_line = i + 1
-            
-            # Count opening brace
-            brace_depth += line.count('{') - line.count('}')
-            i += 1
-            
-            while i < len(lines) and brace_depth > 0:
-                line = lines[i]
-                brace_depth += line.count('{') - line.count('}')
-                
-                fn_match = fn_pattern.match(line)
-                if fn_match and brace_depth == 1:  # Only top-level methods
-                    method_name = fn_match.group(1)
-                    methods.append((method_name, i + 1))
-                
-                i += 1
-            
-            impl_blocks.append({
-                'type': 'inherent' if trait_name is None else 'trait',
-                'type_name': type_name,
-                'trait_name': trait_name,
-                'methods': methods,
-                'line': start_line
-            })
-        else:
-            i += 1
+        line_num += content.count(b'\n', line_pos, impl_match.start())
+        line_pos = impl_match.start()
+        start_line = line_num
+        
+        open_pos = impl_match.end() - 1
+        close = matching_brace(content, open_pos, depth)
+        
+        # Find the methods directly in this impl block (brace depth 1 at the
+        # start of their line), not those of nested items
+        methods = []
+        level = 1
+        prev = open_pos + 1
+        if depth is not None:
+            base = depth_at(depth, open_pos)
+        for fn_match in _FN_RE.finditer(content, prev, close):
+            start = fn_match.start()
+            if depth is not None:
+                level = depth_at(depth, start) - base
+            else:
+                level += content.count(b'{', prev, start) - content.count(b'}', prev, start)
+                prev = start
+            # Method lines advance the same cursor, so no newline is counted twice
+            line_num += content.count(b'\n', line_pos, start)
+            line_pos = start
+            if level == 1:
+                methods.append((fn_match.group(1).decode('ascii'), line_num))
+        
+        impl_blocks.append({
+            'type': 'inherent' if trait_name is None else 'trait',
+            'type_name': type_name,
+            'trait_name': trait_name.decode('ascii') if trait_name else None,
+            'methods': methods,
+            'line': start_line
+        })
+        
+        # Impls nested inside this block are not looked at separately
+        pos = close + 1
     
     return impl_blocks
 
@@ -132,38 +174,96 @@ def find_duplicate_methods(impl_blocks: list[dict]) -> list[dict]:
     return violations
 
 
+def content_violations(content: bytes) -> list[dict]:
+    """find_duplicate_methods() violations of a file's contents (bytes)."""
+    if b'\r' in content:
+        content = content.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    # Impl headers and braces inside comments or literals are not code
+    return find_duplicate_methods(extract_impl_blocks(strip_comments_and_strings(content)))
+
+
+def file_violations(file_path: Path) -> list[dict]:
+    """Read file_path and return its find_duplicate_methods() violations."""
+    return content_violations(file_path.read_bytes())
+
+
+def format_violations(rel_path, violations: list[dict]) -> list[str]:
+    """Report lines for one file's violations."""
+    return [
+        f"{rel_path}:{v['inherent_line']}: "
+        f"Duplicate method '{v['method_name']}' in inherent impl for {v['type_name']} "
+        f"(also in {v['trait_name']} trait impl at line {v['trait_line']})"
+        for v in violations
+    ]
+
+
+def _impl_files(context):
+    """
+    The set of files with an impl header according to ripgrep, or None when
+    --use-rg is off, a single file is checked, or rg is not available.
+    """
+    global _rg_impl_files
+    if not context.args.use_rg or context.single_file:
+        return None
+    if _rg_impl_files is None:
+        roots = [d for d in (context.repo_root / name for name in SOURCE_DIRS) if d.exists()]
+        try:
+            _rg_impl_files = {path for path, _, _ in rg_scan(_RG_IMPL_PATTERN, roots)}
+        except (OSError, subprocess.CalledProcessError):
+            print("Warning: rg not available, scanning every file in Python", file=sys.stderr)
+            context.args.use_rg = False
+            return None
+    return _rg_impl_files
+
+
 def check_file(file_path: Path, context) -> list[str]:
     """Check a single Rust file for trait method duplication."""
+    global _cache, _files_checked
+    if _files_checked == 0:
+        _cache = open_cache(context.args, 'no_trait_method_duplication', CACHE_VERSION, context.repo_root)
+    _files_checked += 1
+    
+    # Files without an impl header cannot have a violation
+    impl_files = _impl_files(context)
+    if impl_files is not None and file_path not in impl_files:
+        return []
+    
     try:
-        content = file_path.read_text(encoding='utf-8')
+        if _cache is not None:
+            violations = _cache.lookup(file_path, file_violations)
+        else:
+            violations = file_violations(file_path)
     except Exception as e:
         return [f"ERROR: Could not read {file_path}: {e}"]
     
-    impl_blocks = extract_impl_blocks(content)
-    violations = find_duplicate_methods(impl_blocks)
-    
-    errors = []
-    for v in violations:
-        rel_path = context.relative_path(file_path)
-        errors.append(
-            f"{rel_path}:{v['inherent_line']}: "
-            f"Duplicate method '{v['method_name']}' in inherent impl for {v['type_name']} "
-            f"(also in {v['trait_name']} trait impl at line {v['trait_line']})"
-        )
-    
-    return errors
+    return format_violations(context.relative_path(file_path), violations)
+
+
+def add_arguments(parser):
+    """Add --use-rg, which skips files ripgrep finds no impl header in, and --no-cache."""
+    parser.add_argument(
+        '--use-rg',
+        action='store_true',
+        help='Prefilter files with ripgrep when it is installed'
+    )
+    add_cache_argument(parser)
 
 
 def main():
     repo_root = get_repo_root()
-    return run_review(
-        description="Detect trait methods duplicated as inherent methods",
-        rule_name="No Trait Method Duplication",
-        rule_reference="RustRules.md: No Trait Method Duplication (MANDATORY)",
-        directories=[repo_root / "src", repo_root / "tests", repo_root / "benches"],
-        check_function=check_file,
-        fix_suggestion="Delete the inherent method and keep only the trait method implementation."
-    )
+    try:
+        return run_review(
+            description="Detect trait methods duplicated as inherent methods",
+            rule_name=RULE_NAME,
+            rule_reference=RULE_REFERENCE,
+            directories=[repo_root / name for name in SOURCE_DIRS],
+            check_function=check_file,
+            fix_suggestion=FIX_SUGGESTION,
+            add_arguments=add_arguments
+        )
+    finally:
+        if _cache is not None:
+            _cache.prune(max_entries=max(2000, 2 * _files_checked))
 
 
 if __name__ == "__main__":
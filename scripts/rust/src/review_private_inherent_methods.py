@@ -13,13 +13,47 @@ import sys
 from pathlib import Path
 from collections import defaultdict
 
-
-def extract_method_info(line):
-    """Extract method name and visibility from a method signature."""
-    line = re.sub(r'//.*$', '', line).strip()
-    
-    # Match: [pub] fn method_name
-    match = re.search(r'\b(pub)?\s*fn\s+(\w+)', line)
+# Add lib directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
+from review_utils import add_jobs_argument, iter_rs_files, map_files, read_file_bytes, source_lines
+
+
+# Standard traits to ignore
+STANDARD_TRAITS = frozenset({
+    'Eq', 'PartialEq', 'Ord', 'PartialOrd',
+    'Debug', 'Display', 
+    'Clone', 'Copy',
+    'Hash', 
+    'Default',
+    'From', 'Into', 'TryFrom', 'TryInto',
+    'AsRef', 'AsMut',
+    'Deref', 'DerefMut',
+    'Iterator', 'IntoIterator',
+})
+
+# Match: [pub] fn method_name
+_METHOD_RE = re.compile(r'\b(pub)?\s*fn\s+(\w+)')
+# Rough string and char literals, dropped before counting braces
+_STR_LIT_RE = re.compile(r'"[^"]*"')
+_CHR_LIT_RE = re.compile(r"'[^']*'")
+# Match: impl<...> [path::]Trait<...> for Struct  or  impl<...> Struct<...> {
+# (the trait alternative is tried first at each position)
+_IMPL_RE = re.compile(
+    r'impl(?:<[^>]+>)?\s+(?:'
+    r'(?:[\w:]+::)?(?P<trait>\w+)(?:<[^>]+>)?\s+for\s+(?P<trait_struct>\w+)'
+    r'|(?P<struct>\w+)(?:<[^>]+>)?\s*\{)'
+)
+
+
+def strip_line_comment(line):
+    """line without any trailing // comment (the code the helpers below expect)."""
+    cut = line.find('//')
+    return line if cut == -1 else line[:cut]
+
+
+def extract_method_info(code):
+    """Extract method name and visibility from a method signature (comment-free code)."""
+    match = _METHOD_RE.search(code)
     if match:
         is_public = match.group(1) == 'pub'
         method_name = match.group(2)
@@ -28,14 +62,16 @@ def extract_method_info(line):
 
 
 def count_braces_in_line(line):
-    """Count braces in a line, ignoring those in strings and comments."""
-    # Simple version - good enough for most cases
-    if '//' in line:
-        line = line[:line.index('//')]
+    """Count braces in a comment-free line, ignoring those in strings."""
+    # Most lines have no braces at all, and dropping text cannot add any
+    if '{' not in line and '}' not in line:
+        return (0, 0)
     
-    # Remove string literals (rough approximation)
-    line = re.sub(r'"[^"]*"', '', line)
-    line = re.sub(r"'[^']*'", '', line)
+    # Remove string literals (rough approximation), only if there are any
+    if '"' in line:
+        line = _STR_LIT_RE.sub('', line)
+    if "'" in line:
+        line = _CHR_LIT_RE.sub('', line)
     
     open_count = line.count('{')
     close_count = line.count('}')
@@ -43,69 +79,26 @@ def count_braces_in_line(line):
 
 
 def extract_impl_info(line):
-    """Extract information from an impl line."""
-    line = re.sub(r'//.*$', '', line).strip()
-    
-    # Standard traits to ignore
-    STANDARD_TRAITS = {
-        'Eq', 'PartialEq', 'Ord', 'PartialOrd',
-        'Debug', 'Display', 
-        'Clone', 'Copy',
-        'Hash', 
-        'Default',
-        'From', 'Into', 'TryFrom', 'TryInto',
-        'AsRef', 'AsMut',
-        'Deref', 'DerefMut',
-        'Iterator', 'IntoIterator',
-    }
+    """Extract information from a comment-free impl line."""
+    match = _IMPL_RE.search(line)
+    if not match:
+        return None
     
-    # Check for trait impl
-    trait_match = re.search(r'impl(?:<[^>]+>)?\s+(?:[\w:]+::)?(\w+)(?:<[^>]+>)?\s+for\s+(\w+)', line)
-    if trait_match:
-        trait_name = trait_match.group(1)
-        struct_name = trait_match.group(2)
+    trait_name = match.group('trait')
+    if trait_name:
         is_standard = trait_name in STANDARD_TRAITS
-        return ('trait', struct_name, trait_name, is_standard)
-    
-    # Check for inherent impl
-    inherent_match = re.search(r'impl(?:<[^>]+>)?\s+(\w+)(?:<[^>]+>)?\s*\{', line)
-    if inherent_match:
-        struct_name = inherent_match.group(1)
-        return ('inherent', struct_name, None, False)
-    
-    return None
-
-
-def find_methods_in_impl(lines, start, end):
-    """Find all methods in an impl block."""
-    methods = []
-    
-    i = start + 1  # Skip the impl line itself
-    while i < end:
-        line = lines[i].strip()
-        
-        # Skip comments and empty lines
-        if not line or line.startswith('//'):
-            i += 1
-            continue
-        
-        # Check for method signature
-        method_info = extract_method_info(line)
-        if method_info:
-            method_name, is_public = method_info
-            methods.append({
-                'name': method_name,
-                'public': is_public,
-                'line': i + 1,
-            })
-        
-        i += 1
-    
-    return methods
+        return ('trait', match.group('trait_struct'), trait_name, is_standard)
+    return ('inherent', match.group('struct'), None, False)
 
 
 def find_impl_blocks(lines):
-    """Find all impl blocks with their methods."""
+    """
+    Find all impl blocks with their methods.
+    
+    Methods are picked up during the same walk that finds each block's
+    closing brace. Only inherent impls are reported on, so trait impls
+    are walked for their extent but their methods are not collected.
+    """
     impl_blocks = []
     i = 0
     
@@ -117,7 +110,9 @@ def find_impl_blocks(lines):
             i += 1
             continue
         
-        impl_info = extract_impl_info(stripped)
+        # Each line's comment is cut once, and the code shared by the helpers
+        code = strip_line_comment(stripped)
+        impl_info = extract_impl_info(code)
         if not impl_info:
             i += 1
             continue
@@ -125,21 +120,34 @@ def find_impl_blocks(lines):
         impl_type, struct_name, trait_name, is_standard = impl_info
         start_line = i
         
-        # Count braces to find end
-        open_b, close_b = count_braces_in_line(stripped)
+        # Count braces to find end, collecting methods on the way
+        open_b, close_b = count_braces_in_line(code)
         brace_count = open_b - close_b
+        collect_methods = impl_type == 'inherent'
+        methods = []
         
         j = i + 1
         while j < len(lines) and brace_count > 0:
-            open_b, close_b = count_braces_in_line(lines[j])
+            code = strip_line_comment(lines[j])
+            open_b, close_b = count_braces_in_line(code)
             brace_count += open_b - close_b
+            
+            if collect_methods:
+                method_line = code.strip()
+                # Skip comment-only and empty lines
+                if method_line:
+                    method_info = extract_method_info(method_line)
+                    if method_info:
+                        method_name, is_public = method_info
+                        methods.append({
+                            'name': method_name,
+                            'public': is_public,
+                            'line': j + 1,
+                        })
             j += 1
         
         end_line = j
         
-        # Extract methods
-        methods = find_methods_in_impl(lines, start_line, end_line)
-        
         impl_blocks.append({
             'start': start_line,
             'end': end_line,
@@ -158,10 +166,14 @@ def find_impl_blocks(lines):
 def analyze_file(file_path):
     """Analyze a file for private helper methods in inherent impls."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-    except Exception as e:
+        data = read_file_bytes(file_path)
+    except OSError:
+        return None
+    # Files without an impl (trait definitions, re-exports) have nothing to
+    # report, nor do files without a `{`, whose impls can have no methods
+    if b'impl' not in data or b'{' not in data:
         return None
+    lines = source_lines(data)
     
     impl_blocks = find_impl_blocks(lines)
     
@@ -185,46 +197,52 @@ def analyze_file(file_path):
     return results
 
 
+def format_result(r):
+    """Report lines for one analyze_file() result."""
+    lines = [
+        f"{r['file']}",
+        f"  Struct: {r['struct']}",
+        f"  Private methods ({r['count']}):",
+    ]
+    lines.extend(f"    - {m['name']} (line {m['line']})" for m in r['private_methods'])
+    return lines
+
+
 def main():
     import argparse
     
     parser = argparse.ArgumentParser(description="Review private methods in inherent impls")
     parser.add_argument('--file', type=str, help='Single file to analyze')
     parser.add_argument('--all', action='store_true', help='Analyze all src files')
+    add_jobs_argument(parser)
     args = parser.parse_args()
     
     if args.file:
         results = analyze_file(Path(args.file))
         if results:
+            out = []
             for r in results:
-                print(f"{r['file']}")
-                print(f"  Struct: {r['struct']}")
-                print(f"  Private methods ({r['count']}):")
-                for m in r['private_methods']:
-                    print(f"    - {m['name']} (line {m['line']})")
-                print()
+                out.extend(format_result(r))
+                out.append('')
+            print('\n'.join(out))
     elif args.all:
         src_dir = Path('src')
         all_results = []
         
-        for rs_file in sorted(src_dir.rglob('*.rs')):
-            results = analyze_file(rs_file)
+        # Files are independent, so spread them over a process pool
+        rs_files = sorted(iter_rs_files(src_dir))
+        for results in map_files(analyze_file, rs_files, jobs=args.jobs):
             if results:
                 all_results.extend(results)
         
-        print("=" * 100)
-        print("PRIVATE HELPER METHODS IN INHERENT IMPLS:")
-        print("=" * 100)
-        
+        # Assemble the report and write it at once rather than a print per line
+        out = ["=" * 100, "PRIVATE HELPER METHODS IN INHERENT IMPLS:", "=" * 100]
         for r in all_results:
-            print(f"\n{r['file']}")
-            print(f"  Struct: {r['struct']}")
-            print(f"  Private methods ({r['count']}):")
-            for m in r['private_methods']:
-                print(f"    - {m['name']} (line {m['line']})")
-        
-        print()
-        print(f"Summary: Found {len(all_results)} inherent impls with private methods")
+            out.append('')
+            out.extend(format_result(r))
+        out.append('')
+        out.append(f"Summary: Found {len(all_results)} inherent impls with private methods")
+        print('\n'.join(out))
     else:
         print("Error: Use --file or --all", file=sys.stderr)
         return 1
@@ -25,30 +25,35 @@ import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "lib"))
-from review_utils import ReviewContext, create_review_parser
+from review_utils import ReviewContext, create_review_parser, read_source_lines
 
 
+# Pattern to match qualified paths (at least 2 :: separators)
+# Matches things like: std::collections::HashMap, std::collections::hash_set::Iter
+# But NOT crate:: or apas_ai:: or Type::method (single ::)
+_QUALIFIED_PATH_RE = re.compile(
+    r'\b(std::\w+::\w+(?:::\w+)*)'  # std::module::Type or deeper
+    r'|'
+    r'\b(core::\w+::\w+(?:::\w+)*)'  # core::module::Type or deeper
+)
+
 def check_file(file_path: Path, context: ReviewContext) -> list:
     """Check a single file for qualified paths that should be imported."""
     violations = []
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        # Pattern to match qualified paths (at least 2 :: separators)
-        # Matches things like: std::collections::HashMap, std::collections::hash_set::Iter
-        # But NOT crate:: or apas_ai:: or Type::method (single ::)
-        qualified_path_pattern = re.compile(
-            r'\b(std::\w+::\w+(?:::\w+)*)'  # std::module::Type or deeper
-            r'|'
-            r'\b(core::\w+::\w+(?:::\w+)*)'  # core::module::Type or deeper
-        )
+        lines = read_source_lines(file_path)
         
         in_comment = False
         in_macro = False
         
         for line_num, line in enumerate(lines, 1):
+            # A line without a path has nothing to report; it only matters
+            # if it opens or closes a comment or macro_rules! block
+            if ('::' not in line and not in_comment and not in_macro
+                    and '/*' not in line and '*/' not in line and 'macro_rules!' not in line):
+                continue
+            
             stripped = line.strip()
             
             # Skip comments
@@ -71,16 +76,17 @@ def check_file(file_path: Path, context: ReviewContext) -> list:
             if in_macro:
                 continue
             
-            # Skip use and pub use statements (these are imports/re-exports, not usage)
-            if stripped.startswith('use ') or stripped.startswith('pub use '):
+            # Skip use and pub use statements (these are imports/re-exports, not
+            # usage), and pub mod and mod statements
+            if stripped.startswith(('use ', 'pub use ', 'pub mod ', 'mod ')):
                 continue
             
-            # Skip pub mod and mod statements
-            if stripped.startswith('pub mod ') or stripped.startswith('mod '):
+            # Every qualified path the pattern matches starts std:: or core::
+            if 'std::' not in line and 'core::' not in line:
                 continue
             
             # Find qualified paths in this line
-            matches = qualified_path_pattern.finditer(line)
+            matches = _QUALIFIED_PATH_RE.finditer(line)
             for match in matches:
                 full_path = match.group(1) or match.group(2)
                 
@@ -91,11 +97,9 @@ def check_file(file_path: Path, context: ReviewContext) -> list:
                 
                 # - Function/method calls (path followed by :: or ( or ::<)
                 # This includes associated functions like HashSet::new() and UFCS like Debug::fmt(...)
-                end_pos = match.end()
-                if end_pos < len(line):
-                    next_chars = line[end_pos:end_pos+3]
-                    if next_chars.startswith('::') or next_chars.startswith('(') or next_chars.startswith('::<'):
-                        continue
+                # (`::<` is covered by `::`)
+                if line.startswith(('::', '('), match.end()):
+                    continue
                 
                 # - std::fmt::Result conflicts with prelude Result<T, E>, keep it qualified
                 if full_path == 'std::fmt::Result':
@@ -147,8 +151,7 @@ def main():
     
     if all_violations:
         print("✗ Qualified Path Organization violations found:\n")
-        for v in all_violations:
-            print(v)
+        print('\n'.join(all_violations))
         print(f"\nTotal violations: {len(all_violations)}")
         print("\nUse 'use' statements at the top to import types, then use short names.")
         return 1
@@ -11,51 +11,88 @@ The inherent impl is now redundant and should be removed.
 # Git commit: 509549c
 # Date: 2025-10-17
 
+import argparse
 import re
 import sys
+from functools import lru_cache
 from pathlib import Path
 
+# Add lib directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
+from review_utils import add_jobs_argument, iter_rs_files, map_files, read_file_bytes
 
-def has_inherent_impl(content, struct_name):
-    """Check if file has an inherent impl for struct_name."""
-    pattern = rf'impl<[^>]*>\s+{struct_name}<[^>]*>\s*\{{'
-    return re.search(pattern, content) is not None
 
+_STRUCT_RE = re.compile(r'pub\s+struct\s+(\w+)<')
 
-def has_trait_impl(content, struct_name):
-    """Check if file has a trait impl for struct_name."""
-    pattern = rf'impl<[^>]*>\s+\w+<[^>]*>\s+for\s+{struct_name}<[^>]*>\s*\{{'
-    return re.search(pattern, content) is not None
+
+@lru_cache(maxsize=None)
+def _impl_pattern(struct_name):
+    """Compiled pattern for an impl of struct_name; group 'trait' is set for a trait impl."""
+    return re.compile(
+        rf'impl<[^>]*>\s+(?:(?P<trait>\w+)<[^>]*>\s+for\s+)?{struct_name}<[^>]*>\s*\{{'
+    )
+
+
+def find_impl_kinds(content, struct_name):
+    """(has inherent impl, has trait impl) for struct_name, from one scan of content."""
+    has_inherent = False
+    has_trait = False
+    for match in _impl_pattern(struct_name).finditer(content):
+        if match.group('trait'):
+            has_trait = True
+        else:
+            has_inherent = True
+        if has_inherent and has_trait:
+            break
+    return has_inherent, has_trait
 
 
 def find_struct_name(content):
     """Find the main struct name in a file."""
-    pattern = r'pub\s+struct\s+(\w+)<'
-    match = re.search(pattern, content)
+    match = _STRUCT_RE.search(content)
     if match:
         return match.group(1)
     return None
 
 
+def analyze_file(rs_file):
+    """Struct name if rs_file has both an inherent and a trait impl for it, else None."""
+    try:
+        data = read_file_bytes(rs_file)
+    except OSError:
+        return None
+    # Both impl patterns start with `impl<`, and the struct needs `struct`
+    if b'struct' not in data or b'impl<' not in data:
+        return None
+    try:
+        content = data.decode('utf-8')
+    except UnicodeDecodeError:
+        return None
+    
+    struct_name = find_struct_name(content)
+    if not struct_name:
+        return None
+    
+    has_inherent, has_trait = find_impl_kinds(content, struct_name)
+    
+    if has_inherent and has_trait:
+        return struct_name
+    return None
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Review files with redundant inherent impls")
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+    
     src_dir = Path("src")
     files_with_redundant_impls = []
     
-    for rs_file in src_dir.rglob("*.rs"):
-        try:
-            with open(rs_file, 'r') as f:
-                content = f.read()
-        except Exception:
-            continue
-        
-        struct_name = find_struct_name(content)
-        if not struct_name:
-            continue
-        
-        has_inherent = has_inherent_impl(content, struct_name)
-        has_trait = has_trait_impl(content, struct_name)
-        
-        if has_inherent and has_trait:
+    # Files are independent, so spread them over a process pool
+    rs_files = list(iter_rs_files(src_dir))
+    per_file = map_files(analyze_file, rs_files, jobs=args.jobs)
+    for rs_file, struct_name in zip(rs_files, per_file):
+        if struct_name:
             files_with_redundant_impls.append((str(rs_file), struct_name))
     
     if not files_with_redundant_impls:
@@ -4,12 +4,86 @@
 # Date: 2025-10-17 05:17:36 -0700
 
 
+import argparse
+import io
+import os
+import runpy
 import subprocess
 import sys
+import tempfile
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
 from pathlib import Path
 
+# Add lib directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
+from review_utils import FILE_LIST_ENV, JOBS_ENV, enable_read_cache, get_repo_root, write_file_manifest
+
+
+# Checks that review_impls.py runs together over a single scan of src/
+BUNDLED_IN_REVIEW_IMPLS = {
+    "review_impl_trait_bounds.py",
+    "review_inherent_and_trait_impl.py",
+    "review_inherent_method_lengths.py",
+    "review_inherent_plus_trait_impl.py",
+}
+
+# Checks that review_src_checks.py runs together over a single read of each file
+BUNDLED_IN_REVIEW_SRC_CHECKS = {
+    "review_lib.py",
+    "review_macro_method_calls.py",
+    "review_module_encapsulation.py",
+    "review_no_trait_method_duplication.py",
+}
+
+# Checks that review_trait_checks.py runs together over a single read of each file
+BUNDLED_IN_REVIEW_TRAIT_CHECKS = {
+    "review_stt_compliance.py",
+    "review_trait_bound_mismatches.py",
+    "review_trait_default_pattern.py",
+    "review_trait_definition_order.py",
+}
+
+
+def run_in_process(script_path):
+    """
+    Run script_path as __main__ in this interpreter, capturing its output
+    the way the subprocess runner does (stdout and stderr together).
+    """
+    output = io.StringIO()
+    saved_argv = sys.argv
+    sys.argv = [str(script_path)]
+    try:
+        with redirect_stdout(output), redirect_stderr(output):
+            try:
+                runpy.run_path(str(script_path), run_name='__main__')
+                returncode = 0
+            except SystemExit as e:
+                returncode = e.code
+                if returncode is None:
+                    returncode = 0
+                elif not isinstance(returncode, int):
+                    print(returncode, file=sys.stderr)
+                    returncode = 1
+            except Exception:
+                traceback.print_exc()
+                returncode = 1
+    finally:
+        sys.argv = saved_argv
+    return subprocess.CompletedProcess([str(script_path)], returncode, output.getvalue())
+
 
 def main():
+    parser = argparse.ArgumentParser(description="Review general Rust source code")
+    parser.add_argument(
+        '--in-process',
+        action='store_true',
+        help='Run the checks one after another in this interpreter, sharing imports, '
+             'compiled regexes and file reads, instead of as parallel subprocesses'
+    )
+    args = parser.parse_args()
+    
     script_dir = Path(__file__).parent
     my_name = Path(__file__).name
     
@@ -17,6 +91,9 @@ def main():
     review_scripts = sorted([
         f for f in script_dir.glob("review_*.py")
         if f.name != my_name
+        and f.name not in BUNDLED_IN_REVIEW_IMPLS
+        and f.name not in BUNDLED_IN_REVIEW_SRC_CHECKS
+        and f.name not in BUNDLED_IN_REVIEW_TRAIT_CHECKS
     ])
     
     find_scripts = sorted([
@@ -32,19 +109,57 @@ def main():
     
     print(f"Running {len(all_scripts)} Rust src check(s)\n")
     
+    # Walk src/, tests/ and benches/ once; the scripts read the file list
+    # from the manifest instead of each walking the tree again
+    repo_root = get_repo_root()
+    fd, manifest_path = tempfile.mkstemp(prefix='rusticate-files-', suffix='.json')
+    os.close(fd)
+    write_file_manifest([repo_root / name for name in ('src', 'tests', 'benches')], manifest_path)
+    
+    # The scripts are independent, so run them side by side; each one's
+    # output is captured and printed whole, in the usual order. Their own
+    # worker pools share the CPUs rather than each taking one per CPU.
+    workers = min(8, len(all_scripts))
+    env = dict(os.environ, **{
+        FILE_LIST_ENV: manifest_path,
+        JOBS_ENV: str(max(1, (os.cpu_count() or 1) // workers)),
+    })
+    
+    def run_script(script_path):
+        return subprocess.run(
+            [sys.executable, str(script_path)],
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, env=env
+        )
+    
+    executor = None
+    if args.in_process:
+        # Output redirection is process-wide, so in-process runs happen one
+        # at a time on this thread, each as its report is reached
+        os.environ[FILE_LIST_ENV] = manifest_path
+        enable_read_cache()
+        results = map(run_in_process, all_scripts)
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers)
+        results = executor.map(run_script, all_scripts)
+    
     passed = 0
     failed = 0
-    for script_path in all_scripts:
-        name = script_path.stem.replace('review_', '').replace('find_', '').replace('_', ' ').title()
-        prefix = "Review" if script_path.name.startswith("review_") else "Find"
-        print(f"[{prefix}: {name}]")
-        try:
-            subprocess.run([sys.executable, str(script_path)], check=True)
-            print()
-            passed += 1
-        except subprocess.CalledProcessError:
-            print(f"FAILED: {name}\n")
-            failed += 1
+    try:
+        for script_path, result in zip(all_scripts, results):
+            name = script_path.stem.replace('review_', '').replace('find_', '').replace('_', ' ').title()
+            prefix = "Review" if script_path.name.startswith("review_") else "Find"
+            print(f"[{prefix}: {name}]")
+            print(result.stdout, end='', flush=True)
+            if result.returncode == 0:
+                print()
+                passed += 1
+            else:
+                print(f"FAILED: {name}\n")
+                failed += 1
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        os.unlink(manifest_path)
     
     if failed > 0:
         print(f"✗ Rust src: {passed} passed, {failed} failed")
@@ -12,62 +12,68 @@ Pattern to find:
 import re
 import sys
 from pathlib import Path
-from collections import defaultdict
 
 # Add lib directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
-from review_utils import ReviewContext, create_review_parser
+from review_utils import (
+    ReviewContext, add_jobs_argument, create_review_parser, iter_rs_files, map_files, read_file_bytes,
+    source_text
+)
 
 
+# Match: impl<...> TraitName<...> for StructName<...>
+# Examples:
+#   impl<T: StT + Hash> SetStEphTrait<T> for SetStEph<T>
+#   impl SetStEphTrait<i32> for SetStEph<i32>
+# Matched over the whole file, so nothing may cross a newline
+_TRAIT_IMPL_RE = re.compile(
+    r'^[^\S\n]*impl(?:<[^>\n]+>)?[^\S\n]+(\w+)(?:<[^>\n]*>)?[^\S\n]+for[^\S\n]+(\w+)',
+    re.M
+)
+
+# Skip standard traits (Debug, Clone, Display, etc.)
+STANDARD_TRAITS = frozenset({
+    'Debug', 'Clone', 'Copy', 'PartialEq', 'Eq', 'PartialOrd', 'Ord',
+    'Hash', 'Display', 'Default', 'From', 'Into', 'AsRef', 'AsMut',
+    'Deref', 'DerefMut', 'Drop', 'Iterator', 'IntoIterator',
+    'Send', 'Sync', 'Sized', 'Unpin'
+})
+
 def analyze_file(filepath, context):
     """Find traits with multiple implementations."""
     try:
-        with open(filepath, 'r') as f:
-            lines = f.readlines()
-    except Exception:
+        data = read_file_bytes(filepath)
+    except OSError:
+        return {}
+    # A trait impl needs both keywords somewhere in the file
+    if b'impl' not in data or b'for' not in data:
         return {}
+    text = source_text(data)
     
-    # Track: trait_name -> [(struct_name, line_num), ...]
-    trait_impls = defaultdict(list)
+    # Track: (trait_name, struct_name) -> [line_num, ...]
+    pair_lines = {}
     
-    for i, line in enumerate(lines, 1):
-        # Match: impl<...> TraitName<...> for StructName<...>
-        # Examples:
-        #   impl<T: StT + Hash> SetStEphTrait<T> for SetStEph<T>
-        #   impl SetStEphTrait<i32> for SetStEph<i32>
-        match = re.match(r'\s*impl(?:<[^>]+>)?\s+(\w+)(?:<[^>]*>)?\s+for\s+(\w+)', line)
-        if match:
-            trait_name = match.group(1)
-            struct_name = match.group(2)
-            
-            # Skip standard traits (Debug, Clone, Display, etc.)
-            standard_traits = {
-                'Debug', 'Clone', 'Copy', 'PartialEq', 'Eq', 'PartialOrd', 'Ord',
-                'Hash', 'Display', 'Default', 'From', 'Into', 'AsRef', 'AsMut',
-                'Deref', 'DerefMut', 'Drop', 'Iterator', 'IntoIterator',
-                'Send', 'Sync', 'Sized', 'Unpin'
-            }
-            
-            if trait_name not in standard_traits:
-                trait_impls[trait_name].append((struct_name, i))
+    # One search over the text instead of a match per line; line numbers
+    # are counted up from the previous hit
+    line_num = 1
+    pos = 0
+    for match in _TRAIT_IMPL_RE.finditer(text):
+        line_num += text.count('\n', pos, match.start())
+        pos = match.start()
+        trait_name = match.group(1)
+        struct_name = match.group(2)
+        
+        if trait_name not in STANDARD_TRAITS:
+            pair_lines.setdefault((trait_name, struct_name), []).append(line_num)
     
-    # Find traits with multiple impls for the same struct
+    # Traits implemented more than once for the same struct
     violations = {}
-    for trait_name, impls in trait_impls.items():
-        # Group by struct name
-        by_struct = defaultdict(list)
-        for struct_name, line_num in impls:
-            by_struct[struct_name].append(line_num)
-        
-        # Find structs with multiple impls
-        for struct_name, line_nums in by_struct.items():
-            if len(line_nums) > 1:
-                if trait_name not in violations:
-                    violations[trait_name] = []
-                violations[trait_name].append({
-                    'struct': struct_name,
-                    'lines': line_nums
-                })
+    for (trait_name, struct_name), line_nums in pair_lines.items():
+        if len(line_nums) > 1:
+            violations.setdefault(trait_name, []).append({
+                'struct': struct_name,
+                'lines': line_nums
+            })
     
     return violations
 
@@ -76,6 +82,7 @@ def main():
     parser = create_review_parser(
         description="Detect traits with multiple implementations (should have single impl)"
     )
+    add_jobs_argument(parser)
     args = parser.parse_args()
     context = ReviewContext(args)
 
@@ -85,12 +92,14 @@ def main():
         print("✗ No src/ directory found")
         return 1
     
-    files = list(src_dir.rglob('*.rs'))
+    files = list(iter_rs_files(src_dir))
     
     all_violations = {}
     
-    for filepath in sorted(files):
-        violations = analyze_file(filepath, context)
+    # Files are independent, so spread them over a process pool
+    files = sorted(files)
+    per_file = map_files(analyze_file, files, context, jobs=args.jobs)
+    for filepath, violations in zip(files, per_file):
         if violations:
             all_violations[filepath] = violations
     
@@ -109,6 +118,8 @@ def main():
     print("Each trait should have only ONE impl block for each struct.\n")
     print("="*80)
     
+    # Assemble the report and write it at once rather than a print per line
+    out = []
     for filepath, file_violations in sorted(all_violations.items()):
         rel_path = context.relative_path(filepath)
         
@@ -117,10 +128,11 @@ def main():
                 struct_name = violation['struct']
                 lines = violation['lines']
                 
-                print(f"\n{rel_path}")
-                print(f"  Trait: {trait_name}")
-                print(f"  Struct: {struct_name}")
-                print(f"  Multiple impl blocks at lines: {', '.join(map(str, lines))}")
+                out.append(f"\n{rel_path}")
+                out.append(f"  Trait: {trait_name}")
+                out.append(f"  Struct: {struct_name}")
+                out.append(f"  Multiple impl blocks at lines: {', '.join(map(str, lines))}")
+    print('\n'.join(out))
     
     print(f"\n{'='*80}")
     print(f"Total violations: {total_count}")
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Run the module and macro review checks over a single read of each file.
+
+Each .rs file under src/, tests/ and benches/ is read once, or its results
+are reused from target/review_cache if the file is unchanged, and the
+results are handed to every enabled check:
+
+  lib            review_lib                          src modules declared in lib.rs
+  encapsulation  review_module_encapsulation         code outside pub mod blocks (src/)
+  duplication    review_no_trait_method_duplication  trait methods duplicated as inherent
+  macros         review_macro_method_calls --all     macro calls of trait-only methods (src/)
+"""
+
+import sys
+from pathlib import Path
+
+# Add lib directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
+from review_utils import (
+    ReviewContext, add_cache_argument, create_review_parser, open_cache, print_review
+)
+
+sys.path.insert(0, str(Path(__file__).parent))
+from review_lib import report_lib_declarations
+from review_macro_method_calls import build_global_impls, report_macro_calls, scan_content
+from review_module_encapsulation import (
+    EXEMPT_FILES, format_items, report_module_encapsulation, unencapsulated_items
+)
+from review_no_trait_method_duplication import (
+    FIX_SUGGESTION, RULE_NAME, RULE_REFERENCE, SOURCE_DIRS, content_violations, format_violations
+)
+
+
+CHECKS = ['lib', 'encapsulation', 'duplication', 'macros']
+
+# Bump whenever one of the bundled per-file computations changes
+CACHE_VERSION = 2
+
+
+def scan_source(file_path: Path):
+    """
+    Every check's per-file result from one read of file_path:
+    (unencapsulated items, duplicate methods, macro scan).
+
+    The text-based entries are None if the file is not UTF-8.
+    """
+    data = file_path.read_bytes()
+    if b'\r' in data:
+        data = data.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    duplicates = content_violations(data)
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError:
+        return None, duplicates, None
+    return unencapsulated_items(text), duplicates, scan_content(text)
+
+
+def main():
+    parser = create_review_parser(
+        description="Run the module and macro review checks over one read of each file"
+    )
+    parser.add_argument(
+        '--checks',
+        default=','.join(CHECKS),
+        help=f"Comma-separated checks to run (default: {','.join(CHECKS)})"
+    )
+    add_cache_argument(parser)
+    args = parser.parse_args()
+    context = ReviewContext(args)
+
+    checks = [c.strip() for c in args.checks.split(',') if c.strip()]
+    unknown = [c for c in checks if c not in CHECKS]
+    if unknown:
+        print(f"Error: unknown check(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    src_dir = context.repo_root / 'src'
+    if not src_dir.exists():
+        print("✗ No src/ directory found")
+        return 1
+
+    files = context.find_files([context.repo_root / name for name in SOURCE_DIRS])
+    if context.dry_run:
+        print(f"Would check {len(files)} file(s) for: {', '.join(checks)}")
+        return 0
+
+    cache = open_cache(args, 'src_checks', CACHE_VERSION, context.repo_root)
+
+    scans = {}
+    read_errors = []
+    for file_path in files:
+        try:
+            if cache is not None:
+                scans[file_path] = cache.lookup(file_path, scan_source)
+            else:
+                scans[file_path] = scan_source(file_path)
+        except OSError as e:
+            read_errors.append(f"ERROR: Could not read {file_path}: {e}")
+    if cache is not None:
+        cache.prune(max_entries=max(2000, 2 * len(files)))
+
+    # Encapsulation and macro calls are only checked under src/
+    src_scans = {
+        file_path: scan for file_path, scan in scans.items()
+        if src_dir in file_path.parents
+    }
+
+    exit_code = 0
+    for check in checks:
+        print(f"[{check}]")
+        if check == 'lib':
+            with open(src_dir / 'lib.rs') as f:
+                exit_code |= report_lib_declarations(f.read(), src_dir)
+        elif check == 'encapsulation':
+            all_violations = []
+            for file_path, (items, _, _) in src_scans.items():
+                if items and file_path.name not in EXEMPT_FILES:
+                    all_violations.extend(format_items(context.relative_path(file_path), items))
+            exit_code |= report_module_encapsulation(all_violations)
+        elif check == 'duplication':
+            all_violations = list(read_errors)
+            for file_path, (_, duplicates, _) in scans.items():
+                all_violations.extend(format_violations(context.relative_path(file_path), duplicates))
+            exit_code |= print_review(all_violations, RULE_NAME, RULE_REFERENCE, FIX_SUGGESTION)
+        elif check == 'macros':
+            macro_calls = {}
+            all_impl_info = {}
+            for file_path, (_, _, macro_scan) in src_scans.items():
+                if macro_scan is None:
+                    continue
+                impl_info, calls = macro_scan
+                rel_path = context.relative_path(file_path)
+                macro_calls[rel_path] = calls
+                if impl_info:
+                    all_impl_info[str(rel_path)] = impl_info
+            exit_code |= report_macro_calls(macro_calls, build_global_impls(all_impl_info))
+        print()
+
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
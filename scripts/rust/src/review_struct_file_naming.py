@@ -20,9 +20,13 @@ import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "lib"))
-from review_utils import ReviewContext, create_review_parser
+from review_utils import ReviewContext, create_review_parser, iter_rs_files, read_file_bytes, source_lines
 
 
+# Pattern to match struct declarations
+# Matches: pub struct Foo, pub struct Foo<T>, pub(crate) struct Foo, etc.
+_STRUCT_RE = re.compile(r'^\s*pub(?:\([^)]*\))?\s+struct\s+(\w+)')
+
 def check_file(file_path: Path, context: ReviewContext) -> list[str]:
     """
     Check if struct names match the file name pattern.
@@ -31,28 +35,26 @@ def check_file(file_path: Path, context: ReviewContext) -> list[str]:
     violations = []
     
     try:
-        content = file_path.read_text()
-        lines = content.split('\n')
+        data = read_file_bytes(file_path)
+        if b'struct' not in data:
+            return violations
+        lines = source_lines(data)
         
         # Get the expected struct name from file name
         # e.g., RelationStEph.rs -> RelationStEph
         file_stem = file_path.stem  # Remove .rs extension
-        
-        # Pattern to match struct declarations
-        # Matches: pub struct Foo, pub struct Foo<T>, pub(crate) struct Foo, etc.
-        struct_pattern = re.compile(r'^\s*pub(?:\([^)]*\))?\s+struct\s+(\w+)')
+        # The "S" suffix variants are acceptable too (FooS struct in Foo.rs or vice versa)
+        accepted = {file_stem, file_stem + 'S'}
+        if file_stem.endswith('S'):
+            accepted.add(file_stem[:-1])
         
         for line_num, line in enumerate(lines, 1):
-            match = struct_pattern.match(line)
+            match = _STRUCT_RE.match(line)
             if match:
                 struct_name = match.group(1)
                 
                 # Check if struct name matches file name
-                if struct_name != file_stem:
-                    # Also check if it's the "S" suffix variant (FooS vs Foo)
-                    if struct_name + 'S' == file_stem or struct_name == file_stem + 'S':
-                        continue  # This is acceptable (FooS struct in Foo.rs or vice versa)
-                    
+                if struct_name not in accepted:
                     rel_path = context.relative_path(file_path)
                     violations.append(
                         f"  {rel_path}:{line_num} - struct '{struct_name}' doesn't match file name '{file_stem}'\n"
@@ -80,7 +82,7 @@ def main():
         if not dir_path.exists():
             continue
         
-        rust_files = list(dir_path.rglob('*.rs'))
+        rust_files = list(iter_rs_files(dir_path))
         
         for file_path in rust_files:
             if args.file and context.relative_path(file_path) != args.file:
@@ -16,10 +16,24 @@ import re
 import sys
 from pathlib import Path
 from collections import defaultdict
+from functools import lru_cache
 
 # Add lib directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
-from review_utils import ReviewContext, create_review_parser
+from review_utils import (
+    ReviewContext, add_cache_argument, add_jobs_argument, add_since_argument, create_review_parser,
+    decode_source, map_files, open_cache, read_file_bytes
+)
+
+
+STT_TRAITS = ('Clone', 'Display', 'Debug', 'Eq')
+
+# A pub struct anywhere in the text; analyze_text() keeps those that start their line
+_STRUCT_RE = re.compile(r'pub[^\S\n]+struct[^\S\n]+(\w+)')
+_DERIVE_RE = re.compile(r'#\[derive\((.*?)\)\]')
+# Every `Trait for Name` of an StT trait, overlapping ones included (the
+# trait is not word-bounded: `impl PartialEq for Foo` counts as Eq)
+_IMPL_FOR_RE = re.compile(r'(?=(Clone|Display|Debug|Eq)\s+for\s+(\w+))')
 
 
 def extract_derives(lines, struct_line_idx):
@@ -31,12 +45,9 @@ def extract_derives(lines, struct_line_idx):
         line = lines[i].strip()
         if line.startswith('#[derive('):
             # Extract traits from derive: #[derive(Debug, Clone, Copy, ...)]
-            match = re.search(r'#\[derive\((.*?)\)\]', line)
+            match = _DERIVE_RE.search(line)
             if match:
-                traits_str = match.group(1)
-                for trait in traits_str.split(','):
-                    trait = trait.strip()
-                    derives.add(trait)
+                derives.update(derive_traits(match.group(1)))
         elif not line.startswith('#'):
             # Stop at non-attribute line
             break
@@ -44,58 +55,93 @@ def extract_derives(lines, struct_line_idx):
     return derives
 
 
-def has_manual_impl(lines, struct_name, trait_name):
-    """Check if struct has a manual impl for trait."""
-    # Look for: impl ... Trait for StructName
-    pattern = rf'impl.*{trait_name}\s+for\s+{struct_name}'
+@lru_cache(maxsize=None)
+def derive_traits(traits_str):
+    """The traits in a derive list like 'Debug, Clone, Copy' (memoized: lists recur)."""
+    return frozenset(trait.strip() for trait in traits_str.split(','))
+
+
+def find_manual_impls(lines):
+    """
+    {trait: names following `Trait for`} for the StT traits, from one pass
+    over the lines with an `impl` before the trait.
+    """
+    manual = {trait: set() for trait in STT_TRAITS}
     for line in lines:
-        if re.search(pattern, line):
-            return True
-    return False
+        if 'for' not in line:
+            continue
+        impl_pos = line.find('impl')
+        if impl_pos == -1:
+            continue
+        for match in _IMPL_FOR_RE.finditer(line, impl_pos + 4):
+            manual[match.group(1)].add(match.group(2))
+    return manual
+
+
+def has_manual_impl(manual, struct_name, trait_name):
+    """Check if struct has a manual impl for trait, given find_manual_impls() output."""
+    # Look for: impl ... Trait for StructName (StructName may be a prefix of
+    # the name there, as with the per-line pattern search this replaces)
+    return any(name.startswith(struct_name) for name in manual[trait_name])
 
 
 def analyze_file(filepath, context):
     """Analyze a file for structs that don't satisfy StT."""
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        data = read_file_bytes(filepath)
+        # Only pub structs are reported; skip decoding files without any
+        if b'struct' not in data or b'pub' not in data:
+            return []
+        text = decode_source(data)
     except Exception:
         return []
-    
+    return analyze_text(text)
+
+
+def analyze_text(text):
+    """The structs in one file's text that don't satisfy StT."""
     non_stt_structs = []
-    
-    for i, line in enumerate(lines):
-        # Find pub struct definitions
-        match = re.match(r'\s*pub\s+struct\s+(\w+)', line)
-        if match:
-            struct_name = match.group(1)
-            
-            # Extract derives
-            derives = extract_derives(lines, i)
-            
-            # Check for required traits
-            has_clone = 'Clone' in derives or has_manual_impl(lines, struct_name, 'Clone')
-            has_display = 'Display' in derives or has_manual_impl(lines, struct_name, 'Display')
-            has_debug = 'Debug' in derives or has_manual_impl(lines, struct_name, 'Debug')
-            has_eq = 'Eq' in derives or has_manual_impl(lines, struct_name, 'Eq')
-            
-            missing = []
-            if not has_clone:
-                missing.append('Clone')
-            if not has_display:
-                missing.append('Display')
-            if not has_debug:
-                missing.append('Debug')
-            if not has_eq:
-                missing.append('Eq')
-            
-            if missing:
-                non_stt_structs.append({
-                    'name': struct_name,
-                    'line': i + 1,
-                    'derives': derives,
-                    'missing': missing
-                })
+    if 'struct' not in text:
+        return non_stt_structs
+    # Lines are split once per file, on its first struct, and manual impls
+    # gathered once, for the first struct missing a derive
+    lines = None
+    manual = None
+    i = 0
+    last = 0
+    
+    # Find pub struct definitions
+    for match in _STRUCT_RE.finditer(text):
+        start = match.start()
+        line_start = text.rfind('\n', 0, start) + 1
+        if line_start < start and not text[line_start:start].isspace():
+            continue
+        i += text.count('\n', last, start)
+        last = start
+        struct_name = match.group(1)
+        if lines is None:
+            lines = text.split('\n')
+        
+        # Extract derives
+        derives = extract_derives(lines, i)
+        
+        # Check for required traits; manual impls only for those not derived
+        missing = []
+        for trait in STT_TRAITS:
+            if trait in derives:
+                continue
+            if manual is None:
+                manual = find_manual_impls(lines)
+            if not has_manual_impl(manual, struct_name, trait):
+                missing.append(trait)
+        
+        if missing:
+            non_stt_structs.append({
+                'name': struct_name,
+                'line': i + 1,
+                'derives': derives,
+                'missing': missing
+            })
     
     return non_stt_structs
 
@@ -104,6 +150,9 @@ def main():
     parser = create_review_parser(
         description="Detect data structures that don't satisfy StT (Eq + Clone + Display + Debug)"
     )
+    add_jobs_argument(parser)
+    add_cache_argument(parser)
+    add_since_argument(parser)
     args = parser.parse_args()
     context = ReviewContext(args)
 
@@ -113,7 +162,7 @@ def main():
         print("✗ No src/ directory found")
         return 1
     
-    files = list(src_dir.rglob('*.rs'))
+    files = context.find_files([src_dir])
     print(f"Analyzing {len(files)} source files for StT compliance...")
     print("=" * 80)
     print()
@@ -121,12 +170,19 @@ def main():
     print()
     
     all_violations = []
+    cache = open_cache(args, 'stt_compliance', 1, context.repo_root)
     
-    for filepath in sorted(files):
-        violations = analyze_file(filepath, context)
+    files = sorted(files)
+    results = map_files(analyze_file, files, context, jobs=args.jobs, cache=cache)
+    for filepath, violations in zip(files, results):
         if violations:
             all_violations.append((filepath, violations))
     
+    return report_stt_compliance(all_violations, context)
+
+
+def report_stt_compliance(all_violations, context):
+    """Print the (file, analyze_file() result) pairs; returns the exit code."""
     if not all_violations:
         print("\n✓ All public structs satisfy StT requirements!")
         return 0
@@ -150,27 +206,30 @@ def main():
     
     total_count = sum(len(v) for _, v in all_violations)
     
-    print(f"✗ Found {total_count} struct(s) that don't satisfy StT:\n")
-    
-    print(f"Summary by missing trait:")
-    print(f"  Missing Clone:   {len(missing_clone)}")
-    print(f"  Missing Display: {len(missing_display)}")
-    print(f"  Missing Debug:   {len(missing_debug)}")
-    print(f"  Missing Eq:      {len(missing_eq)}")
-    
-    print(f"\n{'='*80}")
-    print("Detailed list:\n")
+    # Collected and printed at once: one write instead of one per line
+    out = [
+        f"✗ Found {total_count} struct(s) that don't satisfy StT:\n",
+        f"Summary by missing trait:",
+        f"  Missing Clone:   {len(missing_clone)}",
+        f"  Missing Display: {len(missing_display)}",
+        f"  Missing Debug:   {len(missing_debug)}",
+        f"  Missing Eq:      {len(missing_eq)}",
+        f"\n{'='*80}",
+        "Detailed list:\n",
+    ]
     
     for filepath, violations in sorted(all_violations, key=lambda x: len(x[1]), reverse=True):
         rel_path = context.relative_path(filepath)
-        print(f"{rel_path}:")
+        out.append(f"{rel_path}:")
         for v in violations:
             missing_str = ', '.join(v['missing'])
             derives_str = ', '.join(sorted(v['derives'])) if v['derives'] else 'none'
-            print(f"  Line {v['line']}: {v['name']}")
-            print(f"    Has derives: {derives_str}")
-            print(f"    Missing: {missing_str}")
-        print()
+            out.append(f"  Line {v['line']}: {v['name']}")
+            out.append(f"    Has derives: {derives_str}")
+            out.append(f"    Missing: {missing_str}")
+        out.append('')
+    
+    print('\n'.join(out))
     
     return 1
 
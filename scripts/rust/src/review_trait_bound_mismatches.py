@@ -26,16 +26,32 @@ import re
 import sys
 from pathlib import Path
 from collections import defaultdict
+from functools import lru_cache
 
 # Add lib directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
-from review_utils import ReviewContext, create_review_parser
+from review_utils import (
+    ReviewContext, add_cache_argument, add_jobs_argument, add_since_argument, create_review_parser,
+    decode_source, map_files, open_cache, read_file_bytes
+)
+from brace_depth import line_depths
 
 
+_IMPL_BOUNDS_RE = re.compile(r'impl\s*<([^>]+)>')
+_TRAIT_BOUNDS_RE = re.compile(r'trait\s+\w+\s*<([^>]+)>')
+_GENERIC_IMPL_RE = re.compile(r'\s*impl\s*<')
+_FN_NAME_RE = re.compile(r'\b(?:pub\s+)?fn\s+([a-zA-Z_][a-zA-Z0-9_]*)')
+
+
+@lru_cache(maxsize=None)
 def parse_bounds(bounds_str):
-    """Parse trait bounds like 'T: Eq + Hash' into a set of traits."""
+    """
+    Parse trait bounds like 'T: Eq + Hash' into a frozenset of traits.
+    
+    Memoized: the same few bound lists recur across impls and traits.
+    """
     if not bounds_str:
-        return set()
+        return frozenset()
     
     # Extract individual trait names
     # Handle: T: Eq + Hash, U: Clone
@@ -48,42 +64,83 @@ def parse_bounds(bounds_str):
                 if trait and not trait.startswith('\''):  # Skip lifetimes
                     traits.add(trait)
     
-    return traits
+    return frozenset(traits)
 
 
 def extract_impl_bounds(impl_line):
     """Extract bounds from impl line: impl<T: Eq + Hash> Struct<T>"""
-    match = re.search(r'impl\s*<([^>]+)>', impl_line)
+    match = _IMPL_BOUNDS_RE.search(impl_line)
     if match:
         return parse_bounds(match.group(1))
-    return set()
+    return frozenset()
 
 
 def extract_trait_bounds(trait_line):
     """Extract bounds from trait line: pub trait MyTrait<T: StT + Hash>"""
-    match = re.search(r'trait\s+\w+\s*<([^>]+)>', trait_line)
+    match = _TRAIT_BOUNDS_RE.search(trait_line)
     if match:
         return parse_bounds(match.group(1))
-    return set()
+    return frozenset()
 
 
 def find_method_names_in_block(lines, start_idx, end_idx):
     """Find all method names in a block."""
     methods = set()
     for i in range(start_idx, end_idx):
-        match = re.search(r'\b(?:pub\s+)?fn\s+([a-zA-Z_][a-zA-Z0-9_]*)', lines[i])
-        if match and not lines[i].strip().startswith('//'):
+        line = lines[i]
+        if 'fn' not in line:
+            continue
+        match = _FN_NAME_RE.search(line)
+        if match and not line.strip().startswith('//'):
             methods.add(match.group(1))
     return methods
 
 
+def find_block_end(lines, start_idx, depths=None):
+    """
+    Index of the line closing the block opened on lines[start_idx] (len(lines) if unclosed).
+    
+    depths is line_depths() of the text, or None to count braces line by line.
+    """
+    if depths is not None:
+        # The block closes on the first later line back at or below its starting depth
+        base = depths[start_idx - 1] if start_idx > 0 else 0
+        hits = (depths[start_idx + 1:] <= base).nonzero()[0]
+        return start_idx + 1 + int(hits[0]) if len(hits) else len(lines)
+    line = lines[start_idx]
+    brace_depth = line.count('{') - line.count('}')
+    for j in range(start_idx + 1, len(lines)):
+        line = lines[j]
+        if '{' in line or '}' in line:
+            brace_depth += line.count('{') - line.count('}')
+        if brace_depth <= 0:
+            return j
+    return len(lines)
+
+
 def analyze_file(filepath, context):
     """Analyze a file for trait bound mismatches."""
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        data = read_file_bytes(filepath)
+        # Skip decoding files that lack a trait or an impl (see find_bound_mismatch)
+        if b'pub trait ' not in data or b'impl' not in data:
+            return None
+        text = decode_source(data)
     except Exception:
         return None
+    mismatch = find_bound_mismatch(text)
+    if mismatch is None:
+        return None
+    return {'file': filepath, **mismatch}
+
+
+def find_bound_mismatch(text):
+    """analyze_file()'s result for one file's text, less its 'file' entry."""
+    # Without both a trait and an impl there is nothing to compare
+    if 'pub trait ' not in text or 'impl' not in text:
+        return None
+    lines = text.split('\n')
+    depths = line_depths(text)
     
     # Find trait definition
     trait_idx = None
@@ -94,14 +151,7 @@ def analyze_file(filepath, context):
         if 'pub trait ' in line and '{' in line:
             trait_idx = i
             trait_bounds = extract_trait_bounds(line)
-            
-            # Find trait end
-            brace_depth = line.count('{') - line.count('}')
-            for j in range(i + 1, len(lines)):
-                brace_depth += lines[j].count('{') - lines[j].count('}')
-                if brace_depth <= 0:
-                    trait_end_idx = j
-                    break
+            trait_end_idx = find_block_end(lines, i, depths)
             break
     
     if trait_idx is None:
@@ -113,17 +163,10 @@ def analyze_file(filepath, context):
     inherent_end_idx = None
     
     for i, line in enumerate(lines):
-        if re.match(r'\s*impl\s*<', line) and ' for ' not in line:
+        if 'impl' in line and _GENERIC_IMPL_RE.match(line) and ' for ' not in line:
             inherent_idx = i
             inherent_bounds = extract_impl_bounds(line)
-            
-            # Find impl end
-            brace_depth = line.count('{') - line.count('}')
-            for j in range(i + 1, len(lines)):
-                brace_depth += lines[j].count('{') - lines[j].count('}')
-                if brace_depth <= 0:
-                    inherent_end_idx = j
-                    break
+            inherent_end_idx = find_block_end(lines, i, depths)
             break
     
     if inherent_idx is None:
@@ -149,7 +192,6 @@ def analyze_file(filepath, context):
         return None
     
     return {
-        'file': filepath,
         'trait_line': trait_idx + 1,
         'inherent_line': inherent_idx + 1,
         'trait_bounds': trait_bounds,
@@ -163,6 +205,9 @@ def main():
     parser = create_review_parser(
         description="Detect trait bound mismatches between inherent and trait impls"
     )
+    add_jobs_argument(parser)
+    add_cache_argument(parser)
+    add_since_argument(parser)
     args = parser.parse_args()
     context = ReviewContext(args)
 
@@ -172,42 +217,48 @@ def main():
         print("✗ No src/ directory found")
         return 1
     
-    files = list(src_dir.rglob('*.rs'))
+    files = context.find_files([src_dir])
     print(f"Analyzing {len(files)} source files for trait bound mismatches...")
     print("=" * 80)
     
     all_mismatches = []
+    cache = open_cache(args, 'trait_bound_mismatches', 1, context.repo_root)
     
-    for filepath in sorted(files):
-        result = analyze_file(filepath, context)
+    for result in map_files(analyze_file, sorted(files), context, jobs=args.jobs, cache=cache):
         if result:
             all_mismatches.append(result)
     
+    return report_bound_mismatches(all_mismatches, context)
+
+
+def report_bound_mismatches(all_mismatches, context):
+    """Print the analyze_file() results of the mismatched files; returns the exit code."""
     if not all_mismatches:
         print("\n✓ No trait bound mismatches found!")
         return 0
     
-    # Report
-    print(f"\n✗ Found {len(all_mismatches)} file(s) with trait bound mismatches:\n")
+    # Report, collected and printed at once: one write instead of one per line
+    out = [f"\n✗ Found {len(all_mismatches)} file(s) with trait bound mismatches:\n"]
     
     for result in sorted(all_mismatches, key=lambda x: len(x['missing_bounds']), reverse=True):
         rel_path = context.relative_path(result['file'])
-        print(f"\n{rel_path}:")
-        print(f"  Trait (line {result['trait_line']}):")
-        print(f"    Bounds: {', '.join(sorted(result['trait_bounds']))}")
-        print(f"  Inherent impl (line {result['inherent_line']}):")
-        print(f"    Bounds: {', '.join(sorted(result['inherent_bounds']))}")
-        print(f"  Missing in inherent: {', '.join(sorted(result['missing_bounds']))}")
-        print(f"  Affected methods ({len(result['overlapping_methods'])}): {', '.join(sorted(list(result['overlapping_methods'])[:5]))}")
+        out.append(f"\n{rel_path}:")
+        out.append(f"  Trait (line {result['trait_line']}):")
+        out.append(f"    Bounds: {', '.join(sorted(result['trait_bounds']))}")
+        out.append(f"  Inherent impl (line {result['inherent_line']}):")
+        out.append(f"    Bounds: {', '.join(sorted(result['inherent_bounds']))}")
+        out.append(f"  Missing in inherent: {', '.join(sorted(result['missing_bounds']))}")
+        out.append(f"  Affected methods ({len(result['overlapping_methods'])}): {', '.join(sorted(list(result['overlapping_methods'])[:5]))}")
         if len(result['overlapping_methods']) > 5:
-            print(f"    ... and {len(result['overlapping_methods']) - 5} more")
-    
-    print("\n" + "=" * 80)
-    print(f"Summary:")
-    print(f"  Files with bound mismatches: {len(all_mismatches)}")
-    print(f"\nRecommendation:")
-    print(f"  Add missing bounds to inherent impl blocks to match trait bounds.")
-    print(f"  This ensures no surprises when moving methods to trait defaults.")
+            out.append(f"    ... and {len(result['overlapping_methods']) - 5} more")
+    
+    out.append("\n" + "=" * 80)
+    out.append(f"Summary:")
+    out.append(f"  Files with bound mismatches: {len(all_mismatches)}")
+    out.append(f"\nRecommendation:")
+    out.append(f"  Add missing bounds to inherent impl blocks to match trait bounds.")
+    out.append(f"  This ensures no surprises when moving methods to trait defaults.")
+    print('\n'.join(out))
     
     return 1
 
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Run the per-file trait review checks over a single read of each file.
+
+Each .rs file under src/ is read once, or its results are reused from
+target/review_cache if the file is unchanged, and the text is handed to
+every enabled check:
+
+  stt       review_stt_compliance          structs missing Eq/Clone/Display/Debug
+  bounds    review_trait_bound_mismatches  inherent impls with weaker bounds than the trait
+  defaults  review_trait_default_pattern   multi-line default bodies in traits
+  order     review_trait_definition_order  trait definitions after impl blocks
+"""
+
+import sys
+from pathlib import Path
+
+# Add lib directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
+from review_utils import (
+    ReviewContext, add_cache_argument, add_since_argument, create_review_parser, open_cache, print_review
+)
+
+sys.path.insert(0, str(Path(__file__).parent))
+from review_stt_compliance import analyze_text, report_stt_compliance
+from review_trait_bound_mismatches import find_bound_mismatch, report_bound_mismatches
+from review_trait_default_pattern import FIX_SUGGESTION, RULE_NAME, RULE_REFERENCE, check_content
+from review_trait_definition_order import is_exempt, order_violations, report_trait_order
+
+
+CHECKS = ['stt', 'bounds', 'defaults', 'order']
+
+# Bump whenever one of the bundled per-file computations changes
+CACHE_VERSION = 1
+
+
+def scan_source(file_path: Path, rel_path):
+    """
+    Every check's per-file result from one read of file_path:
+    (StT violations, bound mismatch, default-pattern errors, order violations).
+    """
+    data = file_path.read_bytes()
+    # Every check needs a struct or a trait (and the defaults check reports
+    # decode errors, which an ASCII file cannot have)
+    if b'struct' not in data and b'trait' not in data and data.isascii():
+        return [], None, [], []
+    if b'\r' in data:
+        data = data.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError as e:
+        return [], None, [f"ERROR: Could not read {file_path}: {e}"], []
+    lines = text.split('\n')
+    order = [] if is_exempt(file_path) else order_violations(file_path, lines)
+    return analyze_text(text), find_bound_mismatch(text), check_content(text, rel_path), order
+
+
+def main():
+    parser = create_review_parser(
+        description="Run the per-file trait review checks over one read of each file"
+    )
+    parser.add_argument(
+        '--checks',
+        default=','.join(CHECKS),
+        help=f"Comma-separated checks to run (default: {','.join(CHECKS)})"
+    )
+    add_cache_argument(parser)
+    add_since_argument(parser)
+    args = parser.parse_args()
+    context = ReviewContext(args)
+
+    checks = [c.strip() for c in args.checks.split(',') if c.strip()]
+    unknown = [c for c in checks if c not in CHECKS]
+    if unknown:
+        print(f"Error: unknown check(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    src_dir = context.repo_root / 'src'
+    if not src_dir.exists():
+        print("✗ No src/ directory found")
+        return 1
+
+    files = context.find_files([src_dir])
+    if context.dry_run:
+        print(f"Would check {len(files)} file(s) for: {', '.join(checks)}")
+        return 0
+
+    cache = open_cache(args, 'trait_checks', CACHE_VERSION, context.repo_root)
+
+    scans = {}
+    read_errors = []
+    for file_path in files:
+        rel_path = context.relative_path(file_path)
+        try:
+            if cache is not None:
+                scans[file_path] = cache.lookup(file_path, lambda path: scan_source(path, rel_path))
+            else:
+                scans[file_path] = scan_source(file_path, rel_path)
+        except OSError as e:
+            read_errors.append(f"ERROR: Could not read {file_path}: {e}")
+    if cache is not None:
+        cache.prune(max_entries=max(2000, 2 * len(files)))
+
+    exit_code = 0
+    for check in checks:
+        print(f"[{check}]")
+        if check == 'stt':
+            all_violations = [
+                (file_path, violations)
+                for file_path, (violations, _, _, _) in scans.items() if violations
+            ]
+            exit_code |= report_stt_compliance(all_violations, context)
+        elif check == 'bounds':
+            all_mismatches = [
+                {'file': file_path, **mismatch}
+                for file_path, (_, mismatch, _, _) in scans.items() if mismatch
+            ]
+            exit_code |= report_bound_mismatches(all_mismatches, context)
+        elif check == 'defaults':
+            all_violations = list(read_errors)
+            for _, (_, _, errors, _) in scans.items():
+                all_violations.extend(errors)
+            exit_code |= print_review(all_violations, RULE_NAME, RULE_REFERENCE, FIX_SUGGESTION)
+        elif check == 'order':
+            all_violations = []
+            for _, (_, _, _, violations) in scans.items():
+                all_violations.extend(violations)
+            exit_code |= report_trait_order(all_violations, context.repo_root)
+        print()
+
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -18,17 +18,37 @@ from pathlib import Path
 
 # Add lib directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "lib"))
-from review_utils import run_review, get_repo_root
+from review_utils import decode_source, get_repo_root, read_file_bytes, run_review
+
+
+RULE_NAME = "Default Trait Implementations Pattern"
+RULE_REFERENCE = "RustRules.md: Default Trait Implementations (Pattern)"
+FIX_SUGGESTION = "Move multi-line default implementations to impl block, leave only signature in trait."
+
+_TRAIT_RE = re.compile(r'\s*pub\s+trait\s+(\w+)')
+_FN_RE = re.compile(r'\s*fn\s+(\w+)\s*[<(].*\{')
 
 
 def check_file(file_path: Path, context) -> list[str]:
     """Check a single Rust file for trait default implementation pattern."""
     try:
-        content = file_path.read_text(encoding='utf-8')
+        data = read_file_bytes(file_path)
+        # Without a trait there is nothing to report; an ASCII file needs no
+        # decoding to know it has no decode error to report either
+        if b'trait' not in data and data.isascii():
+            return []
+        content = decode_source(data)
     except Exception as e:
         return [f"ERROR: Could not read {file_path}: {e}"]
-    
+    return check_content(content, context.relative_path(file_path))
+
+
+def check_content(content: str, rel_path) -> list[str]:
+    """check_file() on one file's text; rel_path is used in the messages."""
     errors = []
+    # Only lines inside a pub trait can be reported
+    if 'trait' not in content:
+        return errors
     lines = content.splitlines()
     
     in_trait = False
@@ -38,9 +58,10 @@ def check_file(file_path: Path, context) -> list[str]:
     
     for i, line in enumerate(lines, 1):
         # Track trait blocks
-        if re.match(r'\s*pub\s+trait\s+\w+', line):
+        trait_match = _TRAIT_RE.match(line) if 'trait' in line else None
+        if trait_match:
             in_trait = True
-            trait_name = re.search(r'trait\s+(\w+)', line).group(1)
+            trait_name = trait_match.group(1)
             trait_start = i
             brace_depth = 0
         
@@ -51,7 +72,7 @@ def check_file(file_path: Path, context) -> list[str]:
                 continue
             
             # Look for default implementations in trait that span multiple lines
-            fn_match = re.match(r'\s*fn\s+(\w+)\s*[<(].*\{', line)
+            fn_match = _FN_RE.match(line) if 'fn' in line else None
             if fn_match:
                 method_name = fn_match.group(1)
                 
@@ -71,7 +92,6 @@ def check_file(file_path: Path, context) -> list[str]:
                     
                     if line_count > 1:
                         # This is a multi-line default in trait - potential violation
-                        rel_path = context.relative_path(file_path)
                         errors.append(
                             f"{rel_path}:{i}: Multi-line default implementation for '{method_name}' "
                             f"in trait '{trait_name}' ({line_count} lines). Consider moving body to impl block "
@@ -85,11 +105,14 @@ def main():
     repo_root = get_repo_root()
     return run_review(
         description="Check trait default implementation pattern (one-line in trait, multi-line in impl)",
-        rule_name="Default Trait Implementations Pattern",
-        rule_reference="RustRules.md: Default Trait Implementations (Pattern)",
+        rule_name=RULE_NAME,
+        rule_reference=RULE_REFERENCE,
         directories=[repo_root / "src"],
         check_function=check_file,
-        fix_suggestion="Move multi-line default implementations to impl block, leave only signature in trait."
+        fix_suggestion=FIX_SUGGESTION,
+        parallel=True,
+        cache_namespace="trait_default_pattern",
+        incremental=True
     )
 
 
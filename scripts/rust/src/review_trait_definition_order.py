@@ -19,27 +19,51 @@ This ensures the trait interface is visible before any implementations.
 # Git commit: e4850e1
 # Date: 2025-10-17
 
+import argparse
 import re
 import sys
 from pathlib import Path
 
+# Add lib directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
+from review_utils import (
+    add_cache_argument, add_jobs_argument, add_since_argument, changed_rs_files, decode_source,
+    iter_rs_files, map_files, open_cache, read_file_bytes
+)
 
-def is_struct_or_enum_line(line):
-    """Check if line defines a struct or enum."""
-    stripped = line.strip()
-    return bool(re.match(r'(pub\s+)?(?:struct|enum)\s+\w+', stripped))
 
+STRUCT = 'struct'  # struct or enum
+TRAIT = 'trait'
+IMPL = 'impl'
 
-def is_trait_definition(line):
-    """Check if line defines a trait."""
-    stripped = line.strip()
-    return bool(re.match(r'(pub\s+)?trait\s+\w+', stripped))
+# The item's name, on a line classify() found to define a struct/enum or trait
+_NAME_AFTER_RE = re.compile(r'(?:struct|enum|trait)\s+(\w+)')
 
 
-def is_impl_line(line):
-    """Check if line starts an impl block."""
-    stripped = line.strip()
-    return bool(re.match(r'impl(?:<[^>]+>)?\s+', stripped))
+def classify(stripped):
+    """
+    STRUCT, TRAIT or IMPL if the stripped line starts such an item, else None.
+    
+    Matches like `(pub )?(struct|enum) Name`, `(pub )?trait Name` and
+    `impl(<...>)? ` would, with string operations in place of a regex.
+    """
+    if stripped.startswith('impl'):
+        if stripped.startswith('impl<'):
+            # Up to the first `>` only: nested generics are not impl lines here
+            close = stripped.find('>', 5)
+            return IMPL if close > 5 and stripped[close + 1:close + 2].isspace() else None
+        return IMPL if stripped[4:5].isspace() else None
+    head = stripped.split(None, 3)
+    if head[:1] == ['pub']:
+        head = head[1:]
+    # The keyword must be followed by a name
+    if len(head) < 2 or not (head[1][0].isalnum() or head[1][0] == '_'):
+        return None
+    if head[0] == 'struct' or head[0] == 'enum':
+        return STRUCT
+    if head[0] == 'trait':
+        return TRAIT
+    return None
 
 
 def check_trait_order(file_path):
@@ -48,24 +72,36 @@ def check_trait_order(file_path):
     
     Returns list of violations: (file_path, struct_name, trait_line, trait_name, first_impl_line)
     """
-    # Skip Types.rs - it has a different format
-    if file_path.name == 'Types.rs':
+    if is_exempt(file_path):
         return []
     
-    # Skip Chap47 (Claude abomination - will be replaced by Chap47clean)
-    # Skip Chap47clean (different structure - needs interactive fixing)
-    if 'Chap47' in str(file_path.parent):
-        return []
-    
-    violations = []
-    
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        data = read_file_bytes(file_path)
+        # A violation needs both an impl and a later trait; skip decoding otherwise
+        if b'trait' not in data or b'impl' not in data:
+            return []
+        lines = decode_source(data).split('\n')
     except Exception as e:
         print(f"Error reading {file_path}: {e}", file=sys.stderr)
-        return violations
+        return []
+    
+    return order_violations(file_path, lines)
+
+
+def is_exempt(file_path):
+    """Files whose layout check_trait_order() does not check."""
+    # Skip Types.rs - it has a different format
+    if file_path.name == 'Types.rs':
+        return True
     
+    # Skip Chap47 (Claude abomination - will be replaced by Chap47clean)
+    # Skip Chap47clean (different structure - needs interactive fixing)
+    return 'Chap47' in str(file_path.parent)
+
+
+def order_violations(file_path, lines):
+    """check_trait_order() on the lines of a file that is not exempt."""
+    violations = []
     struct_name = None
     struct_line = None
     seen_impl_after_struct = False
@@ -78,9 +114,11 @@ def check_trait_order(file_path):
         if not stripped or stripped.startswith('//'):
             continue
         
+        kind = classify(stripped)
+        
         # Detect struct/enum - resets state
-        if is_struct_or_enum_line(line):
-            m = re.search(r'(?:struct|enum)\s+(\w+)', stripped)
+        if kind == STRUCT:
+            m = _NAME_AFTER_RE.search(stripped)
             struct_name = m.group(1) if m else None
             struct_line = i
             seen_impl_after_struct = False
@@ -88,15 +126,15 @@ def check_trait_order(file_path):
             continue
         
         # Detect impl block (any kind)
-        if struct_name and is_impl_line(line):
+        if struct_name and kind == IMPL:
             if not seen_impl_after_struct:
                 seen_impl_after_struct = True
                 first_impl_line = i
             continue
         
         # Detect trait definition after impl
-        if struct_name and seen_impl_after_struct and is_trait_definition(line):
-            m = re.search(r'trait\s+(\w+)', stripped)
+        if struct_name and seen_impl_after_struct and kind == TRAIT:
+            m = _NAME_AFTER_RE.search(stripped)
             trait_name = m.group(1) if m else 'Unknown'
             violations.append({
                 'file': file_path,
@@ -111,6 +149,12 @@ def check_trait_order(file_path):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Check that trait definitions come before impl blocks")
+    add_jobs_argument(parser)
+    add_cache_argument(parser)
+    add_since_argument(parser)
+    args = parser.parse_args()
+    
     repo_root = Path(__file__).parent.parent.parent.parent
     
     search_dirs = [
@@ -118,35 +162,48 @@ def main():
     ]
     
     all_violations = []
+    cache = open_cache(args, 'trait_definition_order', 1, repo_root)
+    changed = changed_rs_files(repo_root, args.since) if args.since else None
     
     for search_dir in search_dirs:
         if not search_dir.exists():
             continue
         
-        for rs_file in search_dir.rglob("*.rs"):
-            violations = check_trait_order(rs_file)
+        rs_files = sorted(iter_rs_files(search_dir))
+        if changed is not None:
+            rs_files = [f for f in rs_files if f in changed]
+        for violations in map_files(check_trait_order, rs_files, jobs=args.jobs, cache=cache):
             all_violations.extend(violations)
     
+    return report_trait_order(all_violations, repo_root)
+
+
+def report_trait_order(all_violations, repo_root):
+    """Print the check_trait_order() violations of every file; returns the exit code."""
     if all_violations:
-        print("✗ Trait Definition Order Violations:\n")
-        print("Trait definitions should appear BEFORE impl blocks (after struct/enum).\n")
+        # Collected and printed at once: one write instead of one per line
+        out = [
+            "✗ Trait Definition Order Violations:\n",
+            "Trait definitions should appear BEFORE impl blocks (after struct/enum).\n",
+        ]
         
         for v in all_violations:
             rel_path = v['file'].relative_to(repo_root)
-            print(f"  {rel_path}:{v['struct_line']}")
-            print(f"    Struct: {v['struct']}")
-            print(f"    Line {v['first_impl_line']}: First impl block")
-            print(f"    Line {v['trait_line']}: trait {v['trait_name']} definition")
-            print(f"    → Trait {v['trait_name']} should move before line {v['first_impl_line']}")
-            print()
+            out.append(f"  {rel_path}:{v['struct_line']}")
+            out.append(f"    Struct: {v['struct']}")
+            out.append(f"    Line {v['first_impl_line']}: First impl block")
+            out.append(f"    Line {v['trait_line']}: trait {v['trait_name']} definition")
+            out.append(f"    → Trait {v['trait_name']} should move before line {v['first_impl_line']}")
+            out.append('')
         
-        print(f"Total violations: {len(all_violations)}")
-        print("\nCorrect order:")
-        print("  1. Data structure (struct/enum)")
-        print("  2. Trait definition <- SHOULD BE HERE")
-        print("  3. Inherent impl (impl Type { ... })")
-        print("  4. Custom trait implementations")
-        print("  5. Standard trait implementations")
+        out.append(f"Total violations: {len(all_violations)}")
+        out.append("\nCorrect order:")
+        out.append("  1. Data structure (struct/enum)")
+        out.append("  2. Trait definition <- SHOULD BE HERE")
+        out.append("  3. Inherent impl (impl Type { ... })")
+        out.append("  4. Custom trait implementations")
+        out.append("  5. Standard trait implementations")
+        print('\n'.join(out))
         return 1
     
     print("✓ All trait definitions are in correct order")
@@ -19,71 +19,114 @@ Example problem:
 import re
 import sys
 from pathlib import Path
-from collections import defaultdict
+from functools import lru_cache
+from itertools import combinations
 
 # Add lib directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
-from review_utils import ReviewContext, create_review_parser
+from review_utils import (
+    ReviewContext, add_cache_argument, add_jobs_argument, add_since_argument, create_review_parser,
+    decode_source, map_files, open_cache, read_file_bytes
+)
 
 
-def extract_wildcard_imports(lines):
-    """Extract all wildcard imports from a file."""
+_FN_NAME_RE = re.compile(r'\bfn\s+([a-zA-Z_][a-zA-Z0-9_]*)')
+# Kept within one line, as when it was searched line by line
+_WILDCARD_IMPORT_RE = re.compile(
+    r'use[^\S\n]+apas_ai::([^:\n]+(?:::[^:\n]+)*)::(?:\*|{[^}\n]*\*[^}\n]*});'
+)
+
+
+def extract_wildcard_imports(text):
+    """Extract all wildcard imports (the first on each line) from a file's text."""
     imports = []
-    for line in lines:
-        # Match: use apas_ai::ModuleName::*;
-        match = re.search(r'use\s+apas_ai::([^:]+(?:::[^:]+)*)::(\*|{[^}]*\*[^}]*});', line)
-        if match:
-            module_path = match.group(1)
-            imports.append(module_path)
+    # Match: use apas_ai::ModuleName::*;
+    match = _WILDCARD_IMPORT_RE.search(text)
+    while match:
+        imports.append(match.group(1))
+        line_end = text.find('\n', match.end())
+        if line_end == -1:
+            break
+        match = _WILDCARD_IMPORT_RE.search(text, line_end + 1)
     return imports
 
 
+@lru_cache(maxsize=None)
 def extract_trait_methods(filepath):
-    """Extract all method names from all traits in a file."""
+    """
+    Extract all method names from all traits in a file.
+    
+    Memoized: the same modules are imported by many test files. Callers
+    must not modify the returned set.
+    """
+    methods = set()
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        data = read_file_bytes(filepath)
+        # Skip decoding modules without a trait
+        if b'pub trait ' not in data:
+            return methods
+        text = decode_source(data)
     except Exception:
-        return set()
+        return methods
     
-    methods = set()
     in_trait = False
     brace_depth = 0
     
-    for line in lines:
+    for line in text.split('\n'):
+        # Outside a trait only a (non-comment) trait start matters
+        if not in_trait:
+            if 'pub trait ' in line and '{' in line and not line.lstrip().startswith('//'):
+                in_trait = True
+                brace_depth = line.count('{') - line.count('}')
+            continue
+        
         stripped = line.strip()
         
         # Skip comments
         if stripped.startswith('//'):
             continue
         
-        # Detect trait start
-        if not in_trait and 'pub trait ' in line and '{' in line:
-            in_trait = True
-            brace_depth = line.count('{') - line.count('}')
+        # Track brace depth
+        if '{' in line or '}' in line:
+            brace_depth += line.count('{') - line.count('}')
+        
+        # Check if we're still in the trait
+        if brace_depth <= 0:
+            in_trait = False
             continue
         
-        if in_trait:
-            # Track brace depth
-            brace_depth += line.count('{') - line.count('}')
-            
-            # Check if we're still in the trait
-            if brace_depth <= 0:
-                in_trait = False
-                continue
-            
-            # Extract method name from method signature
-            # Match: fn method_name(...) or fn method_name<...>(...)
-            match = re.search(r'\bfn\s+([a-zA-Z_][a-zA-Z0-9_]*)', stripped)
-            if match and not stripped.startswith('//'):
-                method_name = match.group(1)
-                methods.add(method_name)
+        # Extract method name from method signature
+        # Match: fn method_name(...) or fn method_name<...>(...)
+        if 'fn' in stripped:
+            match = _FN_NAME_RE.search(stripped)
+            if match:
+                methods.add(match.group(1))
     
     return methods
 
 
+@lru_cache(maxsize=None)
+def module_trait_methods(module_file, cache=None):
+    """
+    extract_trait_methods(module_file), reused from cache (see open_cache())
+    while the module is unchanged.
+    
+    A module's trait methods depend only on its own file, so unlike the
+    conflicts between modules they can be kept across runs.
+    """
+    if cache is None:
+        return extract_trait_methods(module_file)
+    return cache.lookup(module_file, extract_trait_methods)
+
+
+@lru_cache(maxsize=None)
 def find_module_file(module_path, repo_root):
-    """Find the source file for a given module path."""
+    """
+    Find the source file for a given module path.
+    
+    Memoized like extract_trait_methods(), sparing the exists() probes
+    for modules imported by many files.
+    """
     # Convert Chap05::SetStEph to src/Chap05/SetStEph.rs
     parts = module_path.split('::')
     file_path = repo_root / 'src' / '/'.join(parts[:-1]) / f"{parts[-1]}.rs"
@@ -100,16 +143,34 @@ def find_module_file(module_path, repo_root):
     return None
 
 
-def check_file_for_conflicts(filepath, context):
+def imports_changed_module(filepath, context):
+    """Whether filepath wildcard-imports a module in context.changed_files."""
+    try:
+        data = read_file_bytes(filepath)
+        if b'apas_ai::' not in data:
+            return False
+        text = decode_source(data)
+    except Exception:
+        return False
+    return any(
+        find_module_file(module_path, context.repo_root) in context.changed_files
+        for module_path in extract_wildcard_imports(text)
+    )
+
+
+def check_file_for_conflicts(filepath, context, cache=None):
     """Check a test/benchmark file for potential trait method conflicts."""
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        data = read_file_bytes(filepath)
+        # Without an apas_ai import there is nothing to conflict
+        if b'apas_ai::' not in data:
+            return None
+        text = decode_source(data)
     except Exception as e:
         return None
     
     # Extract wildcard imports
-    wildcard_imports = extract_wildcard_imports(lines)
+    wildcard_imports = extract_wildcard_imports(text)
     
     if len(wildcard_imports) < 2:
         # No conflicts possible with 0 or 1 imports
@@ -120,7 +181,7 @@ def check_file_for_conflicts(filepath, context):
     for module_path in wildcard_imports:
         module_file = find_module_file(module_path, context.repo_root)
         if module_file:
-            methods = extract_trait_methods(module_file)
+            methods = module_trait_methods(module_file, cache)
             if methods:
                 module_methods[module_path] = methods
     
@@ -128,19 +189,16 @@ def check_file_for_conflicts(filepath, context):
         # Need at least 2 modules with traits to have conflicts
         return None
     
-    # Find overlapping method names
-    conflicts = defaultdict(list)
-    modules = list(module_methods.keys())
-    
-    for i in range(len(modules)):
-        for j in range(i + 1, len(modules)):
-            mod1 = modules[i]
-            mod2 = modules[j]
-            overlap = module_methods[mod1] & module_methods[mod2]
-            
-            if overlap:
-                for method in overlap:
-                    conflicts[method].append((mod1, mod2))
+    # Find overlapping method names: every pair of modules (in import
+    # order) among the owners of a method is a conflict on it
+    method_owners = {}
+    for module_path, methods in module_methods.items():
+        for method in methods:
+            method_owners.setdefault(method, []).append(module_path)
+    conflicts = {
+        method: list(combinations(owners, 2))
+        for method, owners in method_owners.items() if len(owners) > 1
+    }
     
     if not conflicts:
         return None
@@ -148,7 +206,7 @@ def check_file_for_conflicts(filepath, context):
     return {
         'file': filepath,
         'imports': wildcard_imports,
-        'conflicts': dict(conflicts),
+        'conflicts': conflicts,
         'module_methods': module_methods
     }
 
@@ -157,6 +215,9 @@ def main():
     parser = create_review_parser(
         description="Detect potential trait method conflicts from wildcard imports"
     )
+    add_jobs_argument(parser)
+    add_cache_argument(parser)
+    add_since_argument(parser)
     args = parser.parse_args()
     context = ReviewContext(args)
 
@@ -171,21 +232,29 @@ def main():
         print("✓ No tests/ or benches/ directories found")
         return 0
     
+    files = context.find_files(dirs_to_check, changed_only=False)
+    if context.changed_files is not None and not context.single_file:
+        # A file's conflicts also change with the modules it imports
+        files = [
+            f for f in files
+            if f in context.changed_files or imports_changed_module(f, context)
+        ]
+    
     if context.dry_run:
-        files = context.find_files(dirs_to_check)
         print(f"Would check {len(files)} file(s) for trait method conflicts")
         return 0
     
-    files = context.find_files(dirs_to_check)
     print(f"Analyzing {len(files)} test/benchmark files for trait method conflicts...")
     print("=" * 80)
     
     all_conflicts = []
+    cache = open_cache(args, 'trait_method_conflicts', 1, context.repo_root)
     
-    for filepath in files:
-        result = check_file_for_conflicts(filepath, context)
+    for result in map_files(check_file_for_conflicts, files, context, cache, jobs=args.jobs):
         if result:
             all_conflicts.append(result)
+    if cache is not None:
+        cache.prune(max_entries=max(2000, 2 * len(files)))
     
     if not all_conflicts:
         print("\n✓ No trait method conflicts detected!")
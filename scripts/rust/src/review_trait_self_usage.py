@@ -18,38 +18,66 @@ Example violation:
 import re
 import sys
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 # Add lib directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
-from review_utils import ReviewContext, create_review_parser
+from review_utils import (
+    ReviewContext, add_cache_argument, add_jobs_argument, create_review_parser, decode_source,
+    map_files, open_cache, read_file_bytes
+)
 
 
-def extract_trait_name_from_signature(trait_line):
+_TRAIT_NAME_RE = re.compile(r'\btrait\s+(\w+)')
+_TRAIT_GENERICS_RE = re.compile(r'trait\s+\w+<([^>]+)>')
+_RETURN_TYPE_RE = re.compile(r'->\s*(&\s*mut\s+|&\s*)?(\w+)(<[^>]*>)?')
+_METHOD_NAME_RE = re.compile(r'fn\s+(\w+)')
+_IMPL_RE = re.compile(r'\bimpl')
+# Every `for Name`, overlapping ones included (as in `for for_each`)
+_FOR_RE = re.compile(r'(?=\bfor\s+(\w+))')
+_WORD_RE = re.compile(r'\b\w+')
+
+
+def extract_trait_name_from_signature(trait_line: str) -> Optional[str]:
     """Extract trait name from trait definition line."""
     # Handle: pub trait MyTrait<T> or trait MyTrait or trait MyTrait: Sized
-    match = re.search(r'\btrait\s+(\w+)', trait_line)
+    match = _TRAIT_NAME_RE.search(trait_line)
     if match:
         return match.group(1)
     return None
 
 
-def find_impl_struct_name(lines, trait_name):
-    """Find the struct name that implements this trait in the same file."""
-    # Look for: impl<...> TraitName<...> for StructName<...>
-    impl_pattern = re.compile(rf'\bimpl.*\b{re.escape(trait_name)}\b.*\bfor\s+(\w+)')
+def find_impl_struct_names(lines: List[str]) -> Dict[str, str]:
+    """
+    Map each trait name to the struct implementing it in the same file.
     
+    Looks for: impl<...> TraitName<...> for StructName<...>. Every word
+    between a line's first `impl` and its last `for` maps to the name after
+    that `for`, the first such line winning, so one pass over the lines
+    serves all of a file's traits.
+    """
+    struct_names: Dict[str, str] = {}
     for line in lines:
-        match = impl_pattern.search(line)
-        if match:
-            return match.group(1)
+        if 'impl' not in line or 'for' not in line:
+            continue
+        impl_match = _IMPL_RE.search(line)
+        if not impl_match:
+            continue
+        last_for = None
+        for last_for in _FOR_RE.finditer(line, impl_match.end()):
+            pass
+        if last_for is None:
+            continue
+        for word in _WORD_RE.finditer(line, impl_match.end(), last_for.start()):
+            struct_names.setdefault(word.group(), last_for.group(1))
     
-    return None
+    return struct_names
 
 
-def extract_trait_generic_params(trait_line):
+def extract_trait_generic_params(trait_line: str) -> List[str]:
     """Extract generic parameters from trait definition."""
     # Extract <T>, <T, U>, etc. from trait definition
-    match = re.search(r'trait\s+\w+<([^>]+)>', trait_line)
+    match = _TRAIT_GENERICS_RE.search(trait_line)
     if match:
         params = match.group(1)
         # Split by comma and clean up
@@ -57,10 +85,10 @@ def extract_trait_generic_params(trait_line):
     return []
 
 
-def extract_return_type(method_sig):
+def extract_return_type(method_sig: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
     """Extract the return type from a method signature."""
     # Handle: fn foo() -> Type or fn foo() -> &Type or fn foo() -> &mut Type
-    match = re.search(r'->\s*(&\s*mut\s+|&\s*)?(\w+)(<[^>]*>)?', method_sig)
+    match = _RETURN_TYPE_RE.search(method_sig)
     if match:
         ref_mut = (match.group(1) or '').strip()
         type_name = match.group(2)
@@ -69,7 +97,13 @@ def extract_return_type(method_sig):
     return None, None, None
 
 
-def should_use_self(return_type_name, generics, struct_name, trait_name, trait_generics):
+def should_use_self(
+    return_type_name: str,
+    generics: str,
+    struct_name: Optional[str],
+    trait_name: str,
+    trait_generics: List[str]
+) -> bool:
     """Determine if a return type should use Self instead of concrete type."""
     if not struct_name:
         return False
@@ -122,6 +156,8 @@ def main():
     parser = create_review_parser(
         description="Detect trait methods using concrete types instead of Self in return types"
     )
+    add_jobs_argument(parser)
+    add_cache_argument(parser)
     args = parser.parse_args()
     context = ReviewContext(args)
 
@@ -146,9 +182,10 @@ def main():
     
     all_violations = []
     files_with_violations = {}
+    cache = open_cache(args, 'trait_self_usage', 1, context.repo_root)
     
-    for filepath in files:
-        violations = review_file_with_count(filepath)
+    results = map_files(review_file_with_count, files, jobs=args.jobs, cache=cache)
+    for filepath, violations in zip(files, results):
         if violations:
             all_violations.extend(violations)
             files_with_violations[filepath] = violations
@@ -172,29 +209,36 @@ def main():
         return 0
 
 
-def review_file_with_count(filepath):
+def review_file_with_count(filepath: Path) -> List[dict]:
     """Review a file and return violations list."""
-    violations = []
+    violations: List[dict] = []
     
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        data = read_file_bytes(filepath)
+        # Every violation is inside a trait
+        if b'trait ' not in data:
+            return violations
+        lines = decode_source(data).split('\n')
     except Exception:
         return violations
+    # Built on the first trait
+    struct_names: Optional[Dict[str, str]] = None
 
     in_trait = False
-    trait_name = None
+    trait_name: Optional[str] = None
     trait_start_line = 0
-    trait_line = None
-    trait_generics = []
+    trait_line: Optional[str] = None
+    trait_generics: List[str] = []
     brace_depth = 0
-    struct_name = None
+    struct_name: Optional[str] = None
     
     for line_num, line in enumerate(lines, 1):
-        stripped = line.strip()
+        # Outside a trait only a trait header matters
+        if not in_trait and 'trait ' not in line:
+            continue
         
-        # Skip comments
-        if stripped.startswith('//'):
+        # Skip comments (lines without // need no stripping to rule them out)
+        if '//' in line and line.lstrip().startswith('//'):
             continue
         
         # Detect trait start
@@ -207,12 +251,15 @@ def review_file_with_count(filepath):
                 trait_generics = extract_trait_generic_params(line)
                 brace_depth = line.count('{') - line.count('}')
                 # Find the implementing struct name
-                struct_name = find_impl_struct_name(lines, trait_name)
+                if struct_names is None:
+                    struct_names = find_impl_struct_names(lines)
+                struct_name = struct_names.get(trait_name)
                 continue
         
         if in_trait:
-            # Track brace depth
-            brace_depth += line.count('{') - line.count('}')
+            # Track brace depth (most trait lines are signatures without braces)
+            if '{' in line or '}' in line:
+                brace_depth += line.count('{') - line.count('}')
             
             # Check if we're still in the trait
             if brace_depth <= 0:
@@ -223,14 +270,14 @@ def review_file_with_count(filepath):
                 continue
             
             # Look for method signatures with return types
-            if 'fn ' in line and '->' in line and not stripped.startswith('//'):
+            if 'fn ' in line and '->' in line:
                 # Extract method signature (might span multiple lines, but we'll handle simple cases)
                 ref_mut, return_type_name, generics = extract_return_type(line)
                 
                 if return_type_name and return_type_name != 'Self':
                     # Check if this should be Self
                     if should_use_self(return_type_name, generics, struct_name, trait_name, trait_generics):
-                        method_match = re.search(r'fn\s+(\w+)', line)
+                        method_match = _METHOD_NAME_RE.search(line)
                         method_name = method_match.group(1) if method_match else 'unknown'
                         
                         # Construct what it should be
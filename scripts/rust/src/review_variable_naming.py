@@ -18,7 +18,10 @@ import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "lib"))
-from review_utils import ReviewContext, create_review_parser
+from review_utils import (
+    ReviewContext, add_cache_argument, add_jobs_argument, create_review_parser, decode_source,
+    map_files, open_cache, read_file_bytes
+)
 
 
 TEMP_PATTERN = re.compile(r'\btemp_\w+\b')
@@ -27,41 +30,63 @@ ROCK_BANDS = [
     'queen', 'ac_dc', 'metallica', 'nirvana', 'radiohead',
     'stairway_to_heaven', 'bohemian_rhapsody', 'hotel_california',
 ]
+# Any band as a whole word; a match is a whole \w token, so matches never overlap
+BANDS_PATTERN = re.compile(r'\b(' + '|'.join(re.escape(band) for band in ROCK_BANDS) + r')\b')
+
+
+def has_candidate(text: str) -> bool:
+    """Whether any line of text might have a temp_ variable or a rock band name."""
+    if 'temp_' in text and TEMP_PATTERN.search(text):
+        return True
+    text_lower = text.lower()
+    return any(band in text_lower for band in ROCK_BANDS) and BANDS_PATTERN.search(text_lower) is not None
 
 
 def check_file(file_path: Path, context: ReviewContext) -> list:
     """Check a single file for prohibited variable names."""
     violations = []
+    rel_path = context.relative_path(file_path)
+    
+    text = decode_source(read_file_bytes(file_path))
+    
+    # Screen the whole file first, with plain substring tests ahead of the
+    # patterns (whose leading \b defeats re's literal-prefix search); only
+    # files with a hit, almost none, are checked line by line
+    if not has_candidate(text):
+        return violations
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        for line_num, line in enumerate(f, start=1):
-            stripped = line.strip()
-            if stripped.startswith('//') or stripped.startswith('/*') or stripped.startswith('*'):
-                continue
-            
-            # Check for temp_ pattern
-            temp_matches = TEMP_PATTERN.findall(line)
-            for match in temp_matches:
-                rel_path = context.relative_path(file_path)
-                violations.append(
-                    f"  {rel_path}:{line_num} - temp variable: {match}\n    {stripped}"
-                )
-            
-            # Check for rock band names
-            line_lower = line.lower()
-            for band in ROCK_BANDS:
-                if re.search(rf'\b{band}\b', line_lower):
-                    rel_path = context.relative_path(file_path)
-                    violations.append(
-                        f"  {rel_path}:{line_num} - rock band name: {band}\n    {stripped}"
-                    )
-                    break
+    for line_num, line in enumerate(text.split('\n'), start=1):
+        # Comment lines start with //, /* or *; lines with neither character
+        # need no stripping to rule them out
+        if ('/' in line or '*' in line) and line.lstrip().startswith(('//', '/*', '*')):
+            continue
+        
+        # Check for temp_ pattern; most lines have neither a temp_ nor a band
+        line_lower = line.lower()
+        temp_matches = TEMP_PATTERN.findall(line) if 'temp_' in line else []
+        if not temp_matches and not any(band in line_lower for band in ROCK_BANDS):
+            continue
+        stripped = line.strip()
+        for match in temp_matches:
+            violations.append(
+                f"  {rel_path}:{line_num} - temp variable: {match}\n    {stripped}"
+            )
+        
+        # Check for rock band names; one per line, the first listed
+        found = {m.group(1) for m in BANDS_PATTERN.finditer(line_lower)}
+        if found:
+            band = next(band for band in ROCK_BANDS if band in found)
+            violations.append(
+                f"  {rel_path}:{line_num} - rock band name: {band}\n    {stripped}"
+            )
     
     return violations
 
 
 def main():
     parser = create_review_parser(__doc__)
+    add_jobs_argument(parser)
+    add_cache_argument(parser)
     args = parser.parse_args()
     context = ReviewContext(args)
     
@@ -77,9 +102,9 @@ def main():
     
     all_violations = []
     files = context.find_files([src_dir])
+    cache = open_cache(args, 'variable_naming', 1, context.repo_root)
     
-    for file_path in files:
-        violations = check_file(file_path, context)
+    for violations in map_files(check_file, files, context, jobs=args.jobs, cache=cache):
         all_violations.extend(violations)
     
     if not all_violations:
@@ -16,9 +16,17 @@ Handles multi-line function signatures and where clauses.
 import re
 import sys
 from pathlib import Path
+from functools import lru_cache
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "lib"))
-from review_utils import ReviewContext, create_review_parser
+from review_utils import (
+    ReviewContext, add_cache_argument, add_jobs_argument, create_review_parser, decode_source,
+    map_files, open_cache, read_file_bytes
+)
+
+
+_GENERIC_FN_RE = re.compile(r'(pub\s+)?fn\s+(\w+)\s*<([^>]+)>')
+_WHERE_BOUND_RE = re.compile(r'(\w+):\s*(.+?),?\s*$')
 
 
 def parse_function_with_where(lines, start_idx):
@@ -27,7 +35,7 @@ def parse_function_with_where(lines, start_idx):
     Returns: (fn_name, generics, where_bounds, end_idx) or None
     """
     # Look for function declaration
-    fn_match = re.search(r'(pub\s+)?fn\s+(\w+)\s*<([^>]+)>', lines[start_idx])
+    fn_match = _GENERIC_FN_RE.search(lines[start_idx])
     if not fn_match:
         return None
     
@@ -65,7 +73,7 @@ def parse_function_with_where(lines, start_idx):
         line = lines[i].strip()
         if line and not line.startswith('//'):
             # Parse bound: "T: SomeTrait," or "T: Trait1 + Trait2,"
-            match = re.match(r'(\w+):\s*(.+?),?\s*$', line)
+            match = _WHERE_BOUND_RE.match(line)
             if match:
                 param = match.group(1)
                 bounds = match.group(2).rstrip(',').strip()
@@ -78,8 +86,13 @@ def parse_function_with_where(lines, start_idx):
     return (fn_name, generic_names, where_bounds, where_line_idx, i)
 
 
+@lru_cache(maxsize=None)
 def is_simple_bound(bound):
-    """Check if a bound is simple enough to inline."""
+    """
+    Check if a bound is simple enough to inline.
+    
+    Memoized: the same bounds (Clone, Send, Fn(T) -> U, ...) recur across files.
+    """
     # Simple: single trait name, possibly with path (Clone, std::fmt::Display)
     # Not simple: multiple traits (Clone + Send), function traits with complex signatures
     
@@ -96,8 +109,53 @@ def is_simple_bound(bound):
     return True
 
 
+def check_file(src_file):
+    """(file, fn line, where line, fn name, param, bound) of each simplifiable where clause."""
+    violations = []
+    data = read_file_bytes(src_file)
+    # Every violation has a `where` line; an ASCII file without one needs no
+    # decoding (a non-ASCII one is still decoded, for its UnicodeDecodeError)
+    if b'where' not in data and data.isascii():
+        return violations
+    lines = decode_source(data).split('\n')
+    
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
+        
+        # Look for function with generics
+        if line.startswith('pub fn ') or line.startswith('fn '):
+            if '<' in line and '>' in line:
+                result = parse_function_with_where(lines, i)
+                if result:
+                    fn_name, generic_names, where_bounds, where_idx, end_idx = result
+                    
+                    # Check if where bounds are simple and could be inlined
+                    for param, bounds_list in where_bounds.items():
+                        if len(bounds_list) == 1:  # Single bound
+                            bound = bounds_list[0]
+                            if is_simple_bound(bound):
+                                violations.append((
+                                    src_file,
+                                    i + 1,  # fn line
+                                    where_idx + 1,  # where line
+                                    fn_name,
+                                    param,
+                                    bound
+                                ))
+                    
+                    i = end_idx
+                    continue
+        
+        i += 1
+    
+    return violations
+
+
 def main():
     parser = create_review_parser(__doc__)
+    add_jobs_argument(parser)
+    add_cache_argument(parser)
     args = parser.parse_args()
     context = ReviewContext(args)
     
@@ -114,40 +172,10 @@ def main():
 
     violations = []
     files = context.find_files([src_dir])
+    cache = open_cache(args, 'where_clause_simplification', 1, context.repo_root)
 
-    for src_file in files:
-        with open(src_file, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-            
-            # Look for function with generics
-            if line.startswith('pub fn ') or line.startswith('fn '):
-                if '<' in line and '>' in line:
-                    result = parse_function_with_where(lines, i)
-                    if result:
-                        fn_name, generic_names, where_bounds, where_idx, end_idx = result
-                        
-                        # Check if where bounds are simple and could be inlined
-                        for param, bounds_list in where_bounds.items():
-                            if len(bounds_list) == 1:  # Single bound
-                                bound = bounds_list[0]
-                                if is_simple_bound(bound):
-                                    violations.append((
-                                        src_file,
-                                        i + 1,  # fn line
-                                        where_idx + 1,  # where line
-                                        fn_name,
-                                        param,
-                                        bound
-                                    ))
-                        
-                        i = end_idx
-                        continue
-            
-            i += 1
+    for file_violations in map_files(check_file, files, jobs=args.jobs, cache=cache):
+        violations.extend(file_violations)
     
     if violations:
         print("✗ Found simplifiable where clauses (RustRules.md Lines 322-329):\n")
@@ -21,7 +21,7 @@ from collections import defaultdict
 
 # Add lib directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'lib'))
-from review_utils import ReviewContext, create_review_parser
+from review_utils import ReviewContext, create_review_parser, iter_rs_files
 
 
 STANDARD_TRAITS = {
@@ -228,7 +228,7 @@ def main():
         print("✗ No src/ directory found")
         return 1
     
-    files = list(src_dir.rglob('*.rs'))
+    files = list(iter_rs_files(src_dir))
     
     # Collect all data
     all_data = []